@@ -0,0 +1,98 @@
+"""
+Benchmark of the memory held by loaded device frames.
+
+Parses every specification of xml_files several times, keeps the frames resident like a gateway does and reports the
+bytes allocated per frame, measured with tracemalloc. The devices of the modbus TCP specifications are built from
+a spec cache, with and without releasing the parsed frame (GenericSGrDeviceBuilder.compact), and the bytes per
+device are reported. Run from the repository root:
+
+    python -m benchmarks.frame_memory
+"""
+import gc
+import glob
+import os
+import tempfile
+import tracemalloc
+
+from sgr_library.generic_interface import GenericSGrDeviceBuilder, SGrDeviceProtocol, file_loader, resolve_protocol
+
+FRAMES_PER_SPEC = 20
+SPEC_GLOB = os.path.join('xml_files', '*.xml')
+DEVICE_CONFIG = {'Config': {'ip': '127.0.0.1', 'port': '502'}}
+
+
+def frame_bytes(path: str) -> float | None:
+    """
+    :returns: The bytes allocated per resident frame of a specification, None if it cannot be parsed
+    """
+    try:
+        file_loader(path)
+    except Exception:
+        return None
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    frames = [file_loader(path) for _ in range(FRAMES_PER_SPEC)]
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del frames
+    return (end - start) / FRAMES_PER_SPEC
+
+
+def device_bytes(path: str, cache_directory: str, compact: bool) -> float | None:
+    """
+    :returns: The bytes allocated per resident device of a specification, None if it cannot be built
+    """
+    def build():
+        return GenericSGrDeviceBuilder().xml_file_path(path).config(DEVICE_CONFIG).spec_cache(cache_directory) \
+            .compact(compact).build()
+
+    try:
+        build()
+    except Exception:
+        return None
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    devices = [build() for _ in range(FRAMES_PER_SPEC)]
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del devices
+    return (end - start) / FRAMES_PER_SPEC
+
+
+def run_devices():
+    print(f'\n{"modbus TCP device":<60} {"frame kept":>12} {"released":>12}')
+    with tempfile.TemporaryDirectory() as cache_directory:
+        for path in sorted(glob.glob(SPEC_GLOB)):
+            try:
+                if resolve_protocol(file_loader(path)) != SGrDeviceProtocol.MODBUS_TPC:
+                    continue
+            except Exception:
+                continue
+            full = device_bytes(path, cache_directory, False)
+            compact = device_bytes(path, cache_directory, True)
+            if full is None or compact is None:
+                continue
+            print(f'{os.path.basename(path):<60} {full / 1024:9.1f} KiB {compact / 1024:9.1f} KiB')
+
+
+def run():
+    total, count = 0.0, 0
+    print(f'{"specification":<60} {"per frame":>12}')
+    for path in sorted(glob.glob(SPEC_GLOB)):
+        size = frame_bytes(path)
+        name = os.path.basename(path)
+        if size is None:
+            print(f'{name:<60} {"unparsable":>12}')
+            continue
+        total, count = total + size, count + 1
+        print(f'{name:<60} {size / 1024:9.1f} KiB')
+    print(f'\n{count} specifications, {total / count / 1024:.1f} KiB per frame on average')
+    run_devices()
+
+
+if __name__ == '__main__':
+    run()
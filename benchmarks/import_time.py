@@ -0,0 +1,57 @@
+"""
+Benchmark of the import time of the library.
+
+Imports each entry point in a fresh interpreter, reports the best wall time of several runs and which transports
+were loaded by the import. Run from the repository root:
+
+    python -m benchmarks.import_time
+"""
+import json
+import os
+import subprocess
+import sys
+
+RUNS = 5
+
+# entry points of the library, with the transports an application importing them needs
+ENTRY_POINTS = {
+    'package': 'import sgr_library',
+    'device': 'from sgr_library import SGrDevice',
+    'rest': 'from sgr_library.restapi_client_async import SgrRestInterface',
+    'modbus tcp': 'from sgr_library.modbus_interface import SgrModbusInterface',
+    'modbus rtu': 'from sgr_library.modbusRTU_interface_async import SgrModbusRtuInterface',
+}
+TRANSPORTS = ('pymodbus', 'aiohttp', 'jmespath', 'serial')
+
+_PROBE = '''
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"elapsed": elapsed, "modules": [name for name in {transports!r} if name in sys.modules]}}))
+'''
+
+
+def measure(statement: str) -> tuple[float, list[str]]:
+    """
+    :returns: The best import time in seconds and the transports loaded by the statement
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [os.getcwd(), os.environ.get('PYTHONPATH')])))
+    best, modules = float('inf'), []
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, '-c', _PROBE.format(statement=statement, transports=TRANSPORTS)],
+                                capture_output=True, text=True, check=True, env=env).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        best, modules = min(best, result['elapsed']), result['modules']
+    return best, modules
+
+
+def run():
+    print(f'{"entry point":<12} {"import":>10}  transports loaded')
+    for name, statement in ENTRY_POINTS.items():
+        elapsed, modules = measure(statement)
+        print(f'{name:<12} {elapsed * 1e3:7.1f} ms  {", ".join(modules) or "-"}')
+
+
+if __name__ == '__main__':
+    run()
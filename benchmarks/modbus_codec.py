@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of the precompiled modbus codecs against the PayloadDecoder path.
+
+Decodes every ModbusDataType variant with both implementations, checks that they agree and reports
+the time per decoded value. Run from the repository root:
+
+    python -m benchmarks.modbus_codec
+"""
+import random
+import timeit
+from dataclasses import fields
+
+from pymodbus.constants import Endian
+
+from sgr_library.generated.product import ModbusDataType
+from sgr_library.modbus_codec import compile_codec, registers_to_bytes
+from sgr_library.payload_decoder import PayloadDecoder, PayloadBuilder, RoundingScheme
+
+# number of registers of each data type in this benchmark
+REGISTER_COUNTS = {
+    'boolean': 1, 'int8': 1, 'int8_u': 1, 'int16': 1, 'int16_u': 1, 'int32': 2, 'int32_u': 2, 'int64': 4,
+    'int64_u': 4, 'float32': 2, 'float64': 4, 'string': 8, 'enum': 1, 'bitmap': 2, 'date_time': 4,
+}
+NUMBER = 20000
+
+
+def legacy_decode(registers: list[int], data_type: str, order: Endian):
+    return PayloadDecoder.fromRegisters(registers, byteorder=order, wordorder=order).decode(data_type, 0)
+
+
+def legacy_encode(value, data_type: str, order: Endian) -> list[int]:
+    return PayloadBuilder(byteorder=order, wordorder=order).sgr_encode(value, data_type,
+                                                                        RoundingScheme.floor).to_registers()
+
+
+def run():
+    rnd = random.Random(0)
+    print(f'{"data type":<10} {"order":<7} {"PayloadDecoder":>16} {"codec":>10} {"speedup":>8}  check')
+    for data_type in (f.name for f in fields(ModbusDataType)):
+        count = REGISTER_COUNTS[data_type]
+        for order in (Endian.BIG, Endian.LITTLE):
+            registers = [rnd.randrange(0, 0x10000) for _ in range(count)]
+            codec = compile_codec(data_type, count, order, order)
+            try:
+                expected = legacy_decode(registers, data_type, order)
+                legacy = timeit.timeit(lambda: legacy_decode(registers, data_type, order), number=NUMBER)
+                legacy_text = f'{legacy / NUMBER * 1e6:13.2f} us'
+            except ValueError:
+                expected, legacy, legacy_text = None, None, f'{"unsupported":>16}'
+            try:
+                value = codec.decode(registers)
+                compiled = timeit.timeit(lambda: codec.decode(registers), number=NUMBER)
+                compiled_text = f'{compiled / NUMBER * 1e6:7.2f} us'
+            except ValueError:
+                value, compiled, compiled_text = None, None, f'{"unsupported":>10}'
+
+            check = ''
+            if legacy is not None and compiled is not None:
+                if data_type == 'string':
+                    check = 'str'
+                else:
+                    same_value = value == expected or value != value and expected != expected
+                    same_registers = codec.encode(value) == legacy_encode(value, data_type, order) \
+                        if data_type.startswith('int') else True
+                    check = 'ok' if same_value and same_registers else f'MISMATCH {value} != {expected}'
+            speedup = f'{legacy / compiled:7.1f}x' if legacy and compiled else f'{"-":>8}'
+            print(f'{data_type:<10} {order.name:<7} {legacy_text} {compiled_text} {speedup}  {check}')
+
+    # decoding a whole block read of 60 registers, packed once and shared by all codecs
+    registers = [rnd.randrange(0, 0x10000) for _ in range(60)]
+    codecs = [(compile_codec('float32', 2, Endian.BIG, Endian.BIG), offset) for offset in range(0, 60, 2)]
+
+    def decode_block():
+        buffer = registers_to_bytes(registers)
+        return [codec.decode_from(buffer, offset) for codec, offset in codecs]
+
+    def legacy_block():
+        return [legacy_decode(registers[offset:offset + 2], 'float32', Endian.BIG) for _, offset in codecs]
+
+    legacy = timeit.timeit(legacy_block, number=NUMBER // 10) / (NUMBER // 10)
+    compiled = timeit.timeit(decode_block, number=NUMBER // 10) / (NUMBER // 10)
+    print(f'\nblock of 30 float32: PayloadDecoder {legacy * 1e6:.1f} us, codec {compiled * 1e6:.1f} us, '
+          f'{legacy / compiled:.1f}x')
+
+
+if __name__ == '__main__':
+    run()
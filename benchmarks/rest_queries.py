@@ -0,0 +1,55 @@
+"""
+Benchmark of evaluating the JMESPath queries of a REST device against one response.
+
+Reads all data points of the CLEMAP energy monitor from a synthetic multi-kilobyte response, once the way getval
+did before, re-serializing the cached response and compiling the query on every read, and once with the queries
+compiled into the data point index and the parsed response shared by all reads. Run from the repository root:
+
+    python -m benchmarks.rest_queries
+"""
+import json
+import time
+
+import jmespath
+
+from sgr_library.data_point_index import build_rest_index
+from sgr_library.generic_interface import file_loader
+
+ROUNDS = 200
+SPEC = 'xml_files/SGr_04_mmmm_dddd_CLEMAPEnergyMonitorEIV0.2.1.xml'
+
+
+def response(samples: int = 50) -> list:
+    """
+    A response of the shape the CLEMAP cloud returns, with a history of samples per interval.
+    """
+    phases = {f'{name}_l{phase}': float(phase) for name in ('p', 'q', 'avg_energy', 'v', 'i', 's', 'pf')
+              for phase in (1, 2, 3)}
+    return [{'ten_sec': phases, 'one_min': phases, 'timestamp': index} for index in range(samples)]
+
+
+def run():
+    frame = file_loader(SPEC)
+    records = list(build_rest_index(frame.interface_list.rest_api_interface, 'localhost'))
+    payload = response()
+    cached = json.dumps(payload)
+    print(f'{len(records)} data points, response of {len(cached) / 1024:.1f} KiB')
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for record in records:
+            jmespath.search(record.query, json.loads(cached))
+    round_trip = (time.perf_counter() - start) / ROUNDS
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for record in records:
+            record.expression.search(payload)
+    compiled = (time.perf_counter() - start) / ROUNDS
+
+    print(f'json round trip + search  {round_trip * 1e3:8.3f} ms per device read')
+    print(f'compiled, parsed response {compiled * 1e3:8.3f} ms per device read ({round_trip / compiled:.1f}x)')
+
+
+if __name__ == '__main__':
+    run()
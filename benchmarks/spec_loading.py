@@ -0,0 +1,57 @@
+"""
+Benchmark of preparing a directory of specifications at startup.
+
+Compares building the frames one by one without a cache with load_spec_directory warming a spec cache for an
+increasing number of worker processes, followed by building the frames from the warm cache as the devices would.
+Reports the slowest files. Run from the repository root:
+
+    python -m benchmarks.spec_loading [directory]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from sgr_library.spec_cache import SpecCache
+from sgr_library.spec_loader import load_spec_directory, spec_directory_builders
+
+
+def build_all(builders) -> float:
+    start = time.perf_counter()
+    for builder in builders:
+        try:
+            builder.build_frame()
+        except Exception:
+            pass
+    return time.perf_counter() - start
+
+
+def run(directory: str = 'xml_files'):
+    with tempfile.TemporaryDirectory() as cold:
+        builders = spec_directory_builders(directory, SpecCache(cold))
+        for builder in builders:
+            builder.spec_cache(None)
+        print(f'serial, no cache        {build_all(builders) * 1e3:8.1f} ms')
+
+    workers = 1
+    while True:
+        with tempfile.TemporaryDirectory() as cache_directory:
+            cache = SpecCache(cache_directory)
+            start = time.perf_counter()
+            results = load_spec_directory(directory, cache, max_workers=workers)
+            elapsed = time.perf_counter() - start
+            failed = sum(not result.ok for result in results)
+            warm = build_all(spec_directory_builders(directory, cache))
+        print(f'{workers:2} worker processes      {elapsed * 1e3:8.1f} ms, {len(results)} files, {failed} failed, '
+              f'then built from the cache in {warm * 1e3:.1f} ms')
+        if workers >= (os.cpu_count() or 1):
+            break
+        workers = min(workers * 2, os.cpu_count() or 1)
+
+    print('\nslowest files')
+    for result in sorted(results, key=lambda result: result.seconds, reverse=True)[:5]:
+        print(f'{result.seconds * 1e3:8.1f} ms  {os.path.basename(result.source)}')
+
+
+if __name__ == '__main__':
+    run(*sys.argv[1:])
@@ -0,0 +1,61 @@
+"""
+Benchmark of parsing the specifications of xml_files into DeviceFrames.
+
+Parses all files with every available event handler, once with a new XmlContext per file (cold, the class metadata
+is derived again for every file) and once with the shared context of the process (warm), and checks that all
+backends produce the same frames. Run from the repository root:
+
+    python -m benchmarks.xml_parsing
+"""
+import glob
+import os
+import time
+
+from xsdata.formats.dataclass.context import XmlContext
+
+from sgr_library.generated.product import DeviceFrame
+from sgr_library.spec_parser import available_xml_handlers, create_parser, xml_context, xml_handlers
+
+ROUNDS = 3
+SPEC_GLOB = os.path.join('xml_files', '*.xml')
+
+
+def parse_all(paths: list[str], handler, shared_context: bool) -> tuple[float, dict[str, DeviceFrame]]:
+    """
+    :returns: The best time of parsing all files and the frames by path
+    """
+    best, frames = float('inf'), {}
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        for path in paths:
+            context = xml_context() if shared_context else XmlContext()
+            try:
+                frames[path] = create_parser(handler, context).parse(path, DeviceFrame)
+            except Exception:
+                frames[path] = None
+        best = min(best, time.perf_counter() - start)
+    return best, frames
+
+
+def run():
+    paths = sorted(glob.glob(SPEC_GLOB))
+    print(f'{len(paths)} files, best of {ROUNDS} rounds')
+    print(f'{"handler":<8} {"cold context":>14} {"warm context":>14} {"speedup":>8}')
+    reference = None
+    for name in available_xml_handlers():
+        handler = xml_handlers[name]()
+        cold, _ = parse_all(paths, handler, False)
+        warm, frames = parse_all(paths, handler, True)
+        check = ''
+        if reference is None:
+            reference = frames
+        elif frames != reference:
+            check = 'MISMATCH ' + ', '.join(os.path.basename(path) for path in paths if frames[path] != reference[path])
+        print(f'{name:<8} {cold * 1e3:11.1f} ms {warm * 1e3:11.1f} ms {cold / warm:7.1f}x  {check}')
+    missing = set(xml_handlers) - set(available_xml_handlers())
+    if missing:
+        print(f'not installed: {", ".join(sorted(missing))}')
+
+
+if __name__ == '__main__':
+    run()
@@ -22,6 +22,7 @@ setup(
     author_email='',
     description='',
     install_requires=read_requirements(),
+    extras_require={'lxml': ['lxml']},
     long_description='',
     long_description_content_type='text/plain',
 )
@@ -1,7 +1,15 @@
-from sgr_library import modbus_client, modbus_interface, payload_decoder, restapi_client_async, exceptions, \
-    auxiliary_functions, generated
+"""
+The transports and the generated data classes are imported on first access, so that an application only loads
+the modules it uses, e.g. a REST only application never imports pymodbus.
+"""
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sgr_library import modbus_client, modbus_interface, payload_decoder, restapi_client_async, exceptions, \
+        auxiliary_functions, generated
+    from sgr_library.sgr_device import SGrDevice
 
-from sgr_library.sgr_device import SGrDevice
 __all__ = [
     "modbus_client",
     "modbus_interface",
@@ -12,3 +20,22 @@ __all__ = [
     "generated",
     "SGrDevice"
 ]
+
+_lazy_attributes = {
+    "SGrDevice": "sgr_library.sgr_device",
+}
+
+
+def __getattr__(name: str):
+    if name in _lazy_attributes:
+        value = getattr(importlib.import_module(_lazy_attributes[name]), name)
+    elif name in __all__:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -6,6 +6,7 @@ __all__ = [
     'DataPointConverter',
     'DataPointValidator',
     'DeviceInformation',
+    'ReadResult',
     'ConfigurationParameter',
     'build_configurations_parameters'
 ]
@@ -13,4 +14,5 @@ __all__ = [
 from sgr_library.api.data_point_api import DataPoint, DataPointProtocol, DataPointConverter, DataPointValidator
 from sgr_library.api.device_api import BaseSGrInterface, DeviceInformation
 from sgr_library.api.function_profile_api import FunctionProfile
+from sgr_library.api.read_result import ReadResult
 from sgr_library.api.configuration_parameter import ConfigurationParameter, build_configurations_parameters
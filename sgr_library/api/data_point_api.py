@@ -68,15 +68,32 @@ class DataPoint(Generic[T]):
 
     async def read(self) -> T:
         value = await self._protocol.read()
+        return self.from_device(value)
 
+    def from_device(self, value: Any) -> T:
+        """
+        Validates and converts a raw value, which was read from the device by other means than read().
+        """
         if self._validator.validate(value):
             return self._converter.from_device(value)
         raise Exception(f"invalid value read from device, {value}, validator: {self._validator.data_type()}")
 
     async def write(self, data: T):
+        return await self.write_converted(self.to_device(data))
+
+    async def write_converted(self, value: Any):
+        """
+        Writes a value which was converted and validated with to_device already.
+        """
+        return await self._protocol.write(value)
+
+    def to_device(self, data: T) -> Any:
+        """
+        Converts and validates a value, which is written to the device by other means than write().
+        """
         value = self._converter.to_device(data)
         if self._validator.validate(value):
-            return await self._protocol.write(value)
+            return value
         raise Exception("invalid data to write to device")
 
     def unit(self) -> SubSetUnits:
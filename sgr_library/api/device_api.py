@@ -1,12 +1,17 @@
+import asyncio
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable, Iterable, Mapping
 
 from sgr_library.api import DataPoint
 from sgr_library.api.configuration_parameter import ConfigurationParameter
 from sgr_library.api.data_types import DataTypes
 from sgr_library.api.function_profile_api import FunctionProfile
+from sgr_library.api.lazy_mapping import LazyMapping
+from sgr_library.api.read_result import ReadResult
+from sgr_library.circuit_breaker import CircuitBreaker, CircuitState
 from sgr_library.generated.generic import DeviceCategory, DataDirectionProduct
+from sgr_library.generated.product import DeviceFrame
 
 
 @dataclass
@@ -20,13 +25,33 @@ class DeviceInformation:
 
 
 class BaseSGrInterface(ABC):
+    # number of data points read at the same time by read_data_concurrent
+    _max_concurrent_reads: int = 1
+    _read_limiter: asyncio.Semaphore | None = None
+    # health of the device, interfaces talking to a remote device fail fast while it is unavailable
+    circuit_breaker: CircuitBreaker | None = None
+    # the parsed spec, dropped by release_frame and reloaded from the spec source on access
+    _frame: DeviceFrame | None = None
+    _frame_loader: Callable[[], DeviceFrame] | None = None
 
     @abstractmethod
     def connect(self):
         pass
 
+    async def close(self):
+        """
+        Releases the connection of the interface, interfaces holding a connection override it.
+        """
+
+    async def __aenter__(self) -> 'BaseSGrInterface':
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
     @abstractmethod
-    def get_function_profiles(self) -> dict[str, FunctionProfile]:
+    def get_function_profiles(self) -> Mapping[str, FunctionProfile]:
         pass
 
     @abstractmethod
@@ -49,12 +74,107 @@ class BaseSGrInterface(ABC):
             data_points.update(fp.get_data_points())
         return data_points
 
+    def preload(self):
+        """
+        Builds all function profiles and data points of an interface built in lazy mode.
+        """
+        function_profiles = self.get_function_profiles()
+        if isinstance(function_profiles, LazyMapping):
+            function_profiles.preload()
+        for fp in function_profiles.values():
+            fp.preload()
+
+    @property
+    def root(self) -> DeviceFrame | None:
+        """
+        The parsed spec of the device. After release_frame it is loaded again from the spec source on every access,
+        applications reading the descriptive metadata often should keep the returned frame.
+        """
+        if self._frame is None and self._frame_loader is not None:
+            return self._frame_loader()
+        return self._frame
+
+    @root.setter
+    def root(self, frame: DeviceFrame):
+        self._frame = frame
+
+    def release_frame(self, loader: Callable[[], DeviceFrame]):
+        """
+        Drops the parsed spec, only the compiled runtime model of the function profiles and data points is kept.
+        All function profiles and data points are built first, also if the interface was built in lazy mode.
+        :param loader: Loads the frame from the spec source, when root is accessed afterwards
+        """
+        self.preload()
+        self._frame_loader = loader
+        self._frame = None
+
+    def is_frame_released(self) -> bool:
+        return self._frame is None and self._frame_loader is not None
+
     async def read_data(self) -> dict[tuple[str, str], Any]:
         data = {}
         for fp in self.get_function_profiles().values():
             data.update({(fp.name(), key): value for key, value in (await fp.read()).items()})
         return data
 
+    async def read_many(self, keys: Iterable[tuple[str, str]]) -> dict[tuple[str, str], Any]:
+        """
+        Reads several data points, interfaces which can read them together override it.
+        :param keys: The functional profile and data point names
+        :returns: The converted values by functional profile and data point name
+        """
+        return {key: await self.get_data_point(key).read() for key in keys}
+
+    async def write_many(self, values: dict[tuple[str, str], Any]):
+        """
+        Writes several data points, e.g. a set of setpoints. All values are converted and validated before the
+        first one is written, an invalid value fails the write without changing the device.
+        :param values: The values by functional profile and data point name
+        """
+        data_points = {key: self.get_data_point(key) for key in values}
+        raw_values = {key: data_points[key].to_device(value) for key, value in values.items()}
+        for key, raw_value in raw_values.items():
+            await data_points[key].write_converted(raw_value)
+
+    def circuit_state(self) -> CircuitState:
+        """
+        Returns the health of the device, OPEN while requests fail fast because the device is unavailable.
+        """
+        return self.circuit_breaker.state if self.circuit_breaker is not None else CircuitState.CLOSED
+
+    def max_concurrent_reads(self) -> int:
+        return self._max_concurrent_reads
+
+    def set_max_concurrent_reads(self, limit: int):
+        """
+        Sets the number of data points read at the same time by read_data_concurrent.
+        """
+        if limit < 1:
+            raise ValueError(f"at least one concurrent read is required, got {limit}")
+        self._max_concurrent_reads = limit
+        self._read_limiter = None
+
+    def read_limiter(self) -> asyncio.Semaphore:
+        """
+        The limiter shared by all reads of this interface.
+        """
+        if self._read_limiter is None:
+            self._read_limiter = asyncio.Semaphore(self._max_concurrent_reads)
+        return self._read_limiter
+
+    async def read_data_concurrent(self) -> ReadResult:
+        """
+        Reads all function profiles at the same time, at most max_concurrent_reads data points are read at once.
+        Data points which cannot be read are reported in the errors of the result instead of failing the read.
+        :returns: The values and errors by functional profile and data point name
+        """
+        limiter = self.read_limiter()
+        results = await asyncio.gather(*(fp.read_concurrent(limiter) for fp in self.get_function_profiles().values()))
+        data = ReadResult()
+        for result in results:
+            data.update(result)
+        return data
+
     def describe(self) -> tuple[str, dict[str, dict[str, tuple[DataDirectionProduct, DataTypes]]]]:
 
         data = {}
@@ -1,7 +1,11 @@
+import asyncio
 from abc import ABC, abstractmethod
+from typing import Mapping
 
 from sgr_library.api.data_point_api import DataPoint
 from sgr_library.api.data_types import DataTypes
+from sgr_library.api.lazy_mapping import LazyMapping
+from sgr_library.api.read_result import ReadResult, read_concurrently
 from sgr_library.generated.generic import DataDirectionProduct
 
 
@@ -12,15 +16,38 @@ class FunctionProfile(ABC):
         pass
 
     @abstractmethod
-    def get_data_points(self) -> dict[tuple[str, str], DataPoint]:
+    def get_data_points(self) -> Mapping[tuple[str, str], DataPoint]:
         pass
 
     def get_data_point(self, dp_name: str) -> DataPoint:
         return self.get_data_points()[(self.name(), dp_name)]
 
+    def preload(self):
+        """
+        Builds all data points of a lazily built function profile.
+        """
+        data_points = self.get_data_points()
+        if isinstance(data_points, LazyMapping):
+            data_points.preload()
+
     async def read(self) -> dict[str, DataPoint]:
         return {key[1]: await dp.read() for key, dp in self.get_data_points().items()}
 
+    def read_limiter(self) -> asyncio.Semaphore | None:
+        """
+        The limiter shared with the other function profiles of the interface, None if reads are not limited.
+        """
+        return None
+
+    async def read_concurrent(self, limiter: asyncio.Semaphore | None = None) -> ReadResult:
+        """
+        Reads all data points at the same time, bounded by the limiter of the interface.
+        A failing data point does not fail the others, its error is reported in the result.
+        :param limiter: Overrides the limiter of the interface
+        :returns: The values and errors by functional profile and data point name
+        """
+        return await read_concurrently(self.get_data_points().values(), limiter or self.read_limiter())
+
     def describe(self) -> tuple[str, dict[str, tuple[DataDirectionProduct, DataTypes]]]:
         infos = map(lambda dp: dp.describe(), self.get_data_points().values())
         return self.name(), {dp[0][1]: (dp[1], dp[2]) for dp in infos}
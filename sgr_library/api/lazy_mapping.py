@@ -0,0 +1,61 @@
+from functools import partial
+from typing import Callable, Iterable, Iterator, Mapping, TypeVar
+
+E = TypeVar('E')
+K = TypeVar('K')
+V = TypeVar('V')
+
+
+class LazyMapping(Mapping[K, V]):
+    """
+    A read only mapping whose values are created on first access, e.g. function profiles or data points which
+    are only built when an application uses them.
+    """
+
+    def __init__(self, factories: dict[K, Callable[[], V]]):
+        """
+        :param factories: Creates the value of each key
+        """
+        self._factories = factories
+        self._values: dict[K, V] = {}
+
+    def __getitem__(self, key: K) -> V:
+        value = self._values.get(key)
+        if value is None:
+            value = self._values[key] = self._factories[key]()
+        return value
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._factories
+
+    def is_loaded(self, key: K) -> bool:
+        return key in self._values
+
+    def preload(self):
+        """
+        Creates all values which were not accessed yet. The factories are dropped afterwards, they reference the
+        spec elements the values were built from.
+        """
+        for key in self._factories:
+            self[key]
+        self._factories = dict.fromkeys(self._factories)
+
+
+def build_mapping(elements: Iterable[E], key: Callable[[E], K], build: Callable[[E], V],
+                  lazy: bool = False) -> Mapping[K, V]:
+    """
+    Builds the value of each element, or defers building it until it is accessed.
+    :param elements: The elements of the spec, e.g. the functional profiles of an interface
+    :param key: Returns the key of an element, without building it
+    :param build: Builds the value of an element
+    :param lazy: True to build the values on first access
+    """
+    if lazy:
+        return LazyMapping({key(element): partial(build, element) for element in elements})
+    return {key(element): build(element) for element in elements}
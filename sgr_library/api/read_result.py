@@ -0,0 +1,48 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from sgr_library.api.data_point_api import DataPoint
+
+
+@dataclass
+class ReadResult:
+    """
+    The outcome of a concurrent read, data points which failed are reported in errors instead of values.
+    """
+    values: dict[tuple[str, str], Any] = field(default_factory=dict)
+    errors: dict[tuple[str, str], Exception] = field(default_factory=dict)
+
+    def is_complete(self) -> bool:
+        return not self.errors
+
+    def update(self, other: 'ReadResult'):
+        self.values.update(other.values)
+        self.errors.update(other.errors)
+
+
+async def read_concurrently(data_points: Iterable[DataPoint], limiter: asyncio.Semaphore | None) -> ReadResult:
+    """
+    Reads data points at the same time, at most as many as the limiter admits.
+    :param data_points: The data points to read
+    :param limiter: Bounds the number of reads in flight, None reads all data points at once
+    :returns: The values read and the errors of the data points which could not be read
+    """
+
+    async def read(dp: DataPoint) -> Any:
+        if limiter is None:
+            return await dp.read()
+        async with limiter:
+            return await dp.read()
+
+    data_points = list(data_points)
+    outcomes = await asyncio.gather(*(read(dp) for dp in data_points), return_exceptions=True)
+    result = ReadResult()
+    for dp, outcome in zip(data_points, outcomes):
+        if isinstance(outcome, Exception):
+            result.errors[dp.name()] = outcome
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            result.values[dp.name()] = outcome
+    return result
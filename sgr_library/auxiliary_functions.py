@@ -1,34 +1,28 @@
 from pymodbus.constants import Endian
-from xsdata.formats.dataclass.context import XmlContext
-from xsdata.formats.dataclass.parsers import XmlParser
 
 from sgr_library.generated.product import DeviceFrame, BitOrder, ModbusDataPoint
 from sgr_library.exceptions import DataPointException, FunctionalProfileException
+from sgr_library.spec_catalog import read_spec_header
+from sgr_library.spec_parser import create_parser
+
+
+# the protocol names of the interfaces
+_PROTOCOL_NAMES = {
+    'modbusInterface': "modbus",
+    'restApiInterface': "restapi",
+    'genericInterface': "generic",
+    'contactInterface': "contact",
+}
 
 
 # TODO error handling
 def get_protocol(xml_file: str) -> str:
     """
-    Searches for protocol type in xml file
+    Searches for protocol type in xml file, only the header of the file is read
     :return: protocol type string
     """
-    parser = XmlParser(context=XmlContext())
-    root = parser.parse(xml_file, DeviceFrame)
-
-    restapi = root.interface_list.rest_api_interface
-    generic = root.interface_list.generic_interface
-    contact = root.interface_list.contact_interface
-    modbus = root.interface_list.modbus_interface
-    if modbus:
-        return "modbus"
-    elif restapi:
-        return "restapi"
-    elif generic:
-        return "generic"
-    elif contact:
-        return "contact"
-    else:
-        return "error"
+    interface = read_spec_header(xml_file)['interface']
+    return _PROTOCOL_NAMES.get(interface, "error")
 
 
 # TODO make this one so that it is generic.
@@ -50,8 +44,7 @@ def find_dp(root, fp_name: str, dp_name: str) -> ModbusDataPoint:
 
 def get_modbusInterfaceSelection(xml_file: str) -> str:
     try:
-        parser = XmlParser(context=XmlContext())
-        root = parser.parse(xml_file, DeviceFrame)
+        root = create_parser().parse(xml_file, DeviceFrame)
         interface_selection = root.interface_list.modbus_interface.modbus_interface_description.modbus_interface_selection.value
         if interface_selection not in ['RTU', 'TCPIP', 'UDPIP', 'RTU-ASCII', 'TCPIP-ASCII', 'UDPIP-ASCII']:
             raise ValueError('Invalid Modbus interface selection found.')
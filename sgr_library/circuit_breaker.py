@@ -0,0 +1,144 @@
+"""
+SGr Circuit Breaker
+------------------------
+
+Tracks the health of a device. After repeated transport failures the circuit opens and requests fail fast with
+DeviceUnavailableError instead of waiting for a timeout. Once the backoff expired the circuit is half open and a single
+request probes the device: on success the circuit closes, on failure it opens again with a doubled backoff.
+"""
+import asyncio
+import random
+import time
+from enum import Enum
+from typing import Awaitable, Callable, TypeVar
+
+from sgr_library.exceptions import DeviceUnavailableError
+
+T = TypeVar('T')
+
+
+class CircuitState(Enum):
+    CLOSED = 'CLOSED'
+    OPEN = 'OPEN'
+    HALF_OPEN = 'HALF_OPEN'
+
+
+class CircuitBreaker:
+    """
+    The health state machine of one device.
+    """
+
+    def __init__(self, is_failure: Callable[[Exception], bool], failure_threshold: int = 3,
+                 initial_backoff: float = 1.0, max_backoff: float = 300.0, multiplier: float = 2.0,
+                 jitter: float = 0.1, clock: Callable[[], float] = time.monotonic):
+        """
+        :param is_failure: Decides if an error means the device is unreachable, e.g. a timeout, as opposed to an
+            error reported by the device
+        :param failure_threshold: The number of consecutive failures which open the circuit
+        :param initial_backoff: The time in seconds the circuit stays open after it opened first
+        :param max_backoff: The upper bound of the backoff in seconds
+        :param multiplier: The factor applied to the backoff after each failed probe
+        :param jitter: The fraction by which the backoff is randomized, so that devices are not probed in lockstep
+        :param clock: The monotonic clock in seconds
+        """
+        self._is_failure = is_failure
+        self.failure_threshold = failure_threshold
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.multiplier = multiplier
+        self.jitter = jitter
+        self._clock = clock
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._backoff = initial_backoff
+        self._open_until = 0.0
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        if self._state == CircuitState.OPEN and self._clock() >= self._open_until:
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    def retry_in(self) -> float:
+        """
+        Returns the time in seconds until the device is probed again, 0 if it is not open.
+        """
+        return max(0.0, self._open_until - self._clock()) if self._state == CircuitState.OPEN else 0.0
+
+    def _open(self):
+        self._state = CircuitState.OPEN
+        backoff = self._backoff * (1 + random.uniform(-self.jitter, self.jitter))
+        self._open_until = self._clock() + backoff
+        self._backoff = min(self._backoff * self.multiplier, self.max_backoff)
+
+    def record_success(self):
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._backoff = self.initial_backoff
+
+    def record_failure(self, probe: bool = False):
+        """
+        :param probe: True if the failed request probed the device while the circuit was half open
+        """
+        self._failures += 1
+        # requests started before the circuit opened do not prolong the backoff
+        if probe or (self._state == CircuitState.CLOSED and self._failures >= self.failure_threshold):
+            self._open()
+
+    def reset(self):
+        self._probing = False
+        self.record_success()
+
+    async def call(self, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Performs a request unless the device is known to be unavailable.
+        :param request: The request to the device
+        :returns: The result of the request
+        :raises DeviceUnavailableError: if the circuit is open, or half open and another request probes the device
+        """
+        state = self.state
+        if state == CircuitState.OPEN or (state == CircuitState.HALF_OPEN and self._probing):
+            raise DeviceUnavailableError(f"device unavailable after {self._failures} failures, "
+                                         f"retrying in {self.retry_in():.1f}s")
+        probing = state == CircuitState.HALF_OPEN
+        if probing:
+            self._probing = True
+        try:
+            result = await request()
+        except Exception as e:
+            if self._is_failure(e):
+                self.record_failure(probing)
+            else:
+                # the device answered, even if it was with an error
+                self.record_success()
+            raise
+        finally:
+            if probing:
+                self._probing = False
+        self.record_success()
+        return result
+
+
+def is_modbus_failure(error: Exception) -> bool:
+    """
+    Modbus errors which mean the device did not answer, exception responses of the device are not failures.
+    """
+    # imported here, the transports are only loaded by the applications using them
+    from pymodbus.exceptions import ConnectionException, ModbusIOException
+    # before Python 3.11 asyncio.TimeoutError, raised by wait_for, is neither an OSError nor a TimeoutError
+    return isinstance(error, (ConnectionException, ModbusIOException, OSError, asyncio.TimeoutError))
+
+
+def is_http_failure(error: Exception) -> bool:
+    """
+    HTTP errors which mean the service is unreachable or failing, client errors (4xx) are not failures.
+    """
+    from aiohttp import ClientConnectionError, ClientResponseError
+    if isinstance(error, ClientResponseError):
+        return error.status >= 500
+    return isinstance(error, (ClientConnectionError, OSError, asyncio.TimeoutError))
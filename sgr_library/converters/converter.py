@@ -180,3 +180,39 @@ class UnsupportedConverter(DataPointConverter[Any]):
 
     def converted_unit(self) -> SubSetUnits:
         raise Exception(f"unsupported unit, {self._unit}")
+
+
+class JsonConverter(DataPointConverter[Any]):
+    """
+    Passes a JSON structure, e.g. the table of a JMESPath mapping, through unchanged.
+    """
+
+    def __init__(self, unit: Units):
+        self._unit = unit
+
+    def to_device(self, value: Any) -> Any:
+        return value
+
+    def from_device(self, value: Any) -> Any:
+        return value
+
+    def converted_unit(self) -> SubSetUnits:
+        return SubSetUnits.NONE
+
+
+class ArrayConverter(DataPointConverter[list]):
+    """
+    Converts the elements of an array-valued data point.
+    """
+
+    def __init__(self, element: DataPointConverter):
+        self._element = element
+
+    def to_device(self, value: list) -> Any:
+        return [self._element.to_device(element) for element in value]
+
+    def from_device(self, value: Any) -> list:
+        return [self._element.from_device(element) for element in value]
+
+    def converted_unit(self) -> SubSetUnits:
+        return self._element.converted_unit()
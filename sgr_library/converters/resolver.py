@@ -2,8 +2,9 @@ from typing import Callable
 
 from sgr_library.api import DataPointConverter
 from sgr_library.converters.converter import HoursConverter, MinutesConverter, NoneConverter, SecondsConverter, TemperatureConverter, VoltDataPointConverter, UnsupportedConverter, \
-    ReactiveEnergyConverter, PowerOverTimeConverter, CurrentConverter, PowerConverter, PercentConverter
-from sgr_library.generated.generic import Units
+    ReactiveEnergyConverter, PowerOverTimeConverter, CurrentConverter, PowerConverter, PercentConverter, \
+    JsonConverter, ArrayConverter
+from sgr_library.generated.generic import DataTypeProduct, Units
 
 converter_lookup: dict[Units, Callable[[Units], DataPointConverter]] = {
     Units.WATTS: lambda x: PowerConverter(x),
@@ -31,5 +32,15 @@ converter_lookup: dict[Units, Callable[[Units], DataPointConverter]] = {
 }
 
 
-def build_converter(unit: Units) -> DataPointConverter:
-    return converter_lookup.get(unit, lambda x: UnsupportedConverter(x))(unit)
+def build_converter(unit: Units, data_type: DataTypeProduct | None = None,
+                    array_length: int | None = None) -> DataPointConverter:
+    """
+    :param data_type: The data type, JSON values are not converted
+    :param array_length: The length of an array-valued data point, its elements are converted by the unit
+    """
+    if data_type is not None and data_type.json:
+        return JsonConverter(unit)
+    converter = converter_lookup.get(unit, lambda x: UnsupportedConverter(x))(unit)
+    if array_length is not None:
+        return ArrayConverter(converter)
+    return converter
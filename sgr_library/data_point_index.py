@@ -0,0 +1,168 @@
+"""
+SGr Data Point Index
+------------------------
+
+Compiles the data points of a device once into flat records, keyed by functional profile and data point name,
+so that the read and write paths do not have to search and re-derive them from the xsdata tree on every call.
+"""
+import logging
+from dataclasses import dataclass
+from typing import Generic, TypeVar, Iterable, Iterator, TYPE_CHECKING
+
+from sgr_library.exceptions import DataPointException, FunctionalProfileException
+from sgr_library.generated.product import ModbusDataPoint, ModbusInterface, RestApiDataPoint, RestApiInterface, \
+    HttpMethod, ResponseQuery, ResponseQueryType
+
+if TYPE_CHECKING:
+    from jmespath.parser import ParsedResult
+    from pymodbus.constants import Endian
+
+    from sgr_library.jmespath_mapping import CompiledMapping
+    from sgr_library.modbus_codec import ModbusCodec
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar('R')
+
+
+@dataclass(slots=True, frozen=True)
+class ModbusDataPointRecord:
+    fp_name: str
+    dp_name: str
+    address: int | None
+    count: int | None
+    register_type: str | None
+    data_type: str | None
+    codec: 'ModbusCodec'
+    byte_order: 'Endian'
+    block_cache_identification: str | None
+
+
+@dataclass(slots=True, frozen=True)
+class RestDataPointRecord:
+    fp_name: str
+    dp_name: str
+    method: HttpMethod | None
+    url: str
+    query: str | None
+    # the query or mapping compiled once, None if there is none or it is invalid
+    expression: 'ParsedResult | CompiledMapping | None'
+    headers: dict[str, str]
+    body: str | None
+    # the max age of the responses defined by the spec, in seconds
+    max_age: float | None = None
+
+
+class DataPointIndex(Generic[R]):
+    """
+    Data point records of a device by functional profile and data point name.
+    """
+
+    def __init__(self, records: Iterable[R]):
+        self._records: dict[tuple[str, str], R] = {(record.fp_name, record.dp_name): record for record in records}
+        self._function_profiles = {key[0] for key in self._records}
+
+    def find(self, fp_name: str, dp_name: str) -> R:
+        """
+        :param fp_name: The name of the functional profile in which the datapoint resides
+        :param dp_name: The name of the datapoint
+        :returns: The record of the data point
+        """
+        record = self._records.get((fp_name, dp_name))
+        if record is not None:
+            return record
+        if fp_name in self._function_profiles:
+            raise DataPointException(f"Datapoint {dp_name} not found in functional profile {fp_name}.")
+        raise FunctionalProfileException(f"Functional profile {fp_name} not found in XML file.")
+
+    def __contains__(self, key: tuple[str, str]) -> bool:
+        return key in self._records
+
+    def __iter__(self) -> Iterator[R]:
+        return iter(self._records.values())
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+def build_modbus_record(fp_name: str, dp: ModbusDataPoint, byte_order: 'Endian') -> ModbusDataPointRecord:
+    # the modbus codecs depend on pymodbus, which REST only applications do not load
+    from sgr_library.modbus_codec import build_codec, modbus_data_type_name
+
+    configuration = dp.modbus_data_point_configuration
+    return ModbusDataPointRecord(
+        fp_name=fp_name,
+        dp_name=dp.data_point.data_point_name,
+        address=configuration.address if configuration else None,
+        count=configuration.number_of_registers if configuration else None,
+        register_type=configuration.register_type.value if configuration and configuration.register_type else None,
+        data_type=modbus_data_type_name(configuration.modbus_data_type) if configuration else None,
+        codec=build_codec(configuration.modbus_data_type if configuration else None,
+                          configuration.number_of_registers if configuration else None, byte_order, byte_order),
+        byte_order=byte_order,
+        block_cache_identification=dp.block_cache_identification
+    )
+
+
+def build_modbus_index(interface: ModbusInterface, byte_order: 'Endian') -> DataPointIndex[ModbusDataPointRecord]:
+    return DataPointIndex(
+        build_modbus_record(fp.functional_profile.functional_profile_name, dp, byte_order)
+        for fp in interface.functional_profile_list.functional_profile_list_element
+        for dp in fp.data_point_list.data_point_list_element
+    )
+
+
+def compile_query(response_query: ResponseQuery | None) -> 'ParsedResult | CompiledMapping | None':
+    """
+    Compiles the query of a service call, JMESPath expressions and mappings are supported.
+    :returns: The compiled query, None if there is no query or it is invalid or unsupported
+    """
+    # jmespath is only needed by REST devices, modbus only applications do not load it
+    import jmespath
+    from sgr_library.jmespath_mapping import compile_mapping
+
+    if response_query is None:
+        return None
+    query_type = response_query.query_type
+    try:
+        if query_type == ResponseQueryType.JMESPATH_MAPPING and response_query.jmes_path_mappings is not None:
+            return compile_mapping(response_query.jmes_path_mappings)
+        if query_type in (None, ResponseQueryType.JMESPATH_EXPRESSION) and response_query.query is not None:
+            return jmespath.compile(str(response_query.query))
+    except (ValueError, jmespath.exceptions.JMESPathError) as e:
+        logger.error(f"Invalid {query_type.value if query_type else 'JMESPath'} query: {e}")
+        return None
+    logger.error(f"Unsupported query of type {query_type.value if query_type else None}: {response_query.query}")
+    return None
+
+
+def build_rest_record(fp_name: str, dp: RestApiDataPoint, base_url: str,
+                      fp_max_age: float | None = None) -> RestDataPointRecord:
+    from sgr_library.response_cache import max_age_attribute
+
+    max_age = max_age_attribute(dp.generic_attribute_list)
+    service_call = dp.rest_api_data_point_configuration.rest_api_service_call
+    headers = service_call.request_header.header if service_call.request_header else []
+    response_query = service_call.response_query
+    return RestDataPointRecord(
+        fp_name=fp_name,
+        dp_name=dp.data_point.data_point_name,
+        method=service_call.request_method,
+        url=f'https://{base_url}{service_call.request_path}',
+        query=str(response_query.query) if response_query and response_query.query is not None else None,
+        expression=compile_query(response_query),
+        headers={header_entry.header_name: header_entry.value for header_entry in headers},
+        body=service_call.request_body,
+        max_age=max_age if max_age is not None else fp_max_age
+    )
+
+
+def build_rest_index(interface: RestApiInterface, base_url: str) -> DataPointIndex[RestDataPointRecord]:
+    from sgr_library.response_cache import max_age_attribute
+
+    return DataPointIndex(
+        build_rest_record(fp.functional_profile.functional_profile_name, dp, base_url,
+                          max_age_attribute(fp.generic_attribute_list))
+        for fp in interface.functional_profile_list.functional_profile_list_element
+        for dp in fp.data_point_list.data_point_list_element
+    )
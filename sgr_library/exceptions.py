@@ -23,4 +23,7 @@ class DeviceInformationError(Exception): ...
 
 # Modbus exceptions
 class RegisterError(Exception): ...
-class InvalidEndianType(Exception): ...
\ No newline at end of file
+class InvalidEndianType(Exception): ...
+
+# Connection exceptions
+class DeviceUnavailableError(Exception): ...
@@ -1,10 +1,15 @@
 # nothing here
-from sgr_library.generated import (
-    communicator,
-    functional_profile,
-    generic,
-    product
-)
+# the subpackages are imported on first access, e.g. sgr_library.generated.product
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sgr_library.generated import (
+        communicator,
+        functional_profile,
+        generic,
+        product
+    )
 
 __all__ = [
     "communicator",
@@ -12,3 +17,15 @@ __all__ = [
     "generic",
     "product"
 ]
+
+
+def __getattr__(name: str):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f"{__name__}.{name}")
+    globals()[name] = module
+    return module
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
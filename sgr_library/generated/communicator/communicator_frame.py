@@ -8,7 +8,7 @@ from sgr_library.generated.generic.functional_profile import FunctionalProfileDe
 __NAMESPACE__ = "http://www.smartgridready.com/ns/V0/"
 
 
-@dataclass
+@dataclass(slots=True)
 class CommunicatorFunctionalProfile(FunctionalProfileDescription):
     """
     Extends the base functional profile type with generic data points.
@@ -32,7 +32,7 @@ class CommunicatorFunctionalProfile(FunctionalProfileDescription):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class CommunicatorFrame1(CommunicatorBase):
     """
     Data type definition for a Communicator Description.
@@ -51,7 +51,7 @@ class CommunicatorFrame1(CommunicatorBase):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class CommunicatorFrame(CommunicatorFrame1):
     """
     RPT Root Point for Communicator.
@@ -24,7 +24,7 @@ class CommunicatorCategory(Enum):
     ACCOUNTING_SYSTEM = "AccountingSystem"
 
 
-@dataclass
+@dataclass(slots=True)
 class CommunicatorTransportService:
     modbus: Optional[ModbusInterfaceSelection] = field(
         default=None,
@@ -42,7 +42,7 @@ class CommunicatorTransportService:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class TransportServices:
     """
     A list of supported transport services.
@@ -57,7 +57,7 @@ class TransportServices:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class CommunicatorInformation:
     """
     :ivar alternative_names:
@@ -174,7 +174,7 @@ class CommunicatorInformation:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class CommunicatorBase:
     """
     Base type for device.
@@ -16,7 +16,7 @@ from sgr_library.generated.generic.base_types import (
 __NAMESPACE__ = "http://www.smartgridready.com/ns/V0/"
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionalProfileDataPoint:
     """
     Data point element.
@@ -39,7 +39,7 @@ class FunctionalProfileDataPoint:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class DataPoint:
         """
         Generic data point description.
@@ -138,7 +138,7 @@ class FunctionalProfileDataPoint:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionalProfileDataPointList:
     """
     List of data points.
@@ -154,7 +154,7 @@ class FunctionalProfileDataPointList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionalProfileFrame:
     """
     Functional profile template.
@@ -192,7 +192,7 @@ class FunctionalProfileFrame:
         }
     )
 
-    @dataclass
+    @dataclass(slots=True)
     class FunctionalProfile:
         """
         Functional profile element.
@@ -8,7 +8,7 @@ from sgr_library.generated.generic.base_type_level_of_operation_type import Leve
 __NAMESPACE__ = "http://www.smartgridready.com/ns/V0/"
 
 
-@dataclass
+@dataclass(slots=True)
 class AlternativeNames:
     """a name list for EEBUS, IEC6850,, SAREF4ENER etc.
 
@@ -106,7 +106,7 @@ class AlternativeNames:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class BitmapEntryFunctionalProfile:
     """
     Maps a device-specific bit mask to a literal.
@@ -128,7 +128,7 @@ class BitmapEntryFunctionalProfile:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class BitmapEntryProduct:
     """
     Maps a device-specific bit mask to a literal.
@@ -160,7 +160,7 @@ class BitmapEntryProduct:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ChangeLog:
     """
     document history.
@@ -314,7 +314,7 @@ class DeviceCategory(Enum):
     CEM = "CEM"
 
 
-@dataclass
+@dataclass(slots=True)
 class EmptyType:
     pass
 
@@ -323,7 +323,7 @@ class EmptyValue(Enum):
     VALUE = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class EnumEntry:
     """
     Maps a device specific ordinal to its literal.
@@ -353,7 +353,7 @@ class EnumEntry:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class EnumEntryProductRecord:
     literal: Optional[str] = field(
         default=None,
@@ -379,7 +379,7 @@ class EnumEntryProductRecord:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class EnumEntryRecordFunctionalProfile:
     literal: Optional[str] = field(
         default=None,
@@ -398,7 +398,7 @@ class EnumEntryRecordFunctionalProfile:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericAttributeFunctionalProfile:
     name: Optional[str] = field(
         default=None,
@@ -453,7 +453,7 @@ class ReleaseState(Enum):
     REVOKED = "Revoked"
 
 
-@dataclass
+@dataclass(slots=True)
 class ScalingFactor:
     """scaled_value = value * multiplicator * 10^powerof10 This type is used for to
     convert integer datapoint values into floats only"""
@@ -518,7 +518,7 @@ class Units(Enum):
     NONE = "NONE"
 
 
-@dataclass
+@dataclass(slots=True)
 class VersionNumber:
     """
     a three digit version mumber system.
@@ -552,7 +552,7 @@ class VersionNumber:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class BitmapFunctionalProfile:
     """bitmap for status bits.
 
@@ -568,7 +568,7 @@ class BitmapFunctionalProfile:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class BitmapProduct:
     """bitmap for status bits.
 
@@ -585,7 +585,7 @@ class BitmapProduct:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class EnumType:
     """Enum of states.
 
@@ -617,7 +617,7 @@ class EnumType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class EnumMapFunctionalProfile:
     enum_entry: List[EnumEntryRecordFunctionalProfile] = field(
         default_factory=list,
@@ -638,7 +638,7 @@ class EnumMapFunctionalProfile:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class EnumMapProduct:
     enum_entry: List[EnumEntryProductRecord] = field(
         default_factory=list,
@@ -660,7 +660,7 @@ class EnumMapProduct:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionalProfileIdentification:
     """
     Specification of design source 0 means: specified by SmartGridready, the
@@ -730,7 +730,7 @@ class FunctionalProfileIdentification:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericAttributeListFunctionalProfile:
     generic_attribute_list_element: List[GenericAttributeFunctionalProfile] = field(
         default_factory=list,
@@ -743,7 +743,7 @@ class GenericAttributeListFunctionalProfile:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class JsonElemFunctionalProfile:
     class Meta:
         name = "JSonElemFunctionalProfile"
@@ -779,7 +779,7 @@ class JsonElemFunctionalProfile:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class LegibleDescription:
     """This element us used to extend the definitions with legible text
     elements: a short understandable explanation of the items addressed.
@@ -818,7 +818,7 @@ class LegibleDescription:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ReleaseNotes:
     """
     Contains versioning, history and release states.
@@ -848,7 +848,7 @@ class ReleaseNotes:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class DataTypeProduct:
     """Generic high-devel data types.
 
@@ -974,7 +974,7 @@ class DataTypeProduct:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class JsonArrayOutputFunctionalProfile:
     class Meta:
         name = "JSonArrayOutputFunctionalProfile"
@@ -1004,7 +1004,7 @@ class JsonArrayOutputFunctionalProfile:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestParam:
     param: List[JsonElemFunctionalProfile] = field(
         default_factory=list,
@@ -1016,7 +1016,7 @@ class RequestParam:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericAttributeProductEnd:
     name: Optional[str] = field(
         default=None,
@@ -1050,7 +1050,7 @@ class GenericAttributeProductEnd:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class JsonOutputFunctionalProfile:
     class Meta:
         name = "JSonOutputFunctionalProfile"
@@ -1071,7 +1071,7 @@ class JsonOutputFunctionalProfile:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class DataTypeFunctionalProfile:
     """Generic high-level data types.
 
@@ -1197,7 +1197,7 @@ class DataTypeFunctionalProfile:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericAttributeListProductEnd:
     generic_attribute_list_element: List[GenericAttributeProductEnd] = field(
         default_factory=list,
@@ -1210,7 +1210,7 @@ class GenericAttributeListProductEnd:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericAttributeProduct:
     name: Optional[str] = field(
         default=None,
@@ -1252,7 +1252,7 @@ class GenericAttributeProduct:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericAttributeListProduct:
     generic_attribute_list_element: List[GenericAttributeProduct] = field(
         default_factory=list,
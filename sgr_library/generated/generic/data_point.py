@@ -12,7 +12,7 @@ from sgr_library.generated.generic.base_types import (
 __NAMESPACE__ = "http://www.smartgridready.com/ns/V0/"
 
 
-@dataclass
+@dataclass(slots=True)
 class DataPointDescription:
     """
     Generic data point properties.
@@ -136,7 +136,7 @@ class DataPointDescription:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class DataPointBase:
     """
     Data point element.
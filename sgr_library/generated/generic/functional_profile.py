@@ -10,7 +10,7 @@ from sgr_library.generated.generic.base_types import (
 __NAMESPACE__ = "http://www.smartgridready.com/ns/V0/"
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionalProfileDescription:
     """
     Functional profile properties.
@@ -69,7 +69,7 @@ class FunctionalProfileDescription:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionalProfileBase:
     """
     Functional profile element.
@@ -9,7 +9,7 @@ from sgr_library.generated.generic.base_types import (
 __NAMESPACE__ = "http://www.smartgridready.com/ns/V0/"
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericAttributeListElement:
     name: Optional[str] = field(
         default=None,
@@ -37,7 +37,7 @@ class GenericAttributeListElement:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericAttributeList:
     generic_attribute_list_element: List[GenericAttributeListElement] = field(
         default_factory=list,
@@ -50,7 +50,7 @@ class GenericAttributeList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericAttributeFrame:
     """
     Generic Attribute.
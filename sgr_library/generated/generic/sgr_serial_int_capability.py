@@ -41,7 +41,7 @@ class StopBitLength(Enum):
     VALUE_2 = "2"
 
 
-@dataclass
+@dataclass(slots=True)
 class SerialInterfaceCapability:
     baud_rates_supported: List[BaudRate] = field(
         default_factory=list,
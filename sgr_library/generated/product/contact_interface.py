@@ -6,7 +6,7 @@ from sgr_library.generated.generic.functional_profile import FunctionalProfileBa
 __NAMESPACE__ = "http://www.smartgridready.com/ns/V0/"
 
 
-@dataclass
+@dataclass(slots=True)
 class ContactInterfaceDescription:
     """
     Contact interface properties.
@@ -35,7 +35,7 @@ class ContactInterfaceDescription:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ContactsDataPointList:
     """
     List of data points.
@@ -51,7 +51,7 @@ class ContactsDataPointList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ContactFunctionalProfile(FunctionalProfileBase):
     data_point_list: List[ContactsDataPointList] = field(
         default_factory=list,
@@ -64,7 +64,7 @@ class ContactFunctionalProfile(FunctionalProfileBase):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ContactFunctionalProfileList:
     """
     List of functional profiles.
@@ -80,7 +80,7 @@ class ContactFunctionalProfileList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ContactInterface:
     """
     Container for a device with contacts.
@@ -6,7 +6,7 @@ from sgr_library.generated.generic.functional_profile import FunctionalProfileBa
 __NAMESPACE__ = "http://www.smartgridready.com/ns/V0/"
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericDataPointList:
     """
     List of data points.
@@ -22,7 +22,7 @@ class GenericDataPointList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericFunctionalProfile(FunctionalProfileBase):
     data_point_list: Optional[GenericDataPointList] = field(
         default=None,
@@ -35,7 +35,7 @@ class GenericFunctionalProfile(FunctionalProfileBase):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericFunctionalProfileList:
     """
     List of functional profiles.
@@ -51,7 +51,7 @@ class GenericFunctionalProfileList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class GenericInterface:
     """
     Container for a device without supported transport service.
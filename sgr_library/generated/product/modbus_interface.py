@@ -12,7 +12,7 @@ from sgr_library.generated.product.modbus_types import (
 __NAMESPACE__ = "http://www.smartgridready.com/ns/V0/"
 
 
-@dataclass
+@dataclass(slots=True)
 class ModbusDataPoint(DataPointBase):
     """
     :ivar modbus_data_point_configuration:
@@ -46,7 +46,7 @@ class ModbusDataPoint(DataPointBase):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModbusDataPointList:
     """
     List of data points.
@@ -62,7 +62,7 @@ class ModbusDataPointList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModbusFunctionalProfile(FunctionalProfileBase):
     modbus_attributes: Optional[ModbusAttributes] = field(
         default=None,
@@ -83,7 +83,7 @@ class ModbusFunctionalProfile(FunctionalProfileBase):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModbusFunctionalProfileList:
     """
     List of functional profiles.
@@ -99,7 +99,7 @@ class ModbusFunctionalProfileList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModbusInterface:
     """
     Container for a modbus device.
@@ -94,7 +94,7 @@ class MasterFunctionsSupported(Enum):
     READ_DEVICE_IDENTIFICATION = "ReadDeviceIdentification"
 
 
-@dataclass
+@dataclass(slots=True)
 class ModbusBoolean:
     """
     Modbus specific boolean definition.
@@ -190,7 +190,7 @@ class ModbusLayer6Deviation(Enum):
     VALUE_2_REG_BASE1000_H2_L = "2RegBase1000_H2L"
 
 
-@dataclass
+@dataclass(slots=True)
 class ModbusTcp:
     """Modbus IP address:Specific P elements for Modbus over IP protocol.
 
@@ -239,7 +239,7 @@ class RegisterType(Enum):
     HOLD_REGISTER = "HoldRegister"
 
 
-@dataclass
+@dataclass(slots=True)
 class AccessProtectionEnabled:
     """Modbus datapoints may be protected by execptions.
 
@@ -267,7 +267,7 @@ class AccessProtectionEnabled:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class MasterFunctionsSupportedList:
     """Available function/command codes for Master / Clients The various
     reading, writing and other operations are categorized as follows.
@@ -294,7 +294,7 @@ class MasterFunctionsSupportedList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModbusDataType:
     """
     Modbus specific data types.
@@ -411,7 +411,7 @@ class ModbusDataType:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModbusRtu:
     """
     Modbus RTU serial port configuration.
@@ -472,7 +472,7 @@ class ModbusRtu:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class TimeSyncBlockNotification:
     """
     Time sync block notifications are used to describe a block of registers
@@ -531,7 +531,7 @@ class TimeSyncBlockNotification:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModbusAttributes:
     """
     Modbus-specific attributes.
@@ -596,7 +596,7 @@ class ModbusAttributes:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModbusDataPointConfiguration:
     """
     Detailed configuration for modbus data point.
@@ -658,7 +658,7 @@ class ModbusDataPointConfiguration:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ModbusInterfaceDescription:
     """
     Modbus interface properties.
@@ -19,7 +19,7 @@ from sgr_library.generated.product.rest_api_interface import RestApiInterface
 __NAMESPACE__ = "http://www.smartgridready.com/ns/V0/"
 
 
-@dataclass
+@dataclass(slots=True)
 class ConfigurationDescription(LegibleDescription):
     label: Optional[str] = field(
         default=None,
@@ -30,7 +30,7 @@ class ConfigurationDescription(LegibleDescription):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceInformation:
     """
     :ivar alternative_names:
@@ -185,7 +185,7 @@ class DeviceInformation:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class InterfaceList:
     """
     List of supported interfaces.
@@ -224,7 +224,7 @@ class InterfaceList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ConfigurationListElement:
     name: Optional[str] = field(
         default=None,
@@ -254,7 +254,7 @@ class ConfigurationListElement:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ConfigurationList:
     configuration_list_element: List[ConfigurationListElement] = field(
         default_factory=list,
@@ -267,7 +267,7 @@ class ConfigurationList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceFrame:
     """
     Product declaration.
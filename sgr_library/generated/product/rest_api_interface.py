@@ -10,7 +10,7 @@ from sgr_library.generated.product.rest_api_types import (
 __NAMESPACE__ = "http://www.smartgridready.com/ns/V0/"
 
 
-@dataclass
+@dataclass(slots=True)
 class RestApiDataPoint(DataPointBase):
     rest_api_data_point_configuration: Optional[RestApiDataPointConfiguration] = field(
         default=None,
@@ -22,7 +22,7 @@ class RestApiDataPoint(DataPointBase):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class RestApiDataPointList:
     """
     List of data points.
@@ -38,7 +38,7 @@ class RestApiDataPointList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class RestApiFunctionalProfile(FunctionalProfileBase):
     data_point_list: Optional[RestApiDataPointList] = field(
         default=None,
@@ -51,7 +51,7 @@ class RestApiFunctionalProfile(FunctionalProfileBase):
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class RestApiFunctionalProfileList:
     """
     List of functional profiles.
@@ -67,7 +67,7 @@ class RestApiFunctionalProfileList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class RestApiInterface:
     """
     Container for a rest api device.
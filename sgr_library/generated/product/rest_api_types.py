@@ -5,7 +5,7 @@ from typing import List, Optional
 __NAMESPACE__ = "http://www.smartgridready.com/ns/V0/"
 
 
-@dataclass
+@dataclass(slots=True)
 class HeaderEntry:
     header_name: Optional[str] = field(
         default=None,
@@ -34,7 +34,7 @@ class HttpMethod(Enum):
     DELETE = "DELETE"
 
 
-@dataclass
+@dataclass(slots=True)
 class JmespathMappingRecord:
     class Meta:
         name = "JMESPathMappingRecord"
@@ -87,7 +87,7 @@ class RestApiAuthenticationMethod(Enum):
     AKAMAI_EDGE_GRID_SECURITY_SCHEME = "AkamaiEdgeGridSecurityScheme"
 
 
-@dataclass
+@dataclass(slots=True)
 class RestApiBasic:
     rest_basic_username: Optional[str] = field(
         default=None,
@@ -130,7 +130,7 @@ class RestApiInterfaceSelection(Enum):
     URI = "URI"
 
 
-@dataclass
+@dataclass(slots=True)
 class HeaderList:
     header: List[HeaderEntry] = field(
         default_factory=list,
@@ -141,7 +141,7 @@ class HeaderList:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class JmespathMapping:
     class Meta:
         name = "JMESPathMapping"
@@ -156,7 +156,7 @@ class JmespathMapping:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class ResponseQuery:
     query_type: Optional[ResponseQueryType] = field(
         default=None,
@@ -184,7 +184,7 @@ class ResponseQuery:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class RestApiServiceCall:
     request_header: Optional[HeaderList] = field(
         default=None,
@@ -229,7 +229,7 @@ class RestApiServiceCall:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class RestApiBearer:
     rest_api_service_call: Optional[RestApiServiceCall] = field(
         default=None,
@@ -242,7 +242,7 @@ class RestApiBearer:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class RestApiDataPointConfiguration:
     """
     Detailed configuration for Rest api data point.
@@ -267,7 +267,7 @@ class RestApiDataPointConfiguration:
     )
 
 
-@dataclass
+@dataclass(slots=True)
 class RestApiInterfaceDescription:
     """
     Modbus interface properties.
@@ -1,15 +1,23 @@
+import asyncio
 import configparser
-import re
+import copy
+import importlib
+import sys
+from concurrent.futures import Executor
 from enum import Enum
-from typing import Callable
-
-from xsdata.formats.dataclass.context import XmlContext
-from xsdata.formats.dataclass.parsers import XmlParser
+from typing import Callable, Iterable, TYPE_CHECKING
 
 from sgr_library.generated.product import DeviceFrame
-from sgr_library.modbus_interface import SgrModbusInterface
-from sgr_library.restapi_client_async import SgrRestInterface
-from sgr_library.modbusRTU_interface_async import SgrModbusRtuInterface
+from sgr_library.spec_cache import SpecCache
+from sgr_library.spec_parser import create_parser
+from sgr_library.spec_template import compile_template, compile_frame_template, config_values
+
+if TYPE_CHECKING:
+    from sgr_library.modbus_interface import SgrModbusInterface
+    from sgr_library.restapi_client_async import SgrRestInterface
+    from sgr_library.modbusRTU_interface_async import SgrModbusRtuInterface
+
+    SGrInterface = SgrRestInterface | SgrModbusInterface | SgrModbusRtuInterface
 
 
 class SGrConfiguration(Enum):
@@ -27,13 +35,11 @@ class SGrDeviceProtocol(Enum):
 
 
 def string_loader(xml_str: str) -> DeviceFrame:
-    parser = XmlParser(context=XmlContext())
-    return parser.from_string(xml_str, DeviceFrame)
+    return create_parser().from_string(xml_str, DeviceFrame)
 
 
 def file_loader(path: str) -> DeviceFrame:
-    parser = XmlParser(context=XmlContext())
-    return parser.parse(path, DeviceFrame)
+    return create_parser().parse(path, DeviceFrame)
 
 
 loaders: dict[SGrConfiguration, Callable[[str], DeviceFrame]] = {
@@ -41,14 +47,41 @@ loaders: dict[SGrConfiguration, Callable[[str], DeviceFrame]] = {
     SGrConfiguration.FILE: file_loader,
 }
 
+
+def build_modbus_tcp_interface(frame: DeviceFrame, config: configparser.ConfigParser,
+                               lazy: bool) -> 'SgrModbusInterface':
+    # the transports are imported on first use, an application only loads the protocols of its devices
+    from sgr_library.modbus_interface import SgrModbusInterface
+    from sgr_library.modbus_tcp_connection import connection_options
+    return SgrModbusInterface(frame, lazy, **connection_options(config))
+
+
+def build_modbus_rtu_interface(frame: DeviceFrame, config: configparser.ConfigParser,
+                               lazy: bool) -> 'SgrModbusRtuInterface':
+    from sgr_library.modbusRTU_interface_async import SgrModbusRtuInterface
+    return SgrModbusRtuInterface(frame, lazy)
+
+
+def build_rest_interface(frame: DeviceFrame, config: configparser.ConfigParser, lazy: bool) -> 'SgrRestInterface':
+    from sgr_library.restapi_client_async import SgrRestInterface
+    return SgrRestInterface(frame, config, lazy)
+
+
+# the modules of the interfaces, imported on first use by the device builders
+interface_modules: dict[SGrDeviceProtocol, str] = {
+    SGrDeviceProtocol.MODBUS_TPC: 'sgr_library.modbus_interface',
+    SGrDeviceProtocol.MODBUS_RTU: 'sgr_library.modbusRTU_interface_async',
+    SGrDeviceProtocol.RESTAPI: 'sgr_library.restapi_client_async',
+}
+
 device_builders: dict[SGrDeviceProtocol, Callable[
-    [DeviceFrame, configparser.ConfigParser], SgrRestInterface | SgrModbusInterface | SgrModbusRtuInterface]
+    [DeviceFrame, configparser.ConfigParser, bool], 'SGrInterface']
 ] = {
-    SGrDeviceProtocol.MODBUS_TPC: lambda frame, _: SgrModbusInterface(frame),
-    SGrDeviceProtocol.MODBUS_RTU: lambda frame, _: SgrModbusRtuInterface(frame),
-    SGrDeviceProtocol.RESTAPI: lambda frame, config: SgrRestInterface(frame, config),
-    # SGrDeviceProtocol.GENERIC: lambda frame, config: SgrModbusInterface(frame),
-    # SGrDeviceProtocol.CONTACT: lambda frame, config: SgrModbusInterface(frame)
+    SGrDeviceProtocol.MODBUS_TPC: build_modbus_tcp_interface,
+    SGrDeviceProtocol.MODBUS_RTU: build_modbus_rtu_interface,
+    SGrDeviceProtocol.RESTAPI: build_rest_interface,
+    # SGrDeviceProtocol.GENERIC: lambda frame, config, lazy: SgrModbusInterface(frame),
+    # SGrDeviceProtocol.CONTACT: lambda frame, config, lazy: SgrModbusInterface(frame)
 }
 
 
@@ -72,6 +105,9 @@ class GenericSGrDeviceBuilder:
         self._config_value: str | dict | None = None
         self._type: SGrConfiguration = SGrConfiguration.UNKNOWN
         self._config_type: SGrConfiguration = SGrConfiguration.UNKNOWN
+        self._spec_cache: SpecCache | None = None
+        self._lazy = False
+        self._compact = False
 
     def get_spec_content(self) -> str:
         if self._type == SGrConfiguration.FILE:
@@ -104,25 +140,127 @@ class GenericSGrDeviceBuilder:
         self._config_value = config
         return self
 
-    def replace_variables(self) -> tuple[str, configparser.ConfigParser]:
+    def lazy(self, lazy: bool = True):
+        """
+        Builds function profiles and data points on first access instead of at construction.
+        """
+        self._lazy = lazy
+        return self
+
+    def compact(self, compact: bool = True):
+        """
+        Keeps only the compiled runtime model of the device and drops the parsed spec once the device is built,
+        the descriptive metadata is loaded again from the spec source when it is accessed.
+        All function profiles and data points are built at construction, see BaseSGrInterface.release_frame.
+        """
+        self._compact = compact
+        return self
+
+    def _frame_loader(self) -> Callable[[], DeviceFrame]:
+        # a snapshot, the builder may be reconfigured for other devices
+        builder = copy.copy(self)
+        return lambda: builder.build_frame()[0]
+
+    def spec_cache(self, cache: SpecCache | str | None):
+        """
+        Reuses the compiled frames of a spec cache, a directory path creates the cache in that directory.
+        """
+        self._spec_cache = SpecCache(cache) if isinstance(cache, str) else cache
+        return self
+
+    def get_spec_cache(self) -> SpecCache | None:
+        return self._spec_cache
+
+    def spec_source(self) -> str:
+        """
+        Describes where the spec is read from, e.g. for log messages.
+        """
+        return self._value if self._type == SGrConfiguration.FILE else '<string>'
+
+    def _load_config(self) -> configparser.ConfigParser:
         config = configparser.ConfigParser()
         if self._config_type is SGrConfiguration.FILE:
             config.read(self._config_value)
         elif self._config_type is SGrConfiguration.STRING:
             config.read_dict(self._config_value)
-        spec = self.get_spec_content()
-        for section_name, section in config.items():
-            for param_name in section:
-                pattern = re.compile(r'{{' + param_name + r'}}')
-                spec = pattern.sub(config.get(section_name, param_name), spec)
+        return config
 
-        return spec, config
+    @staticmethod
+    def _substitute(spec: str, config: configparser.ConfigParser) -> str:
+        return compile_template(spec).render(config_values(config))
+
+    def replace_variables(self) -> tuple[str, configparser.ConfigParser]:
+        config = self._load_config()
+        return self._substitute(self.get_spec_content(), config), config
 
-    def build(self) -> SgrRestInterface | SgrModbusInterface | SgrModbusRtuInterface:
+    def build_frame(self) -> tuple[DeviceFrame, configparser.ConfigParser]:
+        """
+        Replaces the variables of the spec and parses it, or loads the compiled frame from the spec cache.
+        """
         if self._type not in loaders:
             raise Exception(f'unsupported loader configuration, {self._type}')
 
-        spec, config = self.replace_variables()
-        xml = loaders[SGrConfiguration.STRING](spec)
+        config = self._load_config()
+        spec = self.get_spec_content()
+        key = self._spec_cache.key(spec, config) if self._spec_cache is not None else None
+        if key is not None:
+            frame = self._spec_cache.load(key)
+            if frame is not None:
+                return frame, config
+
+        # devices built from the same spec share its parsed template and only differ in the replaced values
+        template = compile_frame_template(spec)
+        if template is not None:
+            frame = template.bind(config_values(config))
+        else:
+            frame = loaders[SGrConfiguration.STRING](self._substitute(spec, config))
+        if key is not None:
+            self._spec_cache.store(key, frame)
+        return frame, config
+
+    async def build_frame_async(self,
+                                executor: Executor | None = None) -> tuple[DeviceFrame, configparser.ConfigParser]:
+        """
+        Runs build_frame in an executor, reading and parsing the spec does not block the event loop.
+        :param executor: The executor, e.g. a ProcessPoolExecutor to parse on several cores, the default executor
+            of the loop (a thread pool) if None
+        """
+        return await asyncio.get_running_loop().run_in_executor(executor, self.build_frame)
+
+    def _build_interface(self, xml: DeviceFrame, config: configparser.ConfigParser) -> 'SGrInterface':
         protocol = resolve_protocol(xml)
-        return device_builders[protocol](xml, config)
+        interface = device_builders[protocol](xml, config, self._lazy)
+        if self._compact:
+            interface.release_frame(self._frame_loader())
+        return interface
+
+    def build(self) -> 'SGrInterface':
+        xml, config = self.build_frame()
+        return self._build_interface(xml, config)
+
+    async def build_async(self, executor: Executor | None = None) -> 'SGrInterface':
+        """
+        Builds the device without blocking the event loop, the spec is read and parsed in the executor.
+        The interface is created on the loop, its clients are bound to it.
+        :param executor: See build_frame_async
+        """
+        xml, config = await self.build_frame_async(executor)
+        module = interface_modules.get(resolve_protocol(xml))
+        if module is not None and module not in sys.modules:
+            # the first device of a protocol imports its transport, which takes long enough to stall the loop
+            await asyncio.to_thread(importlib.import_module, module)
+        return self._build_interface(xml, config)
+
+
+async def build_many(builders: Iterable[GenericSGrDeviceBuilder], executor: Executor | None = None,
+                     return_exceptions: bool = False) -> list['SGrInterface | BaseException']:
+    """
+    Builds several devices, their specs are parsed in parallel in the executor.
+    :param builders: The builders of the devices
+    :param executor: See GenericSGrDeviceBuilder.build_frame_async, a ProcessPoolExecutor parses on several cores
+    :param return_exceptions: True to return the error of a device which cannot be built in its place, instead of
+        failing the whole build
+    :returns: The interfaces in the order of the builders
+    """
+    return await asyncio.gather(*(builder.build_async(executor) for builder in builders),
+                                return_exceptions=return_exceptions)
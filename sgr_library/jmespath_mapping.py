@@ -0,0 +1,112 @@
+"""
+SGr JMESPath Mapping
+------------------------
+
+Transforms a REST response into a table with the records of a JMESPathMapping. The from path of a record selects
+values of the response, the to path places them in the table, e.g. from [*].tariffs[*].value to
+[*].tariffs[*].price. Both paths are split at their [*] projections: the parts of from are JMESPath expressions,
+the parts of to are dotted keys, and the value selected at the indices of the projections in the response is stored
+at the same indices in the table. The from and to path of a record need the same number of projections.
+The name of a record is descriptive only.
+"""
+from dataclasses import dataclass
+from typing import Any
+
+import jmespath
+from jmespath.parser import ParsedResult
+
+from sgr_library.generated.product import JmespathMapping
+
+PROJECTION = '[*]'
+
+
+@dataclass(slots=True, frozen=True)
+class MappingRule:
+    # the expressions in between the projections of the from path, None selects the node itself
+    source: tuple[ParsedResult | None, ...]
+    # the keys in between the projections of the to path
+    target: tuple[tuple[str, ...], ...]
+
+
+def _source_part(part: str) -> ParsedResult | None:
+    part = part.strip().lstrip('.')
+    return jmespath.compile(part) if part else None
+
+
+def _target_part(part: str) -> tuple[str, ...]:
+    part = part.strip().strip('.')
+    return tuple(part.split('.')) if part else ()
+
+
+def compile_rule(from_value: str, to: str) -> MappingRule:
+    """
+    :raises ValueError: if the paths do not have the same number of projections
+    :raises jmespath.exceptions.JMESPathError: if a part of the from path is not a valid expression
+    """
+    source = from_value.split(PROJECTION)
+    target = to.split(PROJECTION)
+    if len(source) != len(target):
+        raise ValueError(f"the mapping from {from_value} to {to} changes the number of projections")
+    return MappingRule(tuple(_source_part(part) for part in source), tuple(_target_part(part) for part in target))
+
+
+def _select(node: Any, source: tuple[ParsedResult | None, ...], indices: tuple[int, ...]):
+    value = source[0].search(node) if source[0] is not None else node
+    if len(source) == 1:
+        yield indices, value
+    elif isinstance(value, list):
+        for index, element in enumerate(value):
+            yield from _select(element, source[1:], indices + (index,))
+
+
+def _child(parent: dict | list, key: str | int, kind: type) -> dict | list:
+    current = parent[key] if isinstance(parent, list) else parent.get(key)
+    if not isinstance(current, kind):
+        current = kind()
+        parent[key] = current
+    return current
+
+
+def _place(table: dict, target: tuple[tuple[str, ...], ...], indices: tuple[int, ...], value: Any):
+    parent, key = table, 'table'
+    for level, keys in enumerate(target):
+        for name in keys:
+            parent, key = _child(parent, key, dict), name
+        if level < len(indices):
+            elements = _child(parent, key, list)
+            elements.extend([None] * (indices[level] + 1 - len(elements)))
+            parent, key = elements, indices[level]
+    parent[key] = value
+
+
+class CompiledMapping:
+    """
+    The rules of a JMESPathMapping, compiled once. Like a compiled JMESPath expression it is evaluated with search.
+    """
+
+    def __init__(self, rules: list[MappingRule]):
+        self.rules = rules
+
+    def search(self, response: Any) -> Any:
+        """
+        Transforms a response into the table, in one pass over the rules.
+        :returns: The table, None if no rule selected a value
+        """
+        table = {'table': None}
+        for rule in self.rules:
+            for indices, value in _select(response, rule.source, ()):
+                _place(table, rule.target, indices, value)
+        return table['table']
+
+
+def compile_mapping(mapping: JmespathMapping) -> CompiledMapping:
+    """
+    :raises ValueError: if a record has no from or to path, or they do not have the same number of projections
+    :raises jmespath.exceptions.JMESPathError: if a from path is not valid
+    """
+    rules = []
+    for record in mapping.mapping:
+        if not record.from_value or record.to is None:
+            raise ValueError(f"the mapping record {record.name} needs a from and a to path")
+        rules.append(compile_rule(record.from_value, record.to))
+    return CompiledMapping(rules)
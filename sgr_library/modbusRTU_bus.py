@@ -0,0 +1,155 @@
+"""
+SGr Modbus RTU Bus Scheduler
+------------------------
+
+One scheduler per serial port owns the serial client of the port and transfers the requests of all slaves on that
+bus one at a time. Between two frames the bus stays silent for the inter-frame gap required by the baud rate.
+Pending requests are served round robin across slaves, so a device with many data points cannot starve the other
+devices on the line. Every port has its own scheduler, several RS-485 lines are polled in parallel.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+from sgr_library.modbusRTU_client_async import SGrModbusRTUClient
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# bits of one character on the line: start bit, 8 data bits, parity and stop bit
+_BITS_PER_CHARACTER = 11
+
+# the modbus specification fixes the silent interval to 1.75 ms above 19200 baud
+_FIXED_GAP_BAUDRATE = 19200
+_FIXED_GAP_S = 0.00175
+
+
+def inter_frame_gap(baudrate: int) -> float:
+    """
+    Returns the silent interval of 3.5 characters required between two frames, in seconds.
+    """
+    if baudrate > _FIXED_GAP_BAUDRATE:
+        return _FIXED_GAP_S
+    return 3.5 * _BITS_PER_CHARACTER / baudrate
+
+
+class ModbusRTUBus:
+    """
+    Schedules the requests to the slaves of one serial port.
+    """
+
+    def __init__(self, port: str, parity: str, baudrate: int, client: SGrModbusRTUClient | None = None):
+        """
+        :param port: The serial port, e.g. /dev/ttyUSB0
+        :param parity: The parity of the bus, e.g. 'E'
+        :param baudrate: The baud rate of the bus
+        :param client: The client of the port, created from the settings if not given
+        """
+        self.port = port
+        self.parity = parity
+        self.baudrate = baudrate
+        self.gap = inter_frame_gap(baudrate)
+        self.client = client if client is not None else SGrModbusRTUClient(port, parity, baudrate)
+        self._queues: dict[int, deque[tuple[Callable[[], Awaitable], asyncio.Future]]] = {}
+        self._worker: asyncio.Task | None = None
+        self._connected = False
+        self._last_frame = 0.0
+
+    async def connect(self):
+        """
+        Opens the serial port, once for all slaves of the bus.
+        """
+        if not self._connected:
+            await self.client.connect()
+            self._connected = True
+
+    def close(self):
+        self.client.client.close()
+        self._connected = False
+
+    async def submit(self, slave_id: int, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Queues a request and waits until it was transferred.
+        :param slave_id: The slave the request is addressed to
+        :param request: Performs the request on the serial client
+        :returns: The result of the request
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(slave_id, deque()).append((request, future))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return await future
+
+    def _next_request(self) -> tuple[Callable[[], Awaitable], asyncio.Future] | None:
+        # the slave served is moved to the end, the slaves are served round robin
+        for slave_id in list(self._queues):
+            queue = self._queues.pop(slave_id)
+            if queue:
+                request = queue.popleft()
+                self._queues[slave_id] = queue
+                return request
+        return None
+
+    async def _run(self):
+        while (entry := self._next_request()) is not None:
+            request, future = entry
+            if future.done():
+                # the caller was cancelled while waiting
+                continue
+            silence = self._last_frame + self.gap - time.monotonic()
+            if silence > 0:
+                await asyncio.sleep(silence)
+            try:
+                future.set_result(await request())
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._last_frame = time.monotonic()
+
+    async def read_registers(self, addr: int, size: int, register_type: str, slave_id: int) -> list[int]:
+        """
+        Reads a block of registers of a slave on this bus, see SGrModbusRTUClient.read_registers.
+        """
+        return await self.submit(slave_id, lambda: self.client.read_registers(addr, size, register_type, slave_id))
+
+    async def write_registers(self, addr: int, registers: list[int], slave_id: int):
+        """
+        Writes registers of a slave on this bus, see SGrModbusRTUClient.write_registers.
+        """
+        return await self.submit(slave_id, lambda: self.client.write_registers(addr, registers, slave_id))
+
+
+class ModbusRTUBusRegistry:
+    """
+    The buses of the process by serial port.
+    """
+
+    def __init__(self):
+        self._buses: dict[str, ModbusRTUBus] = {}
+
+    def bus(self, port: str, parity: str, baudrate: int) -> ModbusRTUBus:
+        """
+        Returns the bus of a serial port, it is created on first use.
+        :raises ValueError: if the port is in use with other serial settings
+        """
+        bus = self._buses.get(port)
+        if bus is None:
+            bus = self._buses[port] = ModbusRTUBus(port, parity, baudrate)
+        elif (bus.parity, bus.baudrate) != (parity, baudrate):
+            raise ValueError(f"Serial port {port} is used with parity {bus.parity} and {bus.baudrate} baud, "
+                             f"not with parity {parity} and {baudrate} baud")
+        return bus
+
+    def buses(self) -> list[ModbusRTUBus]:
+        return list(self._buses.values())
+
+
+# the registry shared by all modbus RTU interfaces of the process
+bus_registry = ModbusRTUBusRegistry()
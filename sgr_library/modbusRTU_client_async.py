@@ -3,6 +3,7 @@ import asyncio
 from pymodbus.client import AsyncModbusSerialClient
 from pymodbus.constants import Endian
 
+from sgr_library.exceptions import RegisterError
 from sgr_library.payload_decoder import PayloadDecoder, PayloadBuilder, RoundingScheme
 
 
@@ -57,6 +58,39 @@ class SGrModbusRTUClient:
             if not reg.isError():
                 return decoder.decode(data_type, 0)
 
+    async def read_registers(self, addr: int, size: int, register_type: str, slave_id: int) -> list[int]:
+        """
+        Reads a block of registers without decoding them.
+        :param addr: The address of the first register
+        :param size: The number of registers to read
+        :param register_type: The type of the register
+        :param slave_id: The ID of the slave
+        :returns: The raw register values
+        """
+        async with self._semaphore:
+            if register_type == "HoldRegister":
+                reg = await self.client.read_holding_registers(addr, count=size, slave=slave_id)
+            elif register_type == "InputRegister":
+                reg = await self.client.read_input_registers(addr, count=size, slave=slave_id)
+            else:
+                raise ValueError(f"Invalid register type: {register_type}")
+
+            if reg.isError():
+                raise RegisterError(f"Error reading register: {reg}")
+            return reg.registers
+
+    async def write_registers(self, addr: int, registers: list[int], slave_id: int):
+        """
+        Writes already encoded registers.
+        :param addr: The address of the first register
+        :param registers: The register values to write
+        :param slave_id: The ID of the slave
+        """
+        async with self._semaphore:
+            reg = await self.client.write_registers(address=addr, values=registers, slave=slave_id)
+            if reg.isError():
+                raise RegisterError(f"Error writing register: {reg}")
+
     # not changed
     async def value_encoder(self, addr: int, value: float, data_type: str, slave_id: int, order: Endian):
         """
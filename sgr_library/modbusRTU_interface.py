@@ -11,6 +11,7 @@ from sgr_library.api import build_configurations_parameters
 from sgr_library.generated.product import DeviceFrame
 #from sgr_library.data_classes.ei_modbus.sgr_modbus_eidevice_frame import SgrModbusDataPointsFrameType
 from sgr_library.modbusRTU_client import SGrModbusRTUClient
+from sgr_library.modbus_codec import modbus_data_type_name
 from sgr_library.auxiliary_functions import get_port, get_endian, find_dp, get_baudrate, get_slave_rtu, get_parity
 
 
@@ -133,11 +134,10 @@ class SgrModbusRtuInterface:
         return register_type
 
     def get_datatype(self, dp) -> str:
-        datatype = dp.modbus_data_point[0].modbus_data_type.__dict__
-        for key in datatype:
-            if datatype[key] != None:
-                return key
-        print('data_type not available')
+        datatype = modbus_data_type_name(dp.modbus_data_point[0].modbus_data_type)
+        if datatype is None:
+            print('data_type not available')
+        return datatype
 
     def get_bit_rank(self, dp):
         bitrank = dp.modbus_data_point[0].modbus_first_register_reference.bit_rank
@@ -1,7 +1,8 @@
+import asyncio
 import logging
 import os
 from dataclasses import dataclass
-from typing import Optional, Tuple, Dict, Any, Iterable
+from typing import Optional, Tuple, Dict, Any, Iterable, Mapping
 from pymodbus.constants import Endian
 from xsdata.formats.dataclass.parsers import XmlParser
 from xsdata.formats.dataclass.context import XmlContext
@@ -9,14 +10,19 @@ import time
 
 from sgr_library.api import BaseSGrInterface, DeviceInformation, FunctionProfile, DataPointProtocol, DataPoint, \
     build_configurations_parameters, ConfigurationParameter
-from sgr_library.auxiliary_functions import find_dp
+from sgr_library.api.lazy_mapping import build_mapping
 from sgr_library.converters import build_converter
 from sgr_library.generated.generic import Parity, DataDirectionProduct
 
 # from sgr_library.data_classes.ei_modbus import SgrModbusDeviceDescriptionType
 from sgr_library.generated.product import DeviceFrame, ModbusDataPoint, ModbusFunctionalProfile
 
-from sgr_library.modbusRTU_client_async import SGrModbusRTUClient
+from sgr_library.exceptions import RegisterError, DataProcessingError, DeviceUnavailableError
+from sgr_library.data_point_index import build_modbus_index, build_modbus_record
+from sgr_library.modbus_codec import modbus_data_type_name
+from sgr_library.modbus_blocks import BlockCache, plan_writes
+from sgr_library.modbusRTU_bus import ModbusRTUBus, bus_registry
+from sgr_library.circuit_breaker import CircuitBreaker, is_modbus_failure
 from sgr_library.validators import build_validator
 
 
@@ -71,8 +77,8 @@ class ModBusRTUDataPoint(DataPointProtocol):
 
     def __init__(self, modbus_api_dp: ModbusDataPoint, modbus_api_fp: ModbusFunctionalProfile,
                  interface: 'SgrModbusRtuInterface'):
-        self._dp = modbus_api_dp
-        self._fp = modbus_api_fp
+        self._name = modbus_api_fp.functional_profile.functional_profile_name, modbus_api_dp.data_point.data_point_name
+        self._direction = modbus_api_dp.data_point.data_direction
         self._interface = interface
 
     async def write(self, data: Any):
@@ -82,37 +88,41 @@ class ModBusRTUDataPoint(DataPointProtocol):
         return await self._interface.getval(self.name()[0], self.name()[1])
 
     def name(self) -> tuple[str, str]:
-        return self._fp.functional_profile.functional_profile_name, self._dp.data_point.data_point_name
+        return self._name
 
     def direction(self) -> DataDirectionProduct:
-        return self._dp.data_point.data_direction
+        return self._direction
 
 
 class ModBusRTUFunctionProfile(FunctionProfile):
 
-    def __init__(self, modbus_api_fp: ModbusFunctionalProfile, interface: 'SgrModbusRtuInterface'):
-        self._fp = modbus_api_fp
+    def __init__(self, modbus_api_fp: ModbusFunctionalProfile, interface: 'SgrModbusRtuInterface', lazy: bool = False):
+        self._name = modbus_api_fp.functional_profile.functional_profile_name
         self._interface = interface
-        dps = [build_modbus_rtu_data_point(dp, self._fp, self._interface) for dp in
-               self._fp.data_point_list.data_point_list_element]
-        self._data_points = {dp.name(): dp for dp in dps}
+        self._data_points = build_mapping(
+            modbus_api_fp.data_point_list.data_point_list_element,
+            lambda dp: (self._name, dp.data_point.data_point_name),
+            lambda dp: build_modbus_rtu_data_point(dp, modbus_api_fp, self._interface),
+            lazy)
 
     def name(self) -> str:
-        return self._fp.functional_profile.functional_profile_name
+        return self._name
 
-    def get_data_points(self) -> dict[tuple[str, str], DataPoint]:
+    def get_data_points(self) -> Mapping[tuple[str, str], DataPoint]:
         return self._data_points
 
+    def read_limiter(self) -> asyncio.Semaphore:
+        return self._interface.read_limiter()
+
 
 class SgrModbusRtuInterface(BaseSGrInterface):
-    # a global Modbus client
-    globalModbusRTUClient = None
 
-    def __init__(self, frame: DeviceFrame) -> None:
+    def __init__(self, frame: DeviceFrame, lazy: bool = False) -> None:
         """
         Creates a connection from xml file data.
         Parses the xml file with xsdata library.
         :param xml_file: Name of the xml file to parse
+        :param lazy: Builds function profiles and data points on first access, see preload()
         """
         self.root = frame
         # self.root = parser.parse(interface_file, SgrModbusDeviceDescriptionType)
@@ -122,9 +132,16 @@ class SgrModbusRtuInterface(BaseSGrInterface):
         self.parity = get_parity(self.root)
         self.slave_id = get_slave(self.root)
         self.byte_order = get_endian(self.root)
-        fps = [ModBusRTUFunctionProfile(profile, self) for profile in
-               self.root.interface_list.modbus_interface.functional_profile_list.functional_profile_list_element]
-        self._function_profiles = {fp.name(): fp for fp in fps}
+        self.bus: ModbusRTUBus | None = None
+        self.circuit_breaker = CircuitBreaker(is_modbus_failure)
+        self._data_point_index = build_modbus_index(self.root.interface_list.modbus_interface, self.byte_order)
+        self._block_cache = BlockCache(self.root.interface_list.modbus_interface.time_sync_block_notification,
+                                       self._read_cached_block)
+        self._function_profiles = build_mapping(
+            self.root.interface_list.modbus_interface.functional_profile_list.functional_profile_list_element,
+            lambda profile: profile.functional_profile.functional_profile_name,
+            lambda profile: ModBusRTUFunctionProfile(profile, self, lazy),
+            lazy)
         self._device_information = DeviceInformation(
             name=frame.device_name,
             manufacture=frame.manufacturer_name,
@@ -179,19 +196,39 @@ class SgrModbusRtuInterface(BaseSGrInterface):
         :returns: The current decoded value in the datapoint register.
         """
         if len(parameter) == 2:
-            dp = find_dp(self.root, parameter[0], parameter[1])
+            record = self._data_point_index.find(parameter[0], parameter[1])
         else:
-            dp = parameter[0]
-        address = self.get_address(dp)
-        size = self.get_size(dp)
-        data_type = self.get_datatype(dp)
-        reg_type = self.get_register_type(dp)
+            record = build_modbus_record('', parameter[0], self.byte_order)
+        address = record.address
+        size = record.count
+        data_type = record.data_type
         slave_id = self.slave_id
-        order = self.byte_order
+        order = record.byte_order
 
         logging.debug(
             f"getVal() with address: {address}, size: {size}, data_type:{data_type}, slave_id: {slave_id}, order: {order}")  # for debugging
-        return await self.client.value_decoder(address, size, data_type, reg_type, slave_id, order)
+        try:
+            if self._block_cache.serves(record.block_cache_identification, record.register_type, address, size):
+                registers = await self._block_cache.read(record.block_cache_identification, address, size)
+            else:
+                registers = await self._read_registers(address, size, record.register_type)
+        except DeviceUnavailableError as e:
+            logging.debug(e)
+            return None
+        except RegisterError as e:
+            logging.error(e)
+            return None
+        return record.codec.decode(registers)
+
+    async def _read_cached_block(self, address: int, size: int, register_type: str) -> list[int]:
+        return await self._read_registers(address, size, register_type)
+
+    async def _read_registers(self, address: int, size: int, register_type: str) -> list[int]:
+        return await self.circuit_breaker.call(
+            lambda: self.bus.read_registers(address, size, register_type, self.slave_id))
+
+    async def _write_registers(self, address: int, registers: list[int]):
+        await self.circuit_breaker.call(lambda: self.bus.write_registers(address, registers, self.slave_id))
 
     async def setval(self, fp_name: str, dp_name: str, value: float) -> None:
         """
@@ -200,12 +237,32 @@ class SgrModbusRtuInterface(BaseSGrInterface):
         :param dp_name: The name of the datapoint.
         :param value: The value that is to be written on the datapoint.
         """
-        dp: ModbusDataPoint = find_dp(self.root, fp_name, dp_name)
-        address = self.get_address(dp)
-        data_type = self.get_datatype(dp)
-        slave_id = self.slave_id
-        order = self.byte_order
-        await self.client.value_encoder(address, value, data_type, slave_id, order)
+        record = self._data_point_index.find(fp_name, dp_name)
+        await self._write_registers(record.address, record.codec.encode(value))
+        if record.block_cache_identification is not None:
+            self._block_cache.invalidate(record.block_cache_identification)
+
+    async def write_many(self, values: dict[tuple[str, str], Any]):
+        """
+        Writes several data points, values of adjacent holding registers are written with one request,
+        so that the device applies them together. All values are converted, validated and encoded before the
+        first request is sent.
+        :param values: The values by functional profile and data point name
+        """
+        writes = []
+        for key, value in values.items():
+            record = self._data_point_index.find(*key)
+            if record.address is None:
+                raise DataProcessingError(f"Data point {key} has no address")
+            raw_value = self.get_data_point(key).to_device(value)
+            writes.append((key, record.register_type, record.address, record.codec.encode(raw_value)))
+
+        for block in plan_writes(writes):
+            await self._write_registers(block.address, block.registers)
+            for key in block.keys:
+                identification = self._data_point_index.find(*key).block_cache_identification
+                if identification is not None:
+                    self._block_cache.invalidate(identification)
 
     def get_device_profile(self):
         return (self.root.device_profile)
@@ -220,10 +277,7 @@ class SgrModbusRtuInterface(BaseSGrInterface):
         return dp.modbus_data_point_configuration.register_type.value.__str__()
 
     def get_datatype(self, dp: ModbusDataPoint) -> str:
-        datatype = dp.modbus_data_point_configuration.modbus_data_type.__dict__
-        for key in datatype:
-            if datatype[key] is not None:
-                return key
+        return modbus_data_type_name(dp.modbus_data_point_configuration.modbus_data_type)
 
     def get_bit_rank(self, dp: ModbusDataPoint):
         return dp.modbus_data_point_configuration.bit_rank
@@ -268,19 +322,12 @@ class SgrModbusRtuInterface(BaseSGrInterface):
         return self._configurations_params
 
     async def connect(self):
-        # check if there already exists a ModbusRTUClient for the communication over ModbusRTU
-        if SgrModbusRtuInterface.globalModbusRTUClient is None:
-            self.client = SGrModbusRTUClient(str(self.port), str(self.parity), int(self.baudrate))
-            SgrModbusRtuInterface.globalModbusRTUClient = self.client
-        else:
-            self.client = SgrModbusRtuInterface.globalModbusRTUClient
+        # all devices on the same serial port share the bus of the port, the ports are independent of each other
+        self.bus = bus_registry.bus(str(self.port), str(self.parity), int(self.baudrate))
+        self.client = self.bus.client
+        await self.bus.connect()
 
-        if self.client:
-            connected = await self.client.connect()
-            if connected:
-                print("Connected to ModbusRTU on Port: " + self.port)
-
-    def get_function_profiles(self) -> dict[str, FunctionProfile]:
+    def get_function_profiles(self) -> Mapping[str, FunctionProfile]:
         return self._function_profiles
 
     def device_information(self) -> DeviceInformation:
@@ -319,6 +366,13 @@ class SgrModbusRtuInterface(BaseSGrInterface):
         # TODO it could also be root.device_information.alternative_names.manuf_name
         return self.root.manufacturer_name
 
+    def set_max_concurrent_reads(self, limit: int):
+        """
+        The serial bus transfers one request at a time, the reads of a RTU device are never run concurrently.
+        """
+        if limit != 1:
+            logging.warning(f"Modbus RTU reads one data point at a time, ignoring {limit} concurrent reads")
+
     def set_slave_id(self, slave_id: int):
         """
         changes the slave id for the instance
@@ -339,8 +393,7 @@ if __name__ == "__main__":
 
     # a.setval('ActiveEnerBalanceAC', 'ActiveImportAC', 9000)
 
-    dp = find_dp(a.root, 'ActiveEnerBalanceAC', 'ActiveImportAC')
-    print("ActiveImportAC :", a.getval(dp))
+    print("ActiveImportAC :", a.getval('ActiveEnerBalanceAC', 'ActiveImportAC'))
 
     a.client.client.close()
     print("print finished")
@@ -0,0 +1,212 @@
+"""
+SGr Modbus Block Planner
+------------------------
+
+Groups the data points of a modbus device into contiguous register blocks, so that a complete
+device (or functional profile) can be polled with a minimal number of read transactions.
+Blocks declared by the device (timeSyncBlockNotification) are read once and cached for their time to live.
+Values written together to adjacent holding registers are merged into single write multiple registers requests.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Callable, Awaitable
+
+from sgr_library.generated.product import TimeSyncBlockNotification
+from sgr_library.modbus_codec import ModbusCodec
+
+# maximum number of registers a single read holding/input registers request may return
+MAX_BLOCK_SIZE = 125
+
+# maximum number of registers a single write multiple registers request may write
+MAX_WRITE_SIZE = 123
+
+# number of unused registers which may be read in between two data points of the same block
+DEFAULT_MAX_GAP = 8
+
+BLOCK_REGISTER_TYPES = ("HoldRegister", "InputRegister")
+
+
+@dataclass
+class BlockMember:
+    key: tuple[str, str]
+    register_type: str | None
+    address: int | None
+    size: int | None
+    codec: ModbusCodec | None
+
+
+@dataclass
+class RegisterBlock:
+    register_type: str
+    address: int
+    size: int
+    members: list[BlockMember] = field(default_factory=list)
+
+
+@dataclass
+class ReadPlan:
+    keys: list[tuple[str, str]]
+    blocks: list[RegisterBlock]
+    singles: list[BlockMember]
+
+
+def is_block_readable(member: BlockMember, max_size: int = MAX_BLOCK_SIZE) -> bool:
+    return member.register_type in BLOCK_REGISTER_TYPES \
+        and member.address is not None \
+        and member.size is not None \
+        and 0 < member.size <= max_size \
+        and member.codec is not None
+
+
+def plan_reads(members: Iterable[BlockMember], max_gap: int = DEFAULT_MAX_GAP,
+               max_size: int = MAX_BLOCK_SIZE) -> ReadPlan:
+    """
+    Plans the register blocks needed to read all members.
+    Members are grouped by register type and address, a block is extended as long as the next member
+    starts at most max_gap registers after the end of the block and the block does not exceed max_size.
+    :param members: The data points to read
+    :param max_gap: The number of unused registers tolerated in between two members of a block
+    :param max_size: The maximum number of registers of a block
+    :returns: The read plan, members which cannot be read within a block are listed as singles
+    """
+    members = list(members)
+    singles = [member for member in members if not is_block_readable(member, max_size)]
+    by_register_type: dict[str, list[BlockMember]] = {}
+    for member in members:
+        if is_block_readable(member, max_size):
+            by_register_type.setdefault(member.register_type, []).append(member)
+
+    blocks = []
+    for register_type, group in by_register_type.items():
+        block = None
+        for member in sorted(group, key=lambda m: (m.address, m.size)):
+            member_end = member.address + member.size
+            if block is not None \
+                    and member.address <= block.address + block.size + max_gap \
+                    and member_end - block.address <= max_size:
+                block.size = max(block.size, member_end - block.address)
+                block.members.append(member)
+            else:
+                block = RegisterBlock(register_type, member.address, member.size, [member])
+                blocks.append(block)
+
+    return ReadPlan([member.key for member in members], blocks, singles)
+
+
+@dataclass
+class WriteBlock:
+    register_type: str | None
+    address: int
+    registers: list[int]
+    keys: list[tuple[str, str]] = field(default_factory=list)
+
+
+def plan_writes(writes: Iterable[tuple[tuple[str, str], str | None, int, list[int]]],
+                max_size: int = MAX_WRITE_SIZE) -> list[WriteBlock]:
+    """
+    Merges the writes to adjacent holding registers into blocks, which are written with one request each.
+    Only data points which follow each other without a gap are merged, the registers in between are not touched.
+    :param writes: The data point key, register type, address and encoded registers of each write
+    :param max_size: The maximum number of registers of a block
+    :returns: The blocks to write, writes to other register types are kept as blocks of their own
+    """
+    blocks = []
+    block = None
+    for key, register_type, address, registers in sorted(writes, key=lambda w: (w[1] != "HoldRegister", w[2])):
+        if register_type == "HoldRegister" and block is not None \
+                and address == block.address + len(block.registers) \
+                and len(block.registers) + len(registers) <= max_size:
+            block.registers.extend(registers)
+            block.keys.append(key)
+            continue
+        block = WriteBlock(register_type, address, list(registers), [key])
+        blocks.append(block)
+        if register_type != "HoldRegister":
+            block = None
+    return blocks
+
+
+@dataclass
+class CachedBlock:
+    identification: str
+    register_type: str
+    address: int
+    size: int
+    time_to_live_ms: int
+    registers: list[int] | None = None
+    timestamp: float = 0.0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    def is_valid(self) -> bool:
+        return self.registers is not None and (time.monotonic() - self.timestamp) * 1000 < self.time_to_live_ms
+
+    def contains(self, address: int, size: int) -> bool:
+        return self.address <= address and address + size <= self.address + self.size
+
+
+class BlockCache:
+    """
+    Serves the data points referencing a timeSyncBlockNotification from one block read,
+    until the time to live of the block expires. Notifications without a time to live are not cached.
+    """
+
+    def __init__(self, notifications: Iterable[TimeSyncBlockNotification],
+                 read_block: Callable[[int, int, str], Awaitable[list[int]]]):
+        """
+        :param notifications: The block notifications of the modbus interface
+        :param read_block: Reads size registers of the register type starting at address
+        """
+        self._read_block = read_block
+        self._blocks: dict[str, CachedBlock] = {}
+        for notification in notifications:
+            if notification.block_cache_identification is None or notification.first_address is None \
+                    or notification.size is None or notification.register_type is None:
+                continue
+            if not notification.time_to_live_ms:
+                # a block which is never valid would be read again for each of its data points
+                continue
+            self._blocks[notification.block_cache_identification] = CachedBlock(
+                identification=notification.block_cache_identification,
+                register_type=notification.register_type.value,
+                address=notification.first_address,
+                size=notification.size,
+                time_to_live_ms=notification.time_to_live_ms
+            )
+
+    def serves(self, identification: str | None, register_type: str | None, address: int | None,
+               size: int | None) -> bool:
+        """
+        Checks if a data point can be read from a cached block, it has to lie within the registers of the block.
+        """
+        block = self._blocks.get(identification) if identification is not None else None
+        return block is not None and block.register_type == register_type and address is not None \
+            and size is not None and block.contains(address, size)
+
+    async def read(self, identification: str, address: int, size: int) -> list[int]:
+        """
+        Returns the registers of a data point, the block is read from the device if it expired.
+        :param identification: The block cache identification of the data point
+        :param address: The address of the data point
+        :param size: The number of registers of the data point
+        :returns: The registers of the data point
+        """
+        block = self._blocks[identification]
+        registers = block.registers if block.is_valid() else None
+        if registers is None:
+            # concurrent readers of an expired block wait for the first one to refresh it
+            async with block.lock:
+                if not block.is_valid():
+                    block.registers = await self._read_block(block.address, block.size, block.register_type)
+                    block.timestamp = time.monotonic()
+                registers = block.registers
+        offset = address - block.address
+        return registers[offset:offset + size]
+
+    def invalidate(self, identification: str | None = None):
+        """
+        Drops a cached block, or all blocks if no identification is given, e.g. after writing to the device.
+        """
+        for block in self._blocks.values():
+            if identification is None or block.identification == identification:
+                block.registers = None
@@ -1,10 +1,13 @@
 from sgr_library.payload_decoder import PayloadDecoder, PayloadBuilder, RoundingScheme
 from pymodbus.constants import Endian
-from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ConnectionException
 from typing import Optional, Tuple, Dict, Any, Iterable
 from sgr_library.exceptions import RegisterError
+from sgr_library.modbus_tcp_connection import ModbusTcpConnection, ModbusTcpConnectionRegistry, connection_registry, \
+    DEFAULT_MAX_IN_FLIGHT, DEFAULT_TIMEOUT
 import asyncio
 import logging
+import warnings
 
 
 # In this case establishes a connection with the localhost server that is running the simulation.
@@ -13,21 +16,63 @@ import logging
 
 class SGrModbusClient:
 
-    def __init__(self, ip: str, port: int):
+    def __init__(self, ip: str, port: int, registry: ModbusTcpConnectionRegistry = connection_registry,
+                 timeout: float = DEFAULT_TIMEOUT, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
         """
-        Creates client
+        Creates client, the connection is shared with all clients of the same host and port.
         :param ip: The host to connect to (default 127.0.0.1)
         :param port: The modbus port to connect to (default 502)
+        :param registry: The registry providing the shared connection
+        :param timeout: The time in seconds to wait for a response
+        :param max_in_flight: The number of requests waiting for a response at the same time on the connection
         """
-        # EXAMPLE: client = ModbusTcpClient('127.0.0.1', 5002)
-        self.client = AsyncModbusTcpClient(
-            host=ip,
-            port=port,
-            timeout=1,
-            retries=0,
-            reconnect_delay=5000,
-            close_comm_on_error=False, )
-        # self.client.connect() #TODO a wrapper that opens and closes connection when function is excecuted?
+        self.ip = ip
+        self.port = port
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self._registry = registry
+        self.connection: ModbusTcpConnection | None = None
+        self._legacy_client = None
+
+    @property
+    def client(self):
+        """
+        Deprecated, the pymodbus client this class used to wrap. It has its own connection to the device, which is
+        not shared with the other clients of the host and port and not closed by close().
+        """
+        warnings.warn("SGrModbusClient.client is deprecated, use connect(), read_registers() and "
+                      "write_registers() of SGrModbusClient", DeprecationWarning, stacklevel=2)
+        if self._legacy_client is None:
+            from pymodbus.client import AsyncModbusTcpClient
+            self._legacy_client = AsyncModbusTcpClient(
+                host=self.ip,
+                port=self.port,
+                timeout=self.timeout,
+                retries=0,
+                reconnect_delay=5000,
+                close_comm_on_error=False, )
+        return self._legacy_client
+
+    async def connect(self):
+        """
+        Acquires the shared connection of the host and port and opens it if it is not open yet.
+        """
+        if self.connection is None:
+            self.connection = self._registry.acquire(self.ip, self.port, self.timeout, self.max_in_flight)
+        await self.connection.connect()
+
+    async def close(self):
+        """
+        Releases the shared connection, it is closed when no other client uses it.
+        """
+        if self.connection is not None:
+            connection, self.connection = self.connection, None
+            await self._registry.release(connection)
+
+    def _connection(self) -> ModbusTcpConnection:
+        if self.connection is None:
+            raise ConnectionException(f"{self.ip}:{self.port} not connected")
+        return self.connection
 
     async def value_decoder(self, addr: int, size: int, data_type: str, register_type: str, slave_id: int,
                             order: Endian) -> Optional[float]:
@@ -42,17 +87,8 @@ class SGrModbusClient:
         :returns: Decoded float
         """
         try:
-            if register_type == "HoldRegister":
-                reg = await self.client.read_holding_registers(addr, size, slave=slave_id)
-            elif register_type == "InputRegister":
-                reg = await self.client.read_input_registers(addr, count=size, slave=slave_id)
-            else:
-                raise ValueError(f"Invalid register type: {register_type}")
-
-            if reg.isError():
-                raise RegisterError(f"Error reading register: {reg}")
-
-            decoder = PayloadDecoder.fromRegisters(reg.registers, byteorder=order, wordorder=order)
+            registers = await self.read_registers(addr, size, register_type, slave_id)
+            decoder = PayloadDecoder.fromRegisters(registers, byteorder=order, wordorder=order)
             return decoder.decode(data_type, 0)
             # TODO: Add code to decode and return the float value based on the data type
         except asyncio.TimeoutError:
@@ -65,6 +101,26 @@ class SGrModbusClient:
             logging.exception(f"An unexpected error occurred: {e}")
             return None
 
+    async def read_registers(self, addr: int, size: int, register_type: str, slave_id: int) -> list[int]:
+        """
+        Reads a block of registers without decoding them.
+        :param addr: The address of the first register
+        :param size: The number of registers to read
+        :param register_type: The type of the register
+        :param slave_id: The ID of the slave
+        :returns: The raw register values
+        """
+        return await self._connection().read_registers(addr, size, register_type, slave_id)
+
+    async def write_registers(self, addr: int, registers: list[int], slave_id: int):
+        """
+        Writes already encoded registers.
+        :param addr: The address of the first register
+        :param registers: The register values to write
+        :param slave_id: The ID of the slave
+        """
+        await self._connection().write_registers(addr, registers, slave_id)
+
     # TODO Under construction
     async def mult_value_decoder(self, addr: int, size: int, data_type: str, register_type: str, slave_id: int,
                                  order: Endian) -> Optional[float]:
@@ -75,19 +131,13 @@ class SGrModbusClient:
         :param data_type: The modbus type to decode
         :returns: Decoded float
         """
-        if register_type == "HoldRegister":
-            reg = self.client.read_holding_registers(addr, size, slave=slave_id)  # TODO add slave id?
-        else:
-            reg = self.client.read_input_registers(addr, count=size, slave=slave_id)
-        decoder = PayloadDecoder.fromRegisters(reg.registers, byteorder=order, wordorder=order)
-        # print(decoder.decode('float32', 0))
-        if not reg.isError():
-            # await print(decoder.decode(data_type, 0))
-            indexes = [size // 3 * 0, size // 3 * 1, size // 3 * 2]
-            l1 = decoder.decode(data_type, indexes[0])
-            l2 = decoder.decode(data_type, indexes[1])
-            l3 = decoder.decode(data_type, indexes[2])
-            return l1, l2, l3
+        registers = await self.read_registers(addr, size, register_type, slave_id)
+        decoder = PayloadDecoder.fromRegisters(registers, byteorder=order, wordorder=order)
+        indexes = [size // 3 * 0, size // 3 * 1, size // 3 * 2]
+        l1 = decoder.decode(data_type, indexes[0])
+        l2 = decoder.decode(data_type, indexes[1])
+        l3 = decoder.decode(data_type, indexes[2])
+        return l1, l2, l3
 
     async def value_encoder(self, addr: int, value: float, data_type: str, slave_id: int, order: Endian):
         """
@@ -101,7 +151,7 @@ class SGrModbusClient:
         try:
             builder = PayloadBuilder(byteorder=order, wordorder=order) \
                 .sgr_encode(value, data_type, RoundingScheme.floor)
-            self.client.write_registers(address=addr, values=builder.to_registers(), unit=slave_id)
+            await self.write_registers(addr, builder.to_registers(), slave_id)
         except asyncio.TimeoutError:
             logging.exception(f"Timeout writing value to register at address {addr} with slave ID {slave_id}")
         except ValueError as e:
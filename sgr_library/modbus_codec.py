@@ -0,0 +1,225 @@
+"""
+SGr Modbus Codec
+------------------------
+
+Precompiled codecs to decode and encode the registers of a modbus data point.
+A codec is compiled once per data type, register count, byte order and word order into a struct.Struct,
+and decodes a value with a single unpack_from, directly from the registers read from the device.
+For the data types supported by the PayloadDecoder and PayloadBuilder of this library the codecs produce the
+same values, in addition strings are decoded to str and boolean, enum and bitmap data points are supported.
+Float registers are decoded unrounded like the PayloadDecoder did, but they are also written unrounded: the
+PayloadBuilder floored a value written to a float register, e.g. 21.5 to 21.0. Only values written to integer
+registers are rounded.
+"""
+import struct
+from dataclasses import fields
+from functools import lru_cache
+from math import ceil
+from operator import itemgetter
+from typing import Any, Callable
+
+from pymodbus.constants import Endian
+
+from sgr_library.generated.product import ModbusDataType
+from sgr_library.payload_decoder import RoundingScheme, round_to_int
+
+# struct format of the data types with a fixed size
+_NUMBER_FORMATS = {
+    'int8': 'b',
+    'int8_u': 'B',
+    'int16': 'h',
+    'int16_u': 'H',
+    'int32': 'i',
+    'int32_u': 'I',
+    'int64': 'q',
+    'int64_u': 'Q',
+    'float32': 'f',
+    'float64': 'd',
+}
+
+# data types which are transferred as unsigned integer spanning all registers of the data point
+_UNSIGNED_FORMATS = {1: 'H', 2: 'I', 4: 'Q'}
+_UNSIGNED_TYPES = ('boolean', 'enum', 'bitmap')
+
+
+def modbus_data_type_name(data_type: ModbusDataType | None) -> str | None:
+    """
+    Returns the name of the modbus data type which is set, e.g. "int16_u".
+    """
+    if data_type is None:
+        return None
+    for data_type_field in fields(data_type):
+        if getattr(data_type, data_type_field.name) is not None:
+            return data_type_field.name
+    return None
+
+
+def registers_to_bytes(registers: list[int]) -> bytes:
+    """
+    Packs registers into the bytes sent over the wire, so that several codecs can decode from one buffer.
+    """
+    return struct.pack(f'>{len(registers)}H', *registers)
+
+
+def _byte_permutation(size: int, byteorder: Endian, wordorder: Endian) -> tuple[int, ...]:
+    """
+    Returns the order in which the bytes on the wire are assembled into a big endian value,
+    the same transformation the pymodbus payload decoder applies.
+    """
+    if size == 1:
+        return 0,
+    if size == 2:
+        return (0, 1) if byteorder != Endian.LITTLE else (1, 0)
+    words = range(size // 2)
+    if wordorder == Endian.LITTLE:
+        words = reversed(words)
+    permutation = []
+    for word in words:
+        permutation.extend((2 * word, 2 * word + 1) if byteorder != Endian.LITTLE else (2 * word + 1, 2 * word))
+    return tuple(permutation)
+
+
+class ModbusCodec:
+    """
+    Decodes and encodes the registers of one modbus data type.
+    """
+    __slots__ = ('data_type', 'count', 'size', '_struct', '_reorder', '_restore', '_from_raw', '_to_raw')
+
+    def __init__(self, data_type: str, count: int, fmt: str, byteorder: Endian, wordorder: Endian,
+                 from_raw: Callable[[Any], Any] | None = None, to_raw: Callable[[Any], Any] | None = None):
+        self.data_type = data_type
+        self.count = count
+        self.size = struct.calcsize('>' + fmt)
+        permutation = _byte_permutation(self.size, byteorder, wordorder)
+        self._reorder = None
+        self._restore = None
+        if permutation == tuple(range(self.size)):
+            self._struct = struct.Struct('>' + fmt)
+        elif permutation == tuple(reversed(range(self.size))):
+            self._struct = struct.Struct('<' + fmt)
+        else:
+            # mixed byte and word order, the bytes are reordered before unpacking
+            self._struct = struct.Struct('>' + fmt)
+            self._reorder = itemgetter(*permutation)
+            self._restore = itemgetter(*sorted(range(self.size), key=permutation.__getitem__))
+        self._from_raw = from_raw
+        self._to_raw = to_raw
+
+    def decode(self, registers: list[int]) -> Any:
+        """
+        :param registers: The registers of the data point
+        :returns: The decoded value
+        """
+        return self.decode_from(registers_to_bytes(registers), 0)
+
+    def decode_from(self, buffer: bytes, offset: int = 0) -> Any:
+        """
+        :param buffer: The registers as bytes, see registers_to_bytes
+        :param offset: The register offset of the data point within the buffer
+        :returns: The decoded value
+        """
+        if self._reorder is None:
+            value = self._struct.unpack_from(buffer, offset * 2)[0]
+        else:
+            value = self._struct.unpack(bytes(self._reorder(buffer[offset * 2:offset * 2 + self.size])))[0]
+        return value if self._from_raw is None else self._from_raw(value)
+
+    def encode(self, value: Any, rounding: RoundingScheme = RoundingScheme.floor) -> list[int]:
+        """
+        :param value: The value to write
+        :param rounding: The rounding applied to values written to integer registers, floats are written as is
+        :returns: The registers to write
+        """
+        if self._to_raw is not None:
+            value = self._to_raw(value)
+        elif self._struct.format[-1] not in 'fd':
+            value = round_to_int(value, rounding)
+        payload = self._struct.pack(value)
+        if self._restore is not None:
+            payload = bytes(self._restore(payload))
+        if len(payload) % 2:
+            payload += b'\x00'
+        return list(struct.unpack(f'>{len(payload) // 2}H', payload))
+
+
+class StringCodec(ModbusCodec):
+    """
+    Decodes and encodes a string spanning all registers of the data point.
+    """
+    __slots__ = ()
+
+    def __init__(self, count: int):
+        super().__init__('string', count, f'{count * 2}s', Endian.BIG, Endian.BIG)
+
+    def decode_from(self, buffer: bytes, offset: int = 0) -> Any:
+        value = self._struct.unpack_from(buffer, offset * 2)[0]
+        return value.rstrip(b'\x00 ').decode('utf-8', errors='replace')
+
+    def encode(self, value: Any, rounding: RoundingScheme = RoundingScheme.floor) -> list[int]:
+        payload = self._struct.pack(str(value).encode('utf-8'))
+        return list(struct.unpack(f'>{self.count}H', payload))
+
+
+class UnsupportedCodec(ModbusCodec):
+    __slots__ = ()
+
+    def __init__(self, data_type: str | None, count: int):
+        self.data_type = data_type
+        self.count = count
+        self.size = count * 2
+
+    def decode_from(self, buffer: bytes, offset: int = 0) -> Any:
+        raise ValueError(f'Unknown modbus type "{self.data_type}"')
+
+    def encode(self, value: Any, rounding: RoundingScheme = RoundingScheme.floor) -> list[int]:
+        raise ValueError(f'Unknown modbus type "{self.data_type}"')
+
+
+def _boolean_mapping(true_value: int | None, false_value: int | None) -> tuple[Callable, Callable]:
+    if true_value is None:
+        return lambda value: value != 0, lambda value: 1 if value else (false_value or 0)
+    return lambda value: value == true_value, lambda value: true_value if value else (false_value or 0)
+
+
+@lru_cache(maxsize=None)
+def compile_codec(data_type: str | None, count: int | None, byteorder: Endian, wordorder: Endian,
+                  true_value: int | None = None, false_value: int | None = None) -> ModbusCodec:
+    """
+    Compiles the codec of a data type, codecs are immutable and shared between data points.
+    :param data_type: The modbus data type, e.g. 'int32_u'
+    :param count: The number of registers of the data point
+    :param byteorder: The byte order within a register
+    :param wordorder: The order of the registers of values spanning several registers
+    :param true_value: The register value of true, for boolean data points
+    :param false_value: The register value of false, for boolean data points
+    :returns: The codec
+    """
+    if data_type in _NUMBER_FORMATS:
+        fmt = _NUMBER_FORMATS[data_type]
+        return ModbusCodec(data_type, count or ceil(struct.calcsize(fmt) / 2), fmt, byteorder, wordorder)
+    if data_type == 'string' and count:
+        return StringCodec(count)
+    if data_type in _UNSIGNED_TYPES and (count or 1) in _UNSIGNED_FORMATS:
+        from_raw, to_raw = None, None
+        if data_type == 'boolean':
+            from_raw, to_raw = _boolean_mapping(true_value, false_value)
+        return ModbusCodec(data_type, count or 1, _UNSIGNED_FORMATS[count or 1], byteorder, wordorder,
+                           from_raw, to_raw)
+    return UnsupportedCodec(data_type, count or 0)
+
+
+def build_codec(data_type: ModbusDataType | None, count: int | None, byteorder: Endian,
+                wordorder: Endian) -> ModbusCodec:
+    """
+    Builds the codec of a modbus data point.
+    :param data_type: The modbus data type of the data point configuration
+    :param count: The number of registers of the data point
+    :param byteorder: The byte order within a register
+    :param wordorder: The order of the registers of values spanning several registers
+    :returns: The codec
+    """
+    name = modbus_data_type_name(data_type)
+    if name == 'boolean':
+        return compile_codec(name, count, byteorder, wordorder,
+                             data_type.boolean.true_value, data_type.boolean.false_value)
+    return compile_codec(name, count, byteorder, wordorder)
@@ -1,18 +1,18 @@
-from typing import Any
+from typing import Any, Awaitable, Mapping
 
 from xsdata.formats.dataclass.parsers import XmlParser
 from xsdata.formats.dataclass.context import XmlContext
 import time
 
 from sgr_library.api import DeviceInformation, FunctionProfile, DataPointProtocol, DataPoint, ConfigurationParameter, \
-    build_configurations_parameters
+    build_configurations_parameters, ReadResult
 from sgr_library.api.device_api import BaseSGrInterface
+from sgr_library.api.lazy_mapping import build_mapping
 from sgr_library.converters import build_converter
 from sgr_library.generated.generic import DataDirectionProduct
 from sgr_library.exceptions import DataPointException, FunctionalProfileException, DataProcessingError, \
-    DeviceInformationError, InvalidEndianType
+    DeviceInformationError, InvalidEndianType, RegisterError, DeviceUnavailableError
 from pymodbus.exceptions import ConnectionException
-from aiohttp import ClientError
 
 # from sgr_library.data_classes.ei_modbus import SgrModbusDeviceFrame
 # from sgr_library.data_classes.ei_modbus.sgr_modbus_eidevice_frame import SgrModbusDataPointType
@@ -21,7 +21,12 @@ from sgr_library.generated.product import DeviceFrame, ModbusDataPoint, ModbusFu
 from sgr_library.auxiliary_functions import get_address, get_endian, get_port, get_slave
 from sgr_library.generated.generic import DataDirectionProduct
 
+from sgr_library.data_point_index import ModbusDataPointRecord, build_modbus_index
+from sgr_library.modbus_codec import modbus_data_type_name, registers_to_bytes
+from sgr_library.modbus_blocks import BlockMember, ReadPlan, RegisterBlock, plan_reads, plan_writes, BlockCache
 from sgr_library.modbus_client import SGrModbusClient
+from sgr_library.modbus_tcp_connection import DEFAULT_MAX_IN_FLIGHT, DEFAULT_TIMEOUT
+from sgr_library.circuit_breaker import CircuitBreaker, is_modbus_failure
 # from auxiliary_functions import find_dp
 import asyncio
 
@@ -37,21 +42,22 @@ class ModBusTCPDataPoint(DataPointProtocol):
 
     def __init__(self, modbus_api_dp: ModbusDataPoint, modbus_api_fp: ModbusFunctionalProfile,
                  interface: 'SgrModbusInterface'):
-        self._dp = modbus_api_dp
-        self._fp = modbus_api_fp
+        # the names are kept instead of the spec elements, which can be released after the device is built
+        self._name = modbus_api_fp.functional_profile.functional_profile_name, modbus_api_dp.data_point.data_point_name
+        self._direction = modbus_api_dp.data_point.data_direction
         self._interface = interface
 
     async def write(self, data: Any):
         return await self._interface.setval(self.name()[0], self.name()[1], data)
 
     async def read(self) -> Any:
-        return await self._interface.getval(self.name()[0], self.name()[1])
+        return await self._interface.read_value(self.name()[0], self.name()[1])
 
     def name(self) -> tuple[str, str]:
-        return self._fp.functional_profile.functional_profile_name, self._dp.data_point.data_point_name
+        return self._name
 
     def direction(self) -> DataDirectionProduct:
-        return self._dp.data_point.data_direction
+        return self._direction
 
 
 def build_modbus_tcp_data_point(dp: ModbusDataPoint, fp: ModbusFunctionalProfile,
@@ -64,41 +70,67 @@ def build_modbus_tcp_data_point(dp: ModbusDataPoint, fp: ModbusFunctionalProfile
 
 class ModBusTCPFunctionProfile(FunctionProfile):
 
-    def __init__(self, modbus_api_fp: ModbusFunctionalProfile, interface: 'SgrModbusInterface'):
-        self._fp = modbus_api_fp
+    def __init__(self, modbus_api_fp: ModbusFunctionalProfile, interface: 'SgrModbusInterface', lazy: bool = False):
+        self._name = modbus_api_fp.functional_profile.functional_profile_name
         self._interface = interface
-        dps = [build_modbus_tcp_data_point(dp, self._fp, self._interface) for dp in
-               self._fp.data_point_list.data_point_list_element]
-        self._data_points = {dp.name(): dp for dp in dps}
-
+        self._data_points = build_mapping(
+            modbus_api_fp.data_point_list.data_point_list_element,
+            lambda dp: (self._name, dp.data_point.data_point_name),
+            lambda dp: build_modbus_tcp_data_point(dp, modbus_api_fp, self._interface),
+            lazy)
 
     def name(self) -> str:
-        return self._fp.functional_profile.functional_profile_name
+        return self._name
 
-    def get_data_points(self) -> dict[tuple[str, str], DataPoint]:
+    def get_data_points(self) -> Mapping[tuple[str, str], DataPoint]:
         return self._data_points
 
+    async def read(self) -> dict[str, Any]:
+        values = await self._interface.read_function_profile(self.name())
+        return {key[1]: value for key, value in values.items()}
+
+    def read_limiter(self) -> asyncio.Semaphore:
+        return self._interface.read_limiter()
+
+    async def read_concurrent(self, limiter: asyncio.Semaphore | None = None) -> ReadResult:
+        return await self._interface.read_function_profile_concurrent(self.name(), limiter)
+
 
 class SgrModbusInterface(BaseSGrInterface):
+    # register blocks read at the same time, see set_max_concurrent_reads
+    _max_concurrent_reads = 4
 
-    def __init__(self, frame: DeviceFrame) -> None:
+    def __init__(self, frame: DeviceFrame, lazy: bool = False, timeout: float = DEFAULT_TIMEOUT,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> None:
         """
         Creates a connection from xml file data.
         Parses the xml file with xsdata library.
         :param xml_file: Name of the xml file to parse
+        :param lazy: Builds function profiles and data points on first access, see preload()
+        :param timeout: The time in seconds to wait for a response of the device
+        :param max_in_flight: The number of requests waiting for a response at the same time on the connection
         """
         self.root = frame
         self.ip = get_address(self.root)
         self.port = get_port(self.root)
-        self.client = SGrModbusClient(self.ip, self.port)
+        self.client = SGrModbusClient(self.ip, self.port, timeout=timeout, max_in_flight=max_in_flight)
         self.slave_id = get_slave(self.root)
         self.byte_order = get_endian(self.root)
+        self.circuit_breaker = CircuitBreaker(is_modbus_failure)
         self._configuration_params = build_configurations_parameters(frame.configuration_list)
         # A dictionary where we cash the value of the datapoint. With name, value, timestamp and alive_time? ;)
         self.cash_dict = {}
-        fps = [ModBusTCPFunctionProfile(profile, self) for profile in
-               self.root.interface_list.modbus_interface.functional_profile_list.functional_profile_list_element]
-        self._function_profiles = {fp.name(): fp for fp in fps}
+        self._function_profiles = build_mapping(
+            self.root.interface_list.modbus_interface.functional_profile_list.functional_profile_list_element,
+            lambda profile: profile.functional_profile.functional_profile_name,
+            lambda profile: ModBusTCPFunctionProfile(profile, self, lazy),
+            lazy)
+        self._data_point_index = build_modbus_index(self.root.interface_list.modbus_interface, self.byte_order)
+        self._block_cache = BlockCache(self.root.interface_list.modbus_interface.time_sync_block_notification,
+                                       self._read_cached_block)
+        self._read_plan, self._function_profile_read_plans = self._plan_block_reads()
+        # the plans replacing the blocks the device refused, by register type, address and size
+        self._split_blocks: dict[tuple[str, int, int], ReadPlan] = {}
         self._device_information = DeviceInformation(
             name=frame.device_name,
             manufacture=frame.manufacturer_name,
@@ -114,7 +146,7 @@ class SgrModbusInterface(BaseSGrInterface):
 
     async def connect(self):
         try:
-            await self.client.client.connect()
+            await self.client.connect()
             logger.info("Connected successfully.")
         except ConnectionException as e:
             logger.error(f"ConnectionException: Failed to connect: {e}")
@@ -123,12 +155,203 @@ class SgrModbusInterface(BaseSGrInterface):
         except Exception as e:
             logger.exception(f"An unexpected error occurred during the connection: {e}")
 
-    def get_function_profiles(self) -> dict[str, FunctionProfile]:
+    async def close(self):
+        """
+        Releases the connection, which is shared with the other devices of the same host and port.
+        """
+        await self.client.close()
+
+    def get_function_profiles(self) -> Mapping[str, FunctionProfile]:
         return self._function_profiles
 
     def device_information(self) -> DeviceInformation:
         return self._device_information
 
+    def _plan_block_reads(self) -> tuple[ReadPlan, dict[str, ReadPlan]]:
+        """
+        Groups the data points of the device and of each functional profile into register blocks.
+        """
+        members = {}
+        for record in self._data_point_index:
+            members.setdefault(record.fp_name, []).append(BlockMember(
+                key=(record.fp_name, record.dp_name),
+                # data points of a cached block are served by the block cache, they are read as singles
+                register_type=None if self._is_block_cached(record) else record.register_type,
+                address=record.address,
+                size=record.count,
+                codec=record.codec
+            ))
+        device_plan = plan_reads(member for fp_members in members.values() for member in fp_members)
+        return device_plan, {fp_name: plan_reads(fp_members) for fp_name, fp_members in members.items()}
+
+    def _is_block_cached(self, record: ModbusDataPointRecord) -> bool:
+        return self._block_cache.serves(record.block_cache_identification, record.register_type, record.address,
+                                        record.count)
+
+    async def _read_cached_block(self, address: int, size: int, register_type: str) -> list[int]:
+        return await self._read_registers(address, size, register_type)
+
+    async def _read_registers(self, address: int, size: int, register_type: str) -> list[int]:
+        return await self.circuit_breaker.call(
+            lambda: self.client.read_registers(address, size, register_type, self.slave_id))
+
+    async def _write_registers(self, address: int, registers: list[int]):
+        await self.circuit_breaker.call(lambda: self.client.write_registers(address, registers, self.slave_id))
+
+    async def read_data(self) -> dict[tuple[str, str], Any]:
+        return await self.read_planned(self._read_plan)
+
+    async def read_function_profile(self, fp_name: str) -> dict[tuple[str, str], Any]:
+        return await self.read_planned(self._function_profile_read_plans[fp_name])
+
+    async def read_data_concurrent(self) -> ReadResult:
+        return await self.read_planned_concurrent(self._read_plan)
+
+    async def read_function_profile_concurrent(self, fp_name: str,
+                                               limiter: asyncio.Semaphore | None = None) -> ReadResult:
+        return await self.read_planned_concurrent(self._function_profile_read_plans[fp_name], limiter)
+
+    async def read_planned(self, plan: ReadPlan) -> dict[tuple[str, str], Any]:
+        """
+        Reads all data points of a read plan, one transaction per register block.
+        Data points which cannot be read within a block are read one by one.
+
+        :param plan: The read plan created at construction
+        :returns: The converted values by functional profile and data point name
+        """
+        raw_values = await self._read_raw(plan, self.read_limiter())
+        return {key: self.get_data_point(key).from_device(None if isinstance(raw_values[key], Exception)
+                                                          else raw_values[key]) for key in plan.keys}
+
+    async def read_planned_concurrent(self, plan: ReadPlan,
+                                      limiter: asyncio.Semaphore | None = None) -> ReadResult:
+        """
+        Reads all data points of a read plan like read_planned, data points which cannot be read or converted
+        are reported in the errors of the result instead of failing the read.
+
+        :param plan: The read plan created at construction
+        :param limiter: Overrides the limiter of the interface
+        :returns: The converted values and the errors by functional profile and data point name
+        """
+        raw_values = await self._read_raw(plan, limiter or self.read_limiter())
+        result = ReadResult()
+        for key in plan.keys:
+            raw_value = raw_values[key]
+            if isinstance(raw_value, Exception):
+                result.errors[key] = raw_value
+                continue
+            try:
+                result.values[key] = self.get_data_point(key).from_device(raw_value)
+            except Exception as e:
+                result.errors[key] = e
+        return result
+
+    async def _read_raw(self, plan: ReadPlan, limiter: asyncio.Semaphore) -> dict[tuple[str, str], Any]:
+        """
+        Reads the blocks and single data points of a read plan, at most as many at the same time as the limiter
+        admits. A data point which could not be read maps to the exception raised while reading it.
+        """
+
+        async def limited(read: Awaitable[dict[tuple[str, str], Any]]) -> dict[tuple[str, str], Any]:
+            async with limiter:
+                return await read
+
+        parts = await asyncio.gather(*(limited(self._read_block(block)) for block in plan.blocks),
+                                     *(limited(self._read_member(member)) for member in plan.singles))
+        raw_values = {}
+        for part in parts:
+            raw_values.update(part)
+        return raw_values
+
+    async def _read_block(self, block: RegisterBlock) -> dict[tuple[str, str], Any]:
+        block_key = (block.register_type, block.address, block.size)
+        split = self._split_blocks.get(block_key)
+        if split is not None:
+            return await self._read_split(split)
+        try:
+            registers = await self._read_registers(block.address, block.size, block.register_type)
+        except DeviceUnavailableError as e:
+            logger.debug(f"DeviceUnavailableError: block read at {block.address} skipped: {e}")
+            return {member.key: e for member in block.members}
+        except (ConnectionException, TimeoutError) as e:
+            logger.error(f"{type(e).__name__}: block read at {block.address} failed: {e}")
+            return {member.key: e for member in block.members}
+        except RegisterError as e:
+            # the device refused the block, e.g. because of an unmapped address within a gap
+            logger.warning(f"RegisterError: block read at {block.address} failed, splitting the block: {e}")
+            split = self._split_block(block)
+            self._split_blocks[block_key] = split
+            return await self._read_split(split)
+        except Exception as e:
+            logger.exception(f"An unexpected error occurred while reading block at {block.address}: {e}")
+            return {member.key: e for member in block.members}
+
+        raw_values = {}
+        buffer = registers_to_bytes(registers)
+        for member in block.members:
+            try:
+                raw_values[member.key] = member.codec.decode_from(buffer, member.address - block.address)
+            except Exception as e:
+                logger.exception(f"An unexpected error occurred while decoding {member.key}: {e}")
+                raw_values[member.key] = e
+        return raw_values
+
+    @staticmethod
+    def _split_block(block: RegisterBlock) -> ReadPlan:
+        """
+        Plans the reads replacing a block the device refused, the gaps are left out and, if there are none,
+        the members are read one by one.
+        """
+        split = plan_reads(block.members, max_gap=0)
+        if len(split.blocks) <= 1:
+            return ReadPlan(split.keys, [], list(block.members))
+        return split
+
+    async def _read_split(self, plan: ReadPlan) -> dict[tuple[str, str], Any]:
+        parts = await asyncio.gather(*(self._read_block(block) for block in plan.blocks),
+                                     *(self._read_member(member) for member in plan.singles))
+        raw_values = {}
+        for part in parts:
+            raw_values.update(part)
+        return raw_values
+
+    async def _read_member(self, member: BlockMember) -> dict[tuple[str, str], Any]:
+        """
+        Reads a data point on its own, it maps to the exception raised if it could not be read.
+        """
+        try:
+            return {member.key: await self._read_value(self._data_point_index.find(*member.key))}
+        except DeviceUnavailableError as e:
+            logger.debug(f"DeviceUnavailableError: {member.key} not read: {e}")
+            return {member.key: e}
+        except (ConnectionException, TimeoutError, RegisterError) as e:
+            logger.error(f"{type(e).__name__}: Failed to read {member.key}: {e}")
+            return {member.key: e}
+        except Exception as e:
+            logger.exception(f"An unexpected error occurred while reading {member.key}: {e}")
+            return {member.key: e}
+
+    async def read_value(self, fp_name: str, dp_name: str) -> Any:
+        """
+        Reads the raw value of a data point like getval, but errors are raised instead of returning None.
+
+        :param fp_name: The name of the functional profile in which the datapoint resides.
+        :param dp_name: The name of the datapoint.
+        :returns: The decoded value in the datapoint register.
+        """
+        return await self._read_value(self._data_point_index.find(fp_name, dp_name))
+
+    async def _read_value(self, record: ModbusDataPointRecord) -> Any:
+        """
+        Reads and decodes the registers of a data point, errors are raised.
+        """
+        if self._is_block_cached(record):
+            registers = await self._block_cache.read(record.block_cache_identification, record.address,
+                                                     record.count)
+        else:
+            registers = await self._read_registers(record.address, record.count, record.register_type)
+        return record.codec.decode(registers)
+
     async def getval(self, fp_name, dp_name) -> float:
         """
         Reads datapoint value.
@@ -143,7 +366,7 @@ class SgrModbusInterface(BaseSGrInterface):
         """
 
         try:
-            dp = self.find_dp(self.root, fp_name, dp_name)
+            record = self._data_point_index.find(fp_name, dp_name)
         except DataPointException as e:
             logger.error(e)
             return float('nan')
@@ -152,22 +375,21 @@ class SgrModbusInterface(BaseSGrInterface):
             return float('nan')
 
         try:
-            address = self.get_address(dp)
-            size = self.get_size(dp)
-            data_type = self.get_datatype(dp)
-            reg_type = self.get_register_type(dp)
-            slave_id = self.slave_id
-            order = self.byte_order
-            answer = await self.client.value_decoder(address, size, data_type, reg_type, slave_id, order)
-            return answer
-        except ClientError as e:
-            logger.exception(e)
-            return float('nan')
+            return await self._read_value(record)
+        except DeviceUnavailableError as e:
+            logger.debug(f"DeviceUnavailableError: {fp_name}, {dp_name} not read: {e}")
+            return None
+        except (ConnectionException, TimeoutError) as e:
+            logger.error(f"{type(e).__name__}: Failed to read {fp_name}, {dp_name}: {e}")
+            return None
+        except Exception as e:
+            logger.exception(f"An unexpected error occurred while reading {fp_name}, {dp_name}: {e}")
+            return None
 
     # TODO under construction
     async def getval_block(self, fp_name: str, dp_name: str):
         try:
-            dp = self.find_dp(self.root, fp_name, dp_name)
+            record = self._data_point_index.find(fp_name, dp_name)
         except DataPointException as e:
             logger.error(f"DataPointException: {e}")
             return None
@@ -176,24 +398,16 @@ class SgrModbusInterface(BaseSGrInterface):
             return None
 
         try:
-            address = self.get_address(dp)
-            size = self.get_size(dp)
-            data_type = self.get_datatype(dp)
-            reg_type = self.get_register_type(dp)
-            slave_id = self.slave_id
-            order = self.byte_order
-            answer = await self.client.mult_value_decoder(address, size, data_type, reg_type, slave_id, order)
+            answer = await self.client.mult_value_decoder(record.address, record.count, record.data_type,
+                                                          record.register_type, self.slave_id, record.byte_order)
             return answer
-        except ClientError as e:
-            logger.exception(f"ClientError: Failed to retrieve value block {e}")
-            return None
         except Exception as e:
             logger.exception(f"An unexpected error occurred: {e}")
             return None
 
     async def setval(self, fp_name: str, dp_name: str, value: float) -> None:
         try:
-            dp = self.find_dp(self.root, fp_name, dp_name)
+            record = self._data_point_index.find(fp_name, dp_name)
         except DataPointException as e:
             logger.error(f"DataPointException: {e}")
             return
@@ -202,24 +416,46 @@ class SgrModbusInterface(BaseSGrInterface):
             return
 
         try:
-            address = self.get_address(dp)
-            data_type = self.get_datatype(dp)
-            slave_id = self.slave_id
-            order = self.byte_order
-            await self.client.value_encoder(address, value, data_type, slave_id, order)
+            await self._write_registers(record.address, record.codec.encode(value))
+            if record.block_cache_identification is not None:
+                self._block_cache.invalidate(record.block_cache_identification)
             logger.info(f"Value {value} has been set for {dp_name} in {fp_name}")
-        except ClientError as e:
-            logger.exception(f"ClientError: Failed to set value {e}")
+        except DeviceUnavailableError as e:
+            logger.warning(f"DeviceUnavailableError: Failed to set value {e}")
         except ValueError as e:
             logger.error(f"ValueError: Invalid value or datatype {e}")
         except Exception as e:
             logger.exception(f"An unexpected error occurred: {e}")
 
+    async def write_many(self, values: dict[tuple[str, str], Any]):
+        """
+        Writes several data points, values of adjacent holding registers are written with one request,
+        so that the device applies them together. All values are converted, validated and encoded before the
+        first request is sent.
+        :param values: The values by functional profile and data point name
+        """
+        writes = []
+        for key, value in values.items():
+            record = self._data_point_index.find(*key)
+            if record.address is None:
+                raise DataProcessingError(f"Data point {key} has no address")
+            raw_value = self.get_data_point(key).to_device(value)
+            writes.append((key, record.register_type, record.address, record.codec.encode(raw_value)))
+
+        for block in plan_writes(writes):
+            await self._write_registers(block.address, block.registers)
+            for key in block.keys:
+                identification = self._data_point_index.find(*key).block_cache_identification
+                if identification is not None:
+                    self._block_cache.invalidate(identification)
+
     def get_device_profile(self):
         try:
-            brand_name = self.root.device_information.brand_name
-            nominal_power = self.root.device_information.nominal_power
-            level_of_operation = self.root.device_information.legible_description
+            # root is loaded again on each access once the frame was released
+            device_information = self.root.device_information
+            brand_name = device_information.brand_name
+            nominal_power = device_information.nominal_power
+            level_of_operation = device_information.legible_description
 
             if None in [brand_name, nominal_power, level_of_operation]:
                 raise DeviceInformationError("Incomplete device information")
@@ -228,7 +464,7 @@ class SgrModbusInterface(BaseSGrInterface):
             logger.info(f"Nominal Power: {nominal_power}")
             logger.info(f"Level of Operation: {level_of_operation}")
 
-            return self.root.device_information
+            return device_information
 
         except AttributeError as e:
             logger.error(f"AttributeError: {e}")
@@ -255,10 +491,9 @@ class SgrModbusInterface(BaseSGrInterface):
 
     def get_datatype(self, dp) -> str:
         try:
-            datatype = dp.modbus_data_point_configuration.modbus_data_type.__dict__
-            for key in datatype:
-                if datatype[key] is not None:
-                    return key
+            datatype = modbus_data_type_name(dp.modbus_data_point_configuration.modbus_data_type)
+            if datatype is not None:
+                return datatype
             raise DataProcessingError('data_type not available')
         except AttributeError as e:
             logger.error(f"AttributeError: {e}")
@@ -372,7 +607,7 @@ async def test_loop():
         print('start')
         interface_file = 'abb_terra_01.xml'
         sgr_modbus = SgrModbusInterface(interface_file)
-        await sgr_modbus.client.client.connect()
+        await sgr_modbus.connect()
         getval = await sgr_modbus.getval('CurrentAC', 'CurrentACL1')
         print(getval)
         await asyncio.sleep(10)
@@ -0,0 +1,281 @@
+"""
+SGr Modbus TCP Connection Registry
+------------------------
+
+Devices behind the same Modbus TCP gateway share one connection per host and port.
+Requests are framed with their own transaction ID, so requests to different unit IDs (slaves) are in flight on the
+connection at the same time and the responses are matched to their requests by transaction ID.
+Each request waits at most the timeout of the connection for its response. A lost connection fails the requests in
+flight with a ConnectionException and is reopened by the next request, there are no retries.
+The registry counts the interfaces using a connection and closes it when the last one is released.
+The timeout and the number of requests in flight are configurable per device in the MODBUS_TCP section of its
+configuration, see connection_options.
+"""
+import asyncio
+import configparser
+import logging
+import struct
+
+from pymodbus.exceptions import ConnectionException
+
+from sgr_library.exceptions import RegisterError
+
+logger = logging.getLogger(__name__)
+
+# transaction ID, protocol ID, length and unit ID of the modbus application protocol header
+_MBAP_HEADER = struct.Struct('>HHHB')
+_MODBUS_PROTOCOL_ID = 0
+
+_READ_FUNCTION_CODES = {"HoldRegister": 0x03, "InputRegister": 0x04}
+_WRITE_MULTIPLE_REGISTERS = 0x10
+
+# default number of requests waiting for a response on one connection, gateways queue or drop further requests
+DEFAULT_MAX_IN_FLIGHT = 16
+DEFAULT_TIMEOUT = 1.0
+
+# the section of the device configuration with the connection options
+CONNECTION_SECTION = 'MODBUS_TCP'
+
+
+def connection_options(config: configparser.ConfigParser) -> dict:
+    """
+    Reads the connection options of a device from its configuration, e.g.
+        [MODBUS_TCP]
+        timeout = 3
+        max_in_flight = 4
+    :returns: The timeout and max_in_flight arguments of the connection, the defaults if they are not configured
+    """
+    return {
+        'timeout': config.getfloat(CONNECTION_SECTION, 'timeout', fallback=DEFAULT_TIMEOUT),
+        'max_in_flight': config.getint(CONNECTION_SECTION, 'max_in_flight', fallback=DEFAULT_MAX_IN_FLIGHT),
+    }
+
+
+class ModbusTcpConnection:
+    """
+    One Modbus TCP connection shared by all slaves of an endpoint, multiplexed by transaction ID.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float = DEFAULT_TIMEOUT,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        """
+        :param host: The host of the device or gateway
+        :param port: The modbus port
+        :param timeout: The time in seconds to wait for the response of a request
+        :param max_in_flight: The number of requests waiting for a response at the same time
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._max_in_flight = max_in_flight
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._receiver: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._connect_lock: asyncio.Lock | None = None
+        self._in_flight: asyncio.Semaphore | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._transaction_id = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    def _bind_loop(self):
+        # asyncio primitives belong to the loop which uses them first, a new loop starts with a new state
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._connect_lock = asyncio.Lock()
+            self._in_flight = asyncio.Semaphore(self._max_in_flight)
+            self._reader, self._writer, self._receiver = None, None, None
+            self._pending = {}
+
+    async def connect(self):
+        """
+        Opens the connection unless it is open already.
+        :raises ConnectionException: if the endpoint cannot be reached
+        """
+        self._bind_loop()
+        async with self._connect_lock:
+            if self.connected:
+                return
+            try:
+                self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), self.timeout)
+            except (OSError, asyncio.TimeoutError) as e:
+                raise ConnectionException(f"{self.host}:{self.port} {e}") from e
+            self._receiver = asyncio.create_task(self._receive(self._reader))
+            logger.info(f"Connected to {self.host}:{self.port}")
+
+    async def close(self):
+        if self._receiver is not None:
+            self._receiver.cancel()
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except OSError:
+                pass
+        self._reader, self._writer, self._receiver = None, None, None
+        self._fail_pending(ConnectionException(f"{self.host}:{self.port} connection closed"))
+
+    def _next_transaction_id(self) -> int:
+        for _ in range(0xFFFF):
+            self._transaction_id = self._transaction_id % 0xFFFF + 1
+            if self._transaction_id not in self._pending:
+                return self._transaction_id
+        raise ConnectionException(f"{self.host}:{self.port} no free transaction ID")
+
+    def _fail_pending(self, error: Exception):
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    async def _receive(self, reader: asyncio.StreamReader):
+        """
+        Dispatches the responses to the requests waiting for them, until the connection is lost.
+        """
+        try:
+            while True:
+                header = await reader.readexactly(_MBAP_HEADER.size)
+                transaction_id, protocol_id, length, _ = _MBAP_HEADER.unpack(header)
+                if length < 2:
+                    # the length covers the unit ID and at least the function code, the frames which follow
+                    # cannot be found anymore
+                    raise ConnectionException(f"{self.host}:{self.port} invalid MBAP length {length}")
+                pdu = await reader.readexactly(length - 1)
+                future = self._pending.pop(transaction_id, None)
+                if protocol_id != _MODBUS_PROTOCOL_ID or future is None or future.done():
+                    # a response to a request which timed out already
+                    logger.debug(f"Dropping response with transaction ID {transaction_id}")
+                    continue
+                future.set_result(pdu)
+        except asyncio.CancelledError:
+            raise
+        except (OSError, asyncio.IncompleteReadError, ConnectionException) as e:
+            logger.warning(f"Connection to {self.host}:{self.port} lost: {e}")
+        if self._reader is reader:
+            self._writer.close()
+            self._reader, self._writer = None, None
+            self._fail_pending(ConnectionException(f"{self.host}:{self.port} connection lost"))
+
+    async def execute(self, unit_id: int, pdu: bytes) -> bytes:
+        """
+        Sends a request and waits for its response, other requests are sent in the meantime.
+        The connection is reopened if it was lost.
+        :param unit_id: The ID of the slave
+        :param pdu: The protocol data unit of the request
+        :returns: The protocol data unit of the response
+        """
+        self._bind_loop()
+        if not self.connected:
+            await self.connect()
+        async with self._in_flight:
+            writer = self._writer
+            if writer is None:
+                raise ConnectionException(f"{self.host}:{self.port} not connected")
+            transaction_id = self._next_transaction_id()
+            future = self._loop.create_future()
+            self._pending[transaction_id] = future
+            try:
+                writer.write(_MBAP_HEADER.pack(transaction_id, _MODBUS_PROTOCOL_ID, len(pdu) + 1, unit_id) + pdu)
+                await writer.drain()
+                return await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                # an OSError since Python 3.11, the connection is still usable
+                raise
+            except OSError as e:
+                raise ConnectionException(f"{self.host}:{self.port} {e}") from e
+            finally:
+                if self._pending.get(transaction_id) is future:
+                    del self._pending[transaction_id]
+
+    @staticmethod
+    def _check_response(pdu: bytes, function_code: int):
+        if not pdu:
+            raise RegisterError(f"Empty response, function code {function_code}")
+        if pdu[0] == function_code | 0x80:
+            exception_code = pdu[1] if len(pdu) > 1 else None
+            raise RegisterError(f"Exception response, function code {function_code}, exception code {exception_code}")
+        if pdu[0] != function_code:
+            raise RegisterError(f"Unexpected response, function code {pdu[0]} instead of {function_code}")
+
+    async def read_registers(self, addr: int, size: int, register_type: str, slave_id: int) -> list[int]:
+        """
+        Reads a block of holding or input registers.
+        :param addr: The address of the first register
+        :param size: The number of registers to read
+        :param register_type: The type of the register
+        :param slave_id: The ID of the slave
+        :returns: The raw register values
+        """
+        function_code = _READ_FUNCTION_CODES.get(register_type)
+        if function_code is None:
+            raise ValueError(f"Invalid register type: {register_type}")
+        pdu = await self.execute(slave_id, struct.pack('>BHH', function_code, addr, size))
+        self._check_response(pdu, function_code)
+        if len(pdu) != 2 + 2 * size or pdu[1] != 2 * size:
+            raise RegisterError(f"Expected {size} registers, got {max(len(pdu) - 2, 0) // 2}")
+        return list(struct.unpack_from(f'>{size}H', pdu, 2))
+
+    async def write_registers(self, addr: int, registers: list[int], slave_id: int):
+        """
+        Writes registers with a write multiple registers request.
+        :param addr: The address of the first register
+        :param registers: The register values to write
+        :param slave_id: The ID of the slave
+        """
+        count = len(registers)
+        request = struct.pack(f'>BHHB{count}H', _WRITE_MULTIPLE_REGISTERS, addr, count, 2 * count, *registers)
+        pdu = await self.execute(slave_id, request)
+        self._check_response(pdu, _WRITE_MULTIPLE_REGISTERS)
+
+
+class ModbusTcpConnectionRegistry:
+    """
+    The connections of the process by host and port, reference counted by the interfaces using them.
+    """
+
+    def __init__(self):
+        self._connections: dict[tuple[str, int], ModbusTcpConnection] = {}
+        self._users: dict[tuple[str, int], int] = {}
+
+    def acquire(self, host: str, port: int, timeout: float = DEFAULT_TIMEOUT,
+                max_in_flight: int = DEFAULT_MAX_IN_FLIGHT) -> ModbusTcpConnection:
+        """
+        Returns the connection of an endpoint, it is created on first use.
+        Each acquire is to be matched by a release.
+        :param timeout: The response timeout the user needs, a shared connection waits for the longest one
+        :param max_in_flight: The requests in flight of a new connection, a shared connection keeps its limit
+        """
+        key = (host, int(port))
+        connection = self._connections.get(key)
+        if connection is None:
+            connection = ModbusTcpConnection(host, int(port), timeout, max_in_flight)
+            self._connections[key] = connection
+        else:
+            connection.timeout = max(connection.timeout, timeout)
+        self._users[key] = self._users.get(key, 0) + 1
+        return connection
+
+    async def release(self, connection: ModbusTcpConnection):
+        """
+        Releases a connection, it is closed when its last user released it.
+        """
+        key = (connection.host, connection.port)
+        if self._connections.get(key) is not connection:
+            return
+        self._users[key] -= 1
+        if self._users[key] <= 0:
+            del self._connections[key]
+            del self._users[key]
+            await connection.close()
+
+    def users(self, host: str, port: int) -> int:
+        return self._users.get((host, int(port)), 0)
+
+
+# the registry shared by all modbus TCP interfaces of the process
+connection_registry = ModbusTcpConnectionRegistry()
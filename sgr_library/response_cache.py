@@ -0,0 +1,164 @@
+"""
+SGr Response Cache
+------------------------
+
+Caches the parsed responses of REST service calls. A response is fresh as long as it is younger than the max age of
+the data point reading it, data points sharing a service call may accept responses of different age.
+With stale-while-revalidate a response which is no longer fresh is still returned for a grace period while a
+background request refreshes it, readers never wait for the device unless the response expired completely.
+"""
+import asyncio
+import configparser
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+from sgr_library.generated.generic import Units
+
+logger = logging.getLogger(__name__)
+
+# the section of the device configuration with the cache options
+CACHE_SECTION = 'RESTAPI_CACHE'
+
+# the generic attribute of a data point or functional profile defining the max age of its responses
+MAX_AGE_ATTRIBUTE = 'MaxAge'
+
+_MAX_AGE_SCALE = {
+    Units.SECONDS: 1.0,
+    Units.MINUTES: 60.0,
+    Units.HOURS: 3600.0,
+}
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    value: Any
+    fetched_at: float
+
+
+class ResponseCache:
+    """
+    The responses of the service calls of one device, the least recently used ones are evicted first.
+    """
+
+    def __init__(self, max_age: float = 5.0, stale_while_revalidate: float = 0.0, max_entries: int = 100,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param max_age: The time in seconds a response is fresh, if the reader does not define its own
+        :param stale_while_revalidate: The time in seconds a response is returned after it became stale while it is
+            refreshed in the background, 0 to wait for the refresh
+        :param max_entries: The number of responses kept
+        :param clock: The monotonic clock in seconds
+        """
+        self.max_age = max_age
+        self.stale_while_revalidate = stale_while_revalidate
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+        # keeps the background refreshes referenced until they completed
+        self._refreshing: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    async def get(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], max_age: float | None = None) -> Any:
+        """
+        Returns the cached response of a service call or fetches it.
+        :param key: Identifies the service call, including everything the response depends on
+        :param fetch: Performs the service call
+        :param max_age: The time in seconds a response is fresh for this reader, the default max age if None
+        :returns: The response
+        :raises Exception: The error of fetch, if no response could be returned
+        """
+        max_age = self.max_age if max_age is None else max_age
+        entry = self._entries.get(key)
+        if entry is not None:
+            age = self._clock() - entry.fetched_at
+            if age < max_age:
+                self._entries.move_to_end(key)
+                return entry.value
+            if age < max_age + self.stale_while_revalidate:
+                self._entries.move_to_end(key)
+                self._revalidate(key, fetch)
+                return entry.value
+        value = await fetch()
+        self._store(key, value)
+        return value
+
+    def _store(self, key: Hashable, value: Any):
+        self._entries[key] = CacheEntry(value, self._clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _revalidate(self, key: Hashable, fetch: Callable[[], Awaitable[Any]]):
+        if key in self._refreshing:
+            return
+
+        async def refresh():
+            try:
+                self._store(key, await fetch())
+            except Exception as e:
+                # the stale response is returned until it expires, the next reader after that sees the error
+                logger.debug(f"Background refresh failed: {e}")
+            finally:
+                del self._refreshing[key]
+
+        self._refreshing[key] = asyncio.create_task(refresh())
+
+
+def build_response_cache(config: configparser.ConfigParser) -> ResponseCache:
+    """
+    Creates the cache of a device with the options of its configuration, e.g.
+        [RESTAPI_CACHE]
+        max_age = 10
+        stale_while_revalidate = 60
+        max_entries = 100
+    """
+    if not config.has_section(CACHE_SECTION):
+        return ResponseCache()
+    return ResponseCache(
+        max_age=config.getfloat(CACHE_SECTION, 'max_age', fallback=5.0),
+        stale_while_revalidate=config.getfloat(CACHE_SECTION, 'stale_while_revalidate', fallback=0.0),
+        max_entries=config.getint(CACHE_SECTION, 'max_entries', fallback=100)
+    )
+
+
+def max_age_attribute(generic_attribute_list) -> float | None:
+    """
+    Reads the max age of the responses from the generic attributes of a data point or functional profile.
+    :param generic_attribute_list: The generic attributes, may be None
+    :returns: The max age in seconds, None if it is not defined
+    """
+    if generic_attribute_list is None:
+        return None
+    for attribute in generic_attribute_list.generic_attribute_list_element:
+        if attribute.name != MAX_AGE_ATTRIBUTE or attribute.value is None:
+            continue
+        scale = _MAX_AGE_SCALE.get(attribute.unit, 1.0) if attribute.unit is not None else 1.0
+        try:
+            return float(attribute.value) * scale
+        except ValueError:
+            logger.warning(f"Ignoring invalid {MAX_AGE_ATTRIBUTE} {attribute.value}")
+            return None
+    return None
+
+
+def configured_max_age(config: configparser.ConfigParser, fp_name: str, dp_name: str) -> float | None:
+    """
+    Reads the max age of the responses of a data point from the configuration, a data point option
+    max_age.<functional profile>.<data point> takes precedence over a functional profile option
+    max_age.<functional profile>. The names are not case-sensitive.
+    :returns: The max age in seconds, None if it is not configured
+    """
+    if not config.has_section(CACHE_SECTION):
+        return None
+    for option in (f'max_age.{fp_name}.{dp_name}', f'max_age.{fp_name}'):
+        if config.has_option(CACHE_SECTION, option):
+            return config.getfloat(CACHE_SECTION, option)
+    return None
@@ -0,0 +1,56 @@
+"""
+SGr REST Read Planner
+------------------------
+
+Groups the data points of a REST device by the service call they are read with, so that a complete device (or
+functional profile) is polled with one request per distinct service call and all values of a group are extracted
+from the same response.
+"""
+from dataclasses import dataclass, field
+from typing import Iterable, Mapping
+
+from sgr_library.data_point_index import RestDataPointRecord
+from sgr_library.generated.product import HttpMethod
+
+
+@dataclass(slots=True)
+class RequestGroup:
+    method: HttpMethod | None
+    url: str
+    body: str | None
+    headers: dict[str, str]
+    # the smallest max age of the members, a response fresh for all of them
+    max_age: float
+    records: list[RestDataPointRecord] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class RestReadPlan:
+    keys: list[tuple[str, str]]
+    groups: list[RequestGroup]
+
+
+def plan_rest_reads(records: Iterable[RestDataPointRecord],
+                    max_ages: Mapping[tuple[str, str], float]) -> RestReadPlan:
+    """
+    Plans the service calls needed to read all data points.
+    Data points are grouped by method, url, body and headers, each group is read with one request.
+    :param records: The data points to read
+    :param max_ages: The max age of the responses by functional profile and data point name
+    :returns: The read plan, the groups in the order of their first data point
+    """
+    keys = []
+    groups: dict[tuple, RequestGroup] = {}
+    for record in records:
+        key = (record.fp_name, record.dp_name)
+        keys.append(key)
+        max_age = max_ages[key]
+        group_key = (record.method, record.url, record.body, frozenset(record.headers.items()))
+        group = groups.get(group_key)
+        if group is None:
+            group = RequestGroup(record.method, record.url, record.body, record.headers, max_age)
+            groups[group_key] = group
+        else:
+            group.max_age = min(group.max_age, max_age)
+        group.records.append(record)
+    return RestReadPlan(keys, list(groups.values()))
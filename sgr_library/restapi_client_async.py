@@ -1,32 +1,45 @@
+import asyncio
 import configparser
 import json
 import logging
 import ssl
-from typing import Any
+from typing import Any, Iterable, Mapping
 
 import aiohttp
 import certifi
 import jmespath
 from aiohttp import ClientResponseError, ClientConnectionError
-from cachetools import TTLCache
 
 from sgr_library.api import BaseSGrInterface, FunctionProfile, DataPoint, DataPointProtocol, DeviceInformation, \
-    ConfigurationParameter
+    ConfigurationParameter, ReadResult
 from sgr_library.api.configuration_parameter import build_configurations_parameters
+from sgr_library.api.lazy_mapping import build_mapping
+from sgr_library.circuit_breaker import CircuitBreaker, is_http_failure
 from sgr_library.converters import build_converter
+from sgr_library.data_point_index import build_rest_index
+from sgr_library.exceptions import DataPointException, DeviceUnavailableError
 from sgr_library.generated.generic import DataDirectionProduct
 from sgr_library.generated.product import DeviceFrame
-from sgr_library.generated.product import RestApiFunctionalProfile, RestApiDataPoint
+from sgr_library.generated.product import HttpMethod, RestApiFunctionalProfile, RestApiDataPoint
+from sgr_library.response_cache import build_response_cache, configured_max_age
+from sgr_library.rest_read_plan import RequestGroup, RestReadPlan, plan_rest_reads
+from sgr_library.single_flight import SingleFlight
 from sgr_library.validators import build_validator
 
 logging.basicConfig(level=logging.ERROR)
 
 
+def _method_name(method: HttpMethod | None) -> str:
+    # the request method of a service call is optional, data points are read with GET by default
+    return method.value if method is not None else HttpMethod.GET.value
+
+
 def build_rest_data_point(data_point: RestApiDataPoint, function_profile: RestApiFunctionalProfile,
                           interface: 'SgrRestInterface') -> DataPoint:
     protocol = RestDataPoint(data_point, function_profile, interface)
-    converter = build_converter(data_point.data_point.unit)
-    validator = build_validator(data_point.data_point.data_type)
+    description = data_point.data_point
+    converter = build_converter(description.unit, description.data_type, description.array_length)
+    validator = build_validator(description.data_type, description.array_length)
     return DataPoint(protocol, converter, validator)
 
 
@@ -34,49 +47,63 @@ class RestDataPoint(DataPointProtocol):
 
     def __init__(self, rest_api_dp: RestApiDataPoint, rest_api_fp: RestApiFunctionalProfile,
                  interface: 'SgrRestInterface'):
-        self._dp = rest_api_dp
-        self._fp = rest_api_fp
+        self._name = rest_api_fp.functional_profile.functional_profile_name, rest_api_dp.data_point.data_point_name
+        self._direction = rest_api_dp.data_point.data_direction
         self._interface = interface
 
     def name(self) -> tuple[str, str]:
-        return self._fp.functional_profile.functional_profile_name, self._dp.data_point.data_point_name
+        return self._name
 
     async def read(self):
-        return await self._interface.getval(self.name()[0], self.name()[1])
+        return await self._interface.read_value(self.name()[0], self.name()[1])
 
     async def write(self, data: Any):
-        pass
+        raise NotImplementedError(f"writing data point {self._name} is not supported for REST devices")
 
     def direction(self) -> DataDirectionProduct:
-        return self._dp.data_point.data_direction
+        return self._direction
 
 
 class RestFunctionProfile(FunctionProfile):
 
-    def __init__(self, rest_api_fp: RestApiFunctionalProfile, interface: 'SgrRestInterface'):
-        self._fp = rest_api_fp
+    def __init__(self, rest_api_fp: RestApiFunctionalProfile, interface: 'SgrRestInterface', lazy: bool = False):
+        self._name = rest_api_fp.functional_profile.functional_profile_name
         self._interface = interface
 
-        dps = [build_rest_data_point(dp, self._fp, self._interface) for dp in
-               self._fp.data_point_list.data_point_list_element]
-        self._data_points = {dp.name(): dp for dp in dps}
+        self._data_points = build_mapping(
+            rest_api_fp.data_point_list.data_point_list_element,
+            lambda dp: (self._name, dp.data_point.data_point_name),
+            lambda dp: build_rest_data_point(dp, rest_api_fp, self._interface),
+            lazy)
 
     def name(self) -> str:
-        return self._fp.functional_profile.functional_profile_name
+        return self._name
 
-    def get_data_points(self) -> dict[tuple[str, str], DataPoint]:
+    def get_data_points(self) -> Mapping[tuple[str, str], DataPoint]:
         return self._data_points
 
+    async def read(self) -> dict[str, Any]:
+        values = await self._interface.read_function_profile(self.name())
+        return {key[1]: value for key, value in values.items()}
+
+    def read_limiter(self) -> asyncio.Semaphore:
+        return self._interface.read_limiter()
+
+    async def read_concurrent(self, limiter: asyncio.Semaphore | None = None) -> ReadResult:
+        return await self._interface.read_function_profile_concurrent(self.name(), limiter)
+
 
 class SgrRestInterface(BaseSGrInterface):
     """
     SmartGrid ready External Interface Class for Rest API
     """
+    # concurrent HTTP requests of read_data_concurrent, see set_max_concurrent_reads
+    _max_concurrent_reads = 8
 
     async def connect(self):
         await self.authenticate()
 
-    def get_function_profiles(self) -> dict[str, FunctionProfile]:
+    def get_function_profiles(self) -> Mapping[str, FunctionProfile]:
         return self._function_profiles
 
     def device_information(self) -> DeviceInformation:
@@ -85,7 +112,7 @@ class SgrRestInterface(BaseSGrInterface):
     def configuration_parameter(self) -> list[ConfigurationParameter]:
         return self._configuration_parameters
 
-    def __init__(self, frame: DeviceFrame, configuration: configparser.ConfigParser):
+    def __init__(self, frame: DeviceFrame, configuration: configparser.ConfigParser, lazy: bool = False):
         # session
         self._device_information = DeviceInformation(
             name=frame.device_name,
@@ -101,11 +128,16 @@ class SgrRestInterface(BaseSGrInterface):
         self.session = aiohttp.ClientSession(connector=self.connector)
         self.token = None
         self.root = frame
-        self._cache = TTLCache(maxsize=100, ttl=5)
-
-        fps = [RestFunctionProfile(profile, self) for profile in
-               self.root.interface_list.rest_api_interface.functional_profile_list.functional_profile_list_element]
-        self._function_profiles = {fp.name(): fp for fp in fps}
+        self._cache = build_response_cache(configuration)
+        # concurrent reads of data points sharing a service call share one request
+        self._requests: SingleFlight[Any] = SingleFlight()
+        self.circuit_breaker = CircuitBreaker(is_http_failure)
+
+        self._function_profiles = build_mapping(
+            self.root.interface_list.rest_api_interface.functional_profile_list.functional_profile_list_element,
+            lambda profile: profile.functional_profile.functional_profile_name,
+            lambda profile: RestFunctionProfile(profile, self, lazy),
+            lazy)
         try:
             description = self.root.interface_list.rest_api_interface.rest_api_interface_description
             request_body = str(description.rest_api_bearer.rest_api_service_call.request_body)
@@ -118,6 +150,15 @@ class SgrRestInterface(BaseSGrInterface):
             self.call = self.root.interface_list.rest_api_interface.rest_api_interface_description.rest_api_bearer.rest_api_service_call
             self.headers = {header_entry.header_name: header_entry.value for header_entry in
                             self.call.request_header.header}
+            self._data_point_index = build_rest_index(self.root.interface_list.rest_api_interface, self.base_url)
+            # the configured max age of a data point overrides the one of the spec
+            self._max_ages: dict[tuple[str, str], float] = {}
+            for record in self._data_point_index:
+                max_age = configured_max_age(configuration, record.fp_name, record.dp_name)
+                if max_age is None:
+                    max_age = record.max_age if record.max_age is not None else self._cache.max_age
+                self._max_ages[record.fp_name, record.dp_name] = max_age
+            self._read_plan, self._function_profile_read_plans = self._plan_reads()
         except json.JSONDecodeError:
             logging.exception("Error parsing JSON from the XML file")
             raise
@@ -209,44 +250,174 @@ class SgrRestInterface(BaseSGrInterface):
             logging.error(f"Functional profile '{fp_name}' not found.")
             return None
 
-    async def getval(self, fp_name, dp_name):
-        try:
-            dp = self.find_dp(self.root, fp_name, dp_name)
-            if not dp:
-                raise ValueError(f"Data point for {fp_name}, {dp_name} not found")
+    async def _send(self, method: str, url: str, headers: dict[str, str], body: str | None) -> Any:
+        async with self.session.request(method, url=url, headers=headers, data=body) as res:
+            res.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
+            logging.info(f"{method} Status: {res.status}")
+            return await res.json()
 
-            # Dataclass parsing
-            service_call = dp.rest_api_data_point_configuration.rest_api_service_call
-            request_path = service_call.request_path
+    def _plan_reads(self) -> tuple[RestReadPlan, dict[str, RestReadPlan]]:
+        """
+        Groups the data points of the device and of each functional profile by their service call.
+        """
+        records = {}
+        for record in self._data_point_index:
+            records.setdefault(record.fp_name, []).append(record)
+        device_plan = plan_rest_reads(self._data_point_index, self._max_ages)
+        return device_plan, {fp_name: plan_rest_reads(fp_records, self._max_ages)
+                             for fp_name, fp_records in records.items()}
 
-            # Urls string
-            url = f'https://{self.base_url}{request_path}'
+    async def read_data(self) -> dict[tuple[str, str], Any]:
+        return await self.read_planned(self._read_plan)
 
-            query = str(service_call.response_query.query)
+    async def read_function_profile(self, fp_name: str) -> dict[tuple[str, str], Any]:
+        return await self.read_planned(self._function_profile_read_plans[fp_name])
 
-            # All headers into dicitonary
-            headers = {
-                header_entry.header_name: header_entry.value
-                for header_entry in service_call.request_header.header
-            }
-            headers['Authorization'] = f'Bearer {self.token}'
+    async def read_data_concurrent(self) -> ReadResult:
+        return await self.read_planned_concurrent(self._read_plan)
 
-            cache_key = (frozenset(headers), url)
+    async def read_function_profile_concurrent(self, fp_name: str,
+                                               limiter: asyncio.Semaphore | None = None) -> ReadResult:
+        return await self.read_planned_concurrent(self._function_profile_read_plans[fp_name], limiter)
 
-            if cache_key in self._cache:
-                response = self._cache.get(cache_key)
-            else:
-                async with self.session.get(url=url, headers=headers) as res:
-                    res.raise_for_status()  # Raises an HTTPError if the HTTP request returned an unsuccessful status code
-                    response = await res.json()
-                    logging.info(f"Getval Status: {res.status}")
+    async def read_many(self, keys: Iterable[tuple[str, str]]) -> dict[tuple[str, str], Any]:
+        """
+        Reads several data points with one request per service call.
+        :param keys: The functional profile and data point names
+        :returns: The converted values by functional profile and data point name
+        """
+        records = [self._data_point_index.find(fp_name, dp_name) for fp_name, dp_name in keys]
+        return await self.read_planned(plan_rest_reads(records, self._max_ages))
+
+    async def write_many(self, values: dict[tuple[str, str], Any]):
+        """
+        Writing is not supported for REST devices yet, the values are rejected instead of being dropped.
+        :raises NotImplementedError: always, nothing is written
+        """
+        raise NotImplementedError(f"writing data points {list(values)} is not supported for REST devices")
 
-                    response = json.dumps(response)
-                    self._cache[cache_key] = response
+    async def read_planned(self, plan: RestReadPlan) -> dict[tuple[str, str], Any]:
+        """
+        Reads all data points of a read plan, one request per group.
 
-            value = jmespath.search(query, json.loads(response))
-            return value
+        :param plan: The read plan
+        :returns: The converted values by functional profile and data point name
+        """
+        raw_values = await self._read_raw(plan, self.read_limiter())
+        return {key: self.get_data_point(key).from_device(None if isinstance(raw_values[key], Exception)
+                                                          else raw_values[key]) for key in plan.keys}
+
+    async def read_planned_concurrent(self, plan: RestReadPlan,
+                                      limiter: asyncio.Semaphore | None = None) -> ReadResult:
+        """
+        Reads all data points of a read plan like read_planned, data points which cannot be read or converted
+        are reported in the errors of the result instead of failing the read.
+
+        :param plan: The read plan
+        :param limiter: Overrides the limiter of the interface
+        :returns: The converted values and the errors by functional profile and data point name
+        """
+        raw_values = await self._read_raw(plan, limiter or self.read_limiter())
+        result = ReadResult()
+        for key in plan.keys:
+            raw_value = raw_values[key]
+            if isinstance(raw_value, Exception):
+                result.errors[key] = raw_value
+                continue
+            try:
+                result.values[key] = self.get_data_point(key).from_device(raw_value)
+            except Exception as e:
+                result.errors[key] = e
+        return result
 
+    async def _read_raw(self, plan: RestReadPlan, limiter: asyncio.Semaphore) -> dict[tuple[str, str], Any]:
+        """
+        Performs the requests of a read plan, at most as many at the same time as the limiter admits.
+        A data point which could not be read maps to the exception raised while reading it.
+        """
+
+        async def limited(group: RequestGroup) -> dict[tuple[str, str], Any]:
+            async with limiter:
+                return await self._read_group(group)
+
+        raw_values = {}
+        for part in await asyncio.gather(*(limited(group) for group in plan.groups)):
+            raw_values.update(part)
+        return raw_values
+
+    async def _read_group(self, group: RequestGroup) -> dict[tuple[str, str], Any]:
+        headers = dict(group.headers)
+        headers['Authorization'] = f'Bearer {self.token}'
+        try:
+            response = await self._cached_request(_method_name(group.method), group.url, headers, group.body,
+                                                  group.max_age)
+        except DeviceUnavailableError as e:
+            logging.debug(f"Service unavailable, {group.url} skipped: {e}")
+            return {(record.fp_name, record.dp_name): e for record in group.records}
+        except (ClientResponseError, ClientConnectionError) as e:
+            logging.error(f"{type(e).__name__}: request to {group.url} failed: {e}")
+            return {(record.fp_name, record.dp_name): e for record in group.records}
+        except Exception as e:
+            logging.error(f"An unexpected error occurred while requesting {group.url}: {e}")
+            return {(record.fp_name, record.dp_name): e for record in group.records}
+
+        raw_values = {}
+        for record in group.records:
+            key = (record.fp_name, record.dp_name)
+            if record.expression is None:
+                raw_values[key] = DataPointException(f"no valid query for data point {key}: {record.query}")
+                continue
+            try:
+                raw_values[key] = record.expression.search(response)
+            except Exception as e:
+                logging.error(f"An unexpected error occurred while evaluating the query of {key}: {e}")
+                raw_values[key] = e
+        return raw_values
+
+    async def _request(self, method: str, url: str, headers: dict[str, str], body: str | None = None) -> Any:
+        """
+        Performs a service call, concurrent calls of the same request share one HTTP request.
+        :returns: The parsed JSON response
+        """
+        key = (method, url, body, frozenset(headers.items()))
+        return await self._requests.do(
+            key, lambda: self.circuit_breaker.call(lambda: self._send(method, url, headers, body)))
+
+    async def _cached_request(self, method: str, url: str, headers: dict[str, str], body: str | None = None,
+                              max_age: float | None = None) -> Any:
+        """
+        Performs a service call or returns its cached response.
+        :param max_age: The time in seconds a cached response is fresh, the default of the cache if None
+        :returns: The parsed JSON response
+        """
+        # the header values are part of the key, a response is not shared between different tokens
+        key = (method, url, body, frozenset(headers.items()))
+        return await self._cache.get(key, lambda: self._request(method, url, headers, body), max_age)
+
+    async def read_value(self, fp_name: str, dp_name: str) -> Any:
+        """
+        Reads the raw value of a data point like getval, but errors are raised instead of returning None.
+        :returns: The value selected by the query of the data point
+        """
+        record = self._data_point_index.find(fp_name, dp_name)
+        if record.expression is None:
+            raise DataPointException(f"no valid query for data point {(fp_name, dp_name)}: {record.query}")
+
+        headers = dict(record.headers)
+        headers['Authorization'] = f'Bearer {self.token}'
+
+        response = await self._cached_request(_method_name(record.method), record.url, headers, record.body,
+                                              self._max_ages[record.fp_name, record.dp_name])
+        # the cached response is shared by all data points of the service call, it is not modified
+        return record.expression.search(response)
+
+    async def getval(self, fp_name, dp_name):
+        try:
+            return await self.read_value(fp_name, dp_name)
+        except DeviceUnavailableError as e:
+            logging.debug(f"Service unavailable: {e}")
+        except DataPointException as e:
+            logging.error(e)
         except ClientResponseError as e:
             logging.error(f"HTTP error occurred: {e}")
         except ClientConnectionError as e:
@@ -1,7 +1,10 @@
 import re
+from typing import Any, Iterable, Mapping
 
-from sgr_library.api import BaseSGrInterface, FunctionProfile, DeviceInformation, ConfigurationParameter
+from sgr_library.api import BaseSGrInterface, FunctionProfile, DeviceInformation, ConfigurationParameter, ReadResult
+from sgr_library.circuit_breaker import CircuitState
 from sgr_library.generic_interface import GenericSGrDeviceBuilder
+from sgr_library.spec_cache import SpecCache
 
 
 class SGrDevice(BaseSGrInterface):
@@ -15,9 +18,17 @@ class SGrDevice(BaseSGrInterface):
         return self._interface is not None
 
     async def connect(self):
-        self._interface = self._builder.build()
+        # the spec is parsed in a thread, adding a device does not stall the polling of the other devices
+        self._interface = await self._builder.build_async()
         await self._interface.connect()
 
+    async def close(self):
+        """
+        Releases the connection of the device, a shared Modbus TCP connection is closed by its last user.
+        """
+        if self._interface is not None:
+            await self._interface.close()
+
     def update_config(self, config: dict | str) -> 'SGrDevice':
         if isinstance(config, str):
             self._builder.config_file_path(config)
@@ -26,6 +37,21 @@ class SGrDevice(BaseSGrInterface):
 
         return self
 
+    def lazy(self, lazy: bool = True) -> 'SGrDevice':
+        self._builder.lazy(lazy)
+        return self
+
+    def compact(self, compact: bool = True) -> 'SGrDevice':
+        self._builder.compact(compact)
+        return self
+
+    def preload(self):
+        self._interface.preload()
+
+    def use_spec_cache(self, cache: SpecCache | str) -> 'SGrDevice':
+        self._builder.spec_cache(cache)
+        return self
+
     def show_replacement(self):
         content, _ = self._builder.replace_variables()
         return content
@@ -39,9 +65,30 @@ class SGrDevice(BaseSGrInterface):
             content = self._builder.get_spec_content()
         return self
 
-    def get_function_profiles(self) -> dict[str, FunctionProfile]:
+    def get_function_profiles(self) -> Mapping[str, FunctionProfile]:
         return self._interface.get_function_profiles()
 
+    async def read_data(self) -> dict[tuple[str, str], Any]:
+        return await self._interface.read_data()
+
+    async def read_data_concurrent(self) -> ReadResult:
+        return await self._interface.read_data_concurrent()
+
+    async def read_many(self, keys: Iterable[tuple[str, str]]) -> dict[tuple[str, str], Any]:
+        return await self._interface.read_many(keys)
+
+    async def write_many(self, values: dict[tuple[str, str], Any]):
+        await self._interface.write_many(values)
+
+    def circuit_state(self) -> CircuitState:
+        return self._interface.circuit_state()
+
+    def max_concurrent_reads(self) -> int:
+        return self._interface.max_concurrent_reads()
+
+    def set_max_concurrent_reads(self, limit: int):
+        self._interface.set_max_concurrent_reads(limit)
+
     def build(self):
         self._interface = self._builder.build()
 
@@ -0,0 +1,47 @@
+"""
+SGr Single Flight
+------------------------
+
+Coalesces concurrent identical requests: while a request is pending, callers asking for the same key wait for its
+result instead of issuing their own request. Once the request completed the next caller starts a new one, the result
+is not cached here.
+"""
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+class SingleFlight(Generic[T]):
+    """
+    The pending requests by key.
+    """
+
+    def __init__(self):
+        self._pending: dict[Hashable, asyncio.Future[T]] = {}
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def do(self, key: Hashable, request: Callable[[], Awaitable[T]]) -> T:
+        """
+        Performs a request, or joins the pending request of the same key.
+        A cancelled caller does not cancel the request shared with the other callers.
+        :param key: Identifies requests with the same result
+        :param request: Performs the request
+        :returns: The result of the request
+        :raises Exception: The error of the request, raised to all callers sharing it
+        """
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(request())
+            self._pending[key] = future
+            future.add_done_callback(lambda done: self._done(key, done))
+        return await asyncio.shield(future)
+
+    def _done(self, key: Hashable, future: asyncio.Future):
+        if self._pending.get(key) is future:
+            del self._pending[key]
+        # the error is raised to the callers, if all of them were cancelled it is dropped silently
+        if not future.cancelled():
+            future.exception()
@@ -0,0 +1,127 @@
+"""
+SGr Device Spec Cache
+------------------------
+
+Persists the compiled device frames on disk, so that a restart does not have to substitute and parse the XML
+specifications of all devices again. An entry is keyed by a hash of the specification content, the configuration
+and the library version, a changed specification or a library update therefore never hits a stale entry.
+Only frames whose values all have their declared types are stored.
+The cache directory has to be trusted, the entries are pickles.
+"""
+import configparser
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+
+from sgr_library.generated.product import DeviceFrame
+from sgr_library.spec_template import mistyped_field
+
+logger = logging.getLogger(__name__)
+
+# incremented whenever the layout of the cache entries changes
+SPEC_CACHE_FORMAT = 1
+
+_ENTRY_SUFFIX = '.frame.pickle'
+
+
+def _distribution_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return 'unknown'
+
+
+@lru_cache(maxsize=None)
+def library_version() -> str:
+    """
+    Identifies the library and the generated data classes the cached frames were created with.
+    A source checkout has no version, it is identified by the generated modules instead.
+    """
+    fingerprint = hashlib.sha256()
+    fingerprint.update(_distribution_version('sgr-lib').encode())
+    fingerprint.update(_distribution_version('xsdata').encode())
+    generated = Path(__file__).parent / 'generated'
+    for module in sorted(generated.rglob('*.py')):
+        stat = module.stat()
+        fingerprint.update(f'{module.relative_to(generated)}:{stat.st_size}:{stat.st_mtime_ns}'.encode())
+    return fingerprint.hexdigest()
+
+
+class SpecCache:
+    """
+    A directory of compiled device frames.
+    """
+
+    def __init__(self, directory: str | os.PathLike):
+        """
+        :param directory: The cache directory, it is created if it does not exist
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(spec: str, config: configparser.ConfigParser) -> str:
+        """
+        :param spec: The content of the specification, before the variables are replaced
+        :param config: The configuration of the device
+        :returns: The key of the compiled frame
+        """
+        digest = hashlib.sha256()
+        digest.update(f'{SPEC_CACHE_FORMAT}:{library_version()}\0'.encode())
+        digest.update(spec.encode())
+        for section_name, section in config.items():
+            for param_name, value in section.items():
+                digest.update(f'\0{section_name}\0{param_name}\0{value}'.encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f'{key}{_ENTRY_SUFFIX}'
+
+    def load(self, key: str) -> DeviceFrame | None:
+        """
+        :returns: The cached frame, None if there is no valid entry for the key
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as entry:
+                frame = pickle.load(entry)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable spec cache entry {path}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        if not isinstance(frame, DeviceFrame):
+            path.unlink(missing_ok=True)
+            return None
+        return frame
+
+    def store(self, key: str, frame: DeviceFrame):
+        """
+        Writes an entry, readers never see a partially written entry.
+        A frame with a value xsdata could not convert, e.g. the text of a placeholder in a port, is not stored.
+        """
+        mistyped = mistyped_field(frame)
+        if mistyped is not None:
+            logger.warning(f"Not caching spec cache entry {key}, {mistyped} holds text instead of its type")
+            return
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as entry:
+                pickle.dump(frame, entry, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self._path(key))
+        except Exception as e:
+            logger.warning(f"Failed to write spec cache entry {key}: {e}")
+            Path(temporary).unlink(missing_ok=True)
+
+    def clear(self):
+        """
+        Removes all entries, e.g. the entries of former library versions.
+        """
+        for path in self.directory.glob(f'*{_ENTRY_SUFFIX}'):
+            path.unlink(missing_ok=True)
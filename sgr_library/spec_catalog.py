@@ -0,0 +1,208 @@
+"""
+SGr Spec Catalog
+------------------------
+
+Lists the device specifications of a directory without parsing them into a DeviceFrame. Only the header of a
+specification is read with an iterative parser, which stops as soon as the device information and the kind of
+interface are known, the functional profiles are never parsed.
+The catalog is persisted as an index file and refreshed incrementally, only files which were added or changed since
+the last refresh are read again.
+"""
+import json
+import logging
+import os
+import tempfile
+import xml.etree.ElementTree as ElementTree
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+from sgr_library.generic_interface import SGrDeviceProtocol
+
+logger = logging.getLogger(__name__)
+
+# incremented whenever the layout of the index file changes
+SPEC_CATALOG_FORMAT = 1
+
+INDEX_FILE_NAME = '.sgr_catalog.json'
+
+# the interfaces of the interface list by their element name, the modbus transport is read from its description
+_INTERFACES = {
+    'restApiInterface': SGrDeviceProtocol.RESTAPI,
+    'contactInterface': SGrDeviceProtocol.CONTACT,
+    'genericInterface': SGrDeviceProtocol.GENERIC,
+}
+
+# the elements of the header, by their path below the root element
+_HEADER_FIELDS = {
+    ('deviceName',): 'device_name',
+    ('manufacturerName',): 'manufacturer_name',
+    ('deviceInformation', 'deviceCategory'): 'device_category',
+    ('deviceInformation', 'brandName'): 'brand_name',
+    ('deviceInformation', 'softwareRevision'): 'software_revision',
+    ('deviceInformation', 'hardwareRevision'): 'hardware_revision',
+}
+
+
+@dataclass(slots=True)
+class CatalogEntry:
+    file_name: str
+    mtime_ns: int
+    size: int
+    device_name: str | None = None
+    manufacturer_name: str | None = None
+    device_category: str | None = None
+    brand_name: str | None = None
+    software_revision: str | None = None
+    hardware_revision: str | None = None
+    # the element name of the first interface, e.g. modbusInterface
+    interface: str | None = None
+    protocol: SGrDeviceProtocol | None = None
+    # the reason the header could not be read, the file is read again once it changed
+    error: str | None = None
+
+    def to_json(self) -> dict:
+        data = asdict(self)
+        data['protocol'] = self.protocol.name if self.protocol is not None else None
+        return data
+
+    @staticmethod
+    def from_json(data: dict) -> 'CatalogEntry':
+        protocol = data.get('protocol')
+        return CatalogEntry(**{**data, 'protocol': SGrDeviceProtocol[protocol] if protocol is not None else None})
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _modbus_protocol(transports: set[str]) -> SGrDeviceProtocol:
+    # same precedence as resolve_protocol, a modbus interface without transport is generic
+    if 'modbusRtu' in transports:
+        return SGrDeviceProtocol.MODBUS_RTU
+    if 'modbusTcp' in transports:
+        return SGrDeviceProtocol.MODBUS_TPC
+    return SGrDeviceProtocol.GENERIC
+
+
+def read_spec_header(path: str | os.PathLike) -> dict:
+    """
+    Reads the device information and the interface kind of a specification.
+    Specifications with several interfaces are described by their first interface.
+    :param path: The path of the specification
+    :returns: The header fields of CatalogEntry
+    :raises ElementTree.ParseError: if the header is not well-formed XML
+    """
+    header: dict = {'interface': None, 'protocol': None}
+    path_stack: list[str] = []
+    modbus_transports: set[str] = set()
+    for event, element in ElementTree.iterparse(path, events=('start', 'end')):
+        if event == 'start':
+            path_stack.append(_local_name(element.tag))
+            # the root element is not part of the paths below
+            element_path = tuple(path_stack[1:])
+            if len(element_path) == 2 and element_path[0] == 'interfaceList':
+                header['interface'] = element_path[1]
+                if element_path[1] != 'modbusInterface':
+                    header['protocol'] = _INTERFACES.get(element_path[1])
+                    break
+            if len(element_path) == 3 and element_path[:2] == ('interfaceList', 'modbusInterface') \
+                    and element_path[2] != 'modbusInterfaceDescription':
+                # the description precedes the functional profiles, it was read or there is none
+                header['protocol'] = _modbus_protocol(modbus_transports)
+                break
+            if len(element_path) == 4 and element_path[:3] == ('interfaceList', 'modbusInterface',
+                                                               'modbusInterfaceDescription'):
+                modbus_transports.add(element_path[3])
+            continue
+        element_path = tuple(path_stack[1:])
+        path_stack.pop()
+        if element_path in _HEADER_FIELDS:
+            header[_HEADER_FIELDS[element_path]] = (element.text or '').strip()
+        elif element_path == ('interfaceList', 'modbusInterface'):
+            # a modbus interface without functional profiles
+            header['protocol'] = _modbus_protocol(modbus_transports)
+            break
+        # the elements read are not kept
+        element.clear()
+    return header
+
+
+class SpecCatalog:
+    """
+    The catalog of the specifications of a directory, persisted in an index file.
+    """
+
+    def __init__(self, directory: str | os.PathLike, pattern: str = '*.xml',
+                 index_path: str | os.PathLike | None = None):
+        """
+        :param directory: The directory of the specifications
+        :param pattern: The glob pattern of the specification files in the directory
+        :param index_path: The index file, INDEX_FILE_NAME in the directory if None
+        """
+        self.directory = Path(directory)
+        self.pattern = pattern
+        self.index_path = Path(index_path) if index_path is not None else self.directory / INDEX_FILE_NAME
+        self._entries: dict[str, CatalogEntry] = self._load_index()
+
+    def _load_index(self) -> dict[str, CatalogEntry]:
+        try:
+            with open(self.index_path) as index_file:
+                index = json.load(index_file)
+            if index.get('format') != SPEC_CATALOG_FORMAT:
+                return {}
+            return {data['file_name']: CatalogEntry.from_json(data) for data in index['entries']}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable spec catalog index {self.index_path}: {e}")
+            return {}
+
+    def _store_index(self):
+        index = {'format': SPEC_CATALOG_FORMAT, 'entries': [entry.to_json() for entry in self._entries.values()]}
+        descriptor, temporary = tempfile.mkstemp(dir=self.index_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'w') as index_file:
+                json.dump(index, index_file, indent=1)
+            os.replace(temporary, self.index_path)
+        except Exception as e:
+            logger.warning(f"Failed to write spec catalog index {self.index_path}: {e}")
+            Path(temporary).unlink(missing_ok=True)
+
+    def refresh(self) -> list[CatalogEntry]:
+        """
+        Reads the headers of the specifications which were added or changed since the last refresh, drops the
+        removed ones and updates the index file if anything changed.
+        :returns: The entries of the catalog, sorted by file name
+        """
+        entries: dict[str, CatalogEntry] = {}
+        changed = False
+        for path in sorted(self.directory.glob(self.pattern)):
+            stat = path.stat()
+            entry = self._entries.get(path.name)
+            if entry is None or entry.mtime_ns != stat.st_mtime_ns or entry.size != stat.st_size:
+                entry = CatalogEntry(path.name, stat.st_mtime_ns, stat.st_size)
+                try:
+                    for name, value in read_spec_header(path).items():
+                        setattr(entry, name, value)
+                except Exception as e:
+                    logger.warning(f"Failed to read the header of spec {path}: {e}")
+                    entry.error = f'{type(e).__name__}: {e}'
+                changed = True
+            entries[path.name] = entry
+        changed = changed or entries.keys() != self._entries.keys()
+        self._entries = entries
+        if changed:
+            self._store_index()
+        return self.entries()
+
+    def entries(self) -> list[CatalogEntry]:
+        """
+        Returns the entries of the last refresh or of the index file, without reading the directory.
+        """
+        return list(self._entries.values())
+
+    def path(self, entry: CatalogEntry) -> Path:
+        """
+        Returns the path of the specification of an entry, e.g. to build a device from it.
+        """
+        return self.directory / entry.file_name
@@ -0,0 +1,106 @@
+"""
+SGr Spec Loader
+------------------------
+
+Prepares the device specifications of a fleet at startup. The specifications are substituted and parsed in
+parallel in a process pool and each worker stores its frame in the spec cache of the builder, the xsdata tree is
+not sent back. Building the devices afterwards with the same builders, e.g. with build_many, loads the frames from
+the cache instead of parsing them again. Every specification is reported with the time its worker took, a
+specification which cannot be loaded is reported with its error instead of failing the others.
+"""
+import glob
+import logging
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable
+
+from sgr_library.generic_interface import GenericSGrDeviceBuilder
+from sgr_library.spec_cache import SpecCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
+class SpecLoadResult:
+    source: str
+    # time the worker spent reading, substituting, parsing and storing the specification
+    seconds: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def load_spec(builder: GenericSGrDeviceBuilder) -> SpecLoadResult:
+    """
+    Builds the frame of a device into the spec cache of its builder and measures the time it took, errors are
+    returned in the result.
+    """
+    start = time.perf_counter()
+    try:
+        builder.build_frame()
+    except Exception as e:
+        return SpecLoadResult(builder.spec_source(), time.perf_counter() - start, f'{type(e).__name__}: {e}')
+    return SpecLoadResult(builder.spec_source(), time.perf_counter() - start)
+
+
+def warm_spec_cache(builders: Iterable[GenericSGrDeviceBuilder], executor: Executor | None = None,
+                    max_workers: int | None = None) -> list[SpecLoadResult]:
+    """
+    Builds the frames of several devices in parallel into the spec caches of their builders.
+    :param builders: The builders of the devices, each with a spec cache
+    :param executor: The executor building the frames, a process pool with max_workers processes is created if None
+    :param max_workers: The number of processes, the number of cores if None
+    :returns: The results in the order of the builders
+    :raises ValueError: if a builder has no spec cache, its frame would be parsed for nothing
+    """
+    builders = list(builders)
+    for builder in builders:
+        if builder.get_spec_cache() is None:
+            raise ValueError(f"the builder of {builder.spec_source()} has no spec cache")
+    if executor is None:
+        workers = max_workers or os.cpu_count() or 1
+        # a few chunks per process balance the load without transferring each builder separately
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(load_spec, builders, chunksize=max(1, len(builders) // (workers * 4))))
+    else:
+        results = list(executor.map(load_spec, builders))
+    for result in results:
+        if not result.ok:
+            logger.warning(f"Failed to load spec {result.source}: {result.error}")
+    return results
+
+
+def spec_directory_builders(directory: str | os.PathLike, spec_cache: SpecCache, config: dict | str | None = None,
+                            pattern: str = '*.xml') -> list[GenericSGrDeviceBuilder]:
+    """
+    Creates the builders of the specifications of a directory, all with the same configuration.
+    :param directory: The directory of the specifications
+    :param spec_cache: The spec cache of the builders
+    :param config: The configuration, a dict or the path of a configuration file
+    :param pattern: The glob pattern of the specification files in the directory
+    :returns: The builders in the order of the file paths
+    """
+    builders = []
+    for path in sorted(glob.glob(os.path.join(directory, pattern))):
+        builder = GenericSGrDeviceBuilder().xml_file_path(path).spec_cache(spec_cache)
+        if isinstance(config, str):
+            builder.config_file_path(config)
+        elif config is not None:
+            builder.config(config)
+        builders.append(builder)
+    return builders
+
+
+def load_spec_directory(directory: str | os.PathLike, spec_cache: SpecCache, config: dict | str | None = None,
+                        pattern: str = '*.xml', executor: Executor | None = None,
+                        max_workers: int | None = None) -> list[SpecLoadResult]:
+    """
+    Builds the frames of the specifications of a directory in parallel into a spec cache, see warm_spec_cache.
+    Devices built afterwards from these files with the same configuration and cache load their frames from it.
+    :returns: The results in the order of the file paths
+    """
+    return warm_spec_cache(spec_directory_builders(directory, spec_cache, config, pattern), executor, max_workers)
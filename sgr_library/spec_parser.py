@@ -0,0 +1,83 @@
+"""
+SGr Spec Parser
+------------------------
+
+Creates the xsdata parsers of the device specifications. All parsers of the process share one XmlContext, the
+metadata xsdata derives from the generated classes is built once and reused by every parse.
+The event handler is selectable: the default handler of xsdata is based on xml.etree, the lxml handler is used if
+lxml is installed (pip install sgr-lib[lxml]) and selected with set_xml_handler('lxml').
+"""
+from typing import Callable
+
+from xsdata.formats.dataclass.context import XmlContext
+from xsdata.formats.dataclass.parsers import XmlParser
+from xsdata.formats.dataclass.parsers.handlers import XmlEventHandler
+from xsdata.formats.dataclass.parsers.mixins import XmlHandler
+
+
+def _native_handler() -> type[XmlHandler]:
+    return XmlEventHandler
+
+
+def _lxml_handler() -> type[XmlHandler]:
+    # lxml is an optional dependency
+    from xsdata.formats.dataclass.parsers.handlers.lxml import LxmlEventHandler
+    return LxmlEventHandler
+
+
+xml_handlers: dict[str, Callable[[], type[XmlHandler]]] = {
+    'native': _native_handler,
+    'lxml': _lxml_handler,
+}
+
+_context: XmlContext | None = None
+_handler: type[XmlHandler] = XmlEventHandler
+
+
+def xml_context() -> XmlContext:
+    """
+    Returns the context shared by all parsers of the process.
+    """
+    global _context
+    if _context is None:
+        _context = XmlContext()
+    return _context
+
+
+def available_xml_handlers() -> list[str]:
+    """
+    Returns the names of the event handlers which can be selected, e.g. lxml only if it is installed.
+    """
+    available = []
+    for name, handler in xml_handlers.items():
+        try:
+            handler()
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def set_xml_handler(name: str):
+    """
+    Selects the event handler of the parsers created afterwards.
+    :param name: The name of the handler, see xml_handlers
+    :raises ValueError: if the handler is unknown or its parser library is not installed
+    """
+    global _handler
+    if name not in xml_handlers:
+        raise ValueError(f"unknown xml handler {name}, supported are {', '.join(xml_handlers)}")
+    try:
+        _handler = xml_handlers[name]()
+    except ImportError as e:
+        raise ValueError(f"xml handler {name} is not available: {e}") from e
+
+
+def create_parser(handler: type[XmlHandler] | None = None, context: XmlContext | None = None) -> XmlParser:
+    """
+    Creates a parser, a parser must not be shared between threads.
+    :param handler: The event handler, the one selected with set_xml_handler if None
+    :param context: The context, the shared context of the process if None
+    """
+    return XmlParser(context=context or xml_context(), handler=handler or _handler)
+
@@ -0,0 +1,174 @@
+"""
+SGr Spec Template
+------------------------
+
+Replaces the {{variable}} placeholders of a device specification with the values of the device configuration.
+A specification is split at its placeholders once, every device built from it is rendered in a single pass.
+Fleets of devices built from the same specification share one parsed frame template, see FrameTemplate.
+"""
+import configparser
+import copy
+import logging
+import re
+from dataclasses import fields, is_dataclass
+from functools import lru_cache
+from typing import Any, Mapping, get_args
+
+from sgr_library.generated.product import DeviceFrame
+from sgr_library.spec_parser import create_parser
+
+logger = logging.getLogger(__name__)
+
+_PLACEHOLDER = re.compile(r'{{([^{}]+)}}')
+
+
+class SpecTemplate:
+    """
+    A specification split into its text and placeholders.
+    """
+
+    def __init__(self, spec: str):
+        # text and placeholder names alternate, the names are at the odd indexes
+        self._parts = _PLACEHOLDER.split(spec)
+        self.placeholders = frozenset(self._parts[1::2])
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """
+        :param values: The values by placeholder name, placeholders without a value are kept
+        :returns: The specification with the placeholders replaced
+        """
+        parts = self._parts.copy()
+        for index in range(1, len(parts), 2):
+            name = parts[index]
+            parts[index] = values[name] if name in values else '{{' + name + '}}'
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=32)
+def compile_template(spec: str) -> SpecTemplate:
+    """
+    Returns the template of a specification, devices built from the same specification share it.
+    """
+    return SpecTemplate(spec)
+
+
+def config_values(config: configparser.ConfigParser) -> dict[str, str]:
+    """
+    Collects the values of all sections of a configuration, the first section defining a parameter wins.
+    """
+    values = {}
+    for section_name, section in config.items():
+        for param_name in section:
+            if param_name not in values:
+                values[param_name] = config.get(section_name, param_name)
+    return values
+
+
+class FrameTemplate:
+    """
+    A specification parsed once with its placeholders. The frames of the devices built from it share all elements
+    except the ones leading to a placeholder, which are copied and filled with the values of each device.
+    """
+
+    def __init__(self, frame: DeviceFrame):
+        """
+        :param frame: The frame parsed from the specification without replacing the placeholders
+        :raises ValueError: if a placeholder is the value of a field which is not a string, e.g. a port
+        """
+        self._frame = frame
+        self._placeholders: list[tuple[tuple[str | int, ...], SpecTemplate]] = []
+        self._collect(frame, (), DeviceFrame)
+
+    def _collect(self, node: Any, path: tuple[str | int, ...], declared_type: Any):
+        if isinstance(node, str):
+            if '{{' in node:
+                template = SpecTemplate(node)
+                if template.placeholders:
+                    # xsdata keeps the text of a value it cannot convert, binding it would leave a string in
+                    # e.g. an int field
+                    if not _accepts_str(declared_type):
+                        raise ValueError(f"placeholder in the non-string field {'.'.join(map(str, path))}")
+                    self._placeholders.append((path, template))
+        elif is_dataclass(node):
+            for node_field in fields(node):
+                self._collect(getattr(node, node_field.name), path + (node_field.name,), node_field.type)
+        elif isinstance(node, list):
+            for index, item in enumerate(node):
+                self._collect(item, path + (index,), declared_type)
+
+    @property
+    def placeholders(self) -> frozenset[str]:
+        return frozenset(name for _, template in self._placeholders for name in template.placeholders)
+
+    def bind(self, values: Mapping[str, str]) -> DeviceFrame:
+        """
+        :param values: The values by placeholder name, placeholders without a value are kept
+        :returns: The frame of one device
+        """
+        root = copy.copy(self._frame)
+        copies: dict[tuple[str | int, ...], Any] = {(): root}
+        for path, template in self._placeholders:
+            node = root
+            for depth in range(1, len(path)):
+                step = path[depth - 1]
+                if path[:depth] not in copies:
+                    child = _get(node, step)
+                    child = list(child) if isinstance(child, list) else copy.copy(child)
+                    _set(node, step, child)
+                    copies[path[:depth]] = child
+                node = copies[path[:depth]]
+            _set(node, path[-1], template.render(values))
+        return root
+
+
+def _accepts_str(declared_type: Any) -> bool:
+    # e.g. str, Optional[str] or List[str], wildcards are declared as object
+    return declared_type in (str, object, Any) or any(_accepts_str(argument) for argument in get_args(declared_type))
+
+
+def mistyped_field(node: Any, declared_type: Any = DeviceFrame, path: tuple[str | int, ...] = ()) -> str | None:
+    """
+    Finds a string in a field which is not a string, xsdata keeps the text of a value it cannot convert.
+    :param node: The frame or an element of it
+    :param declared_type: The type of the field holding the node
+    :returns: The path of the first such field, None if all values have their declared type
+    """
+    if isinstance(node, str):
+        return None if _accepts_str(declared_type) else '.'.join(map(str, path))
+    if is_dataclass(node):
+        for node_field in fields(node):
+            mistyped = mistyped_field(getattr(node, node_field.name), node_field.type, path + (node_field.name,))
+            if mistyped is not None:
+                return mistyped
+    elif isinstance(node, list):
+        for index, item in enumerate(node):
+            mistyped = mistyped_field(item, declared_type, path + (index,))
+            if mistyped is not None:
+                return mistyped
+    return None
+
+
+def _get(node: Any, step: str | int) -> Any:
+    return node[step] if isinstance(step, int) else getattr(node, step)
+
+
+def _set(node: Any, step: str | int, value: Any):
+    if isinstance(step, int):
+        node[step] = value
+    else:
+        setattr(node, step, value)
+
+
+@lru_cache(maxsize=32)
+def compile_frame_template(spec: str) -> FrameTemplate | None:
+    """
+    Returns the parsed template of a specification, devices built from the same specification share it.
+    :returns: None if the specification cannot be parsed before its placeholders are replaced or a placeholder is
+        the value of an element which is not a string, e.g. a port, the specification is rendered and parsed for
+        every device then
+    """
+    try:
+        return FrameTemplate(create_parser().from_string(spec, DeviceFrame))
+    except Exception as e:
+        logger.debug(f"Specification is not parsable as a template: {e}")
+        return None
@@ -1,11 +1,18 @@
 from sgr_library.api import DataPointValidator
 from sgr_library.generated.generic import DataTypeProduct
 from sgr_library.validators.validator import IntValidator, EnumValidator, FloatValidator, StringValidator, \
-    BooleanValidator
+    BooleanValidator, JsonValidator, ArrayValidator
 
 
-def build_validator(type: DataTypeProduct) -> DataPointValidator:
-    if type.int8:
+def build_validator(type: DataTypeProduct, array_length: int | None = None) -> DataPointValidator:
+    """
+    :param array_length: The length of an array-valued data point, its elements are validated by the type
+    """
+    if array_length is not None and not type.json:
+        return ArrayValidator(build_validator(type))
+    if type.json:
+        return JsonValidator()
+    elif type.int8:
         return IntValidator(8)
     elif type.int16:
         return IntValidator(16)
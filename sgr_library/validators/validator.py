@@ -15,7 +15,7 @@ class UnsupportedValidator(DataPointValidator):
 
 class EnumValidator(DataPointValidator):
     def __init__(self, type: EnumMapProduct):
-        self._type = type
+        # only the valid entries are kept, the enum map with its descriptions is part of the parsed spec
         literals = {entry.literal for entry in type.enum_entry}
         ordinals = {entry.ordinal for entry in type.enum_entry}
         literals.union(ordinals)
@@ -80,3 +80,30 @@ class BooleanValidator(DataPointValidator):
 
     def data_type(self):
         return DataTypes.BOOLEAN
+
+
+class JsonValidator(DataPointValidator):
+
+    def validate(self, value: Any) -> bool:
+        return isinstance(value, (dict, list))
+
+    def data_type(self):
+        return DataTypes.JSON
+
+
+class ArrayValidator(DataPointValidator):
+    """
+    Validates the elements of an array-valued data point.
+    """
+
+    def __init__(self, element: DataPointValidator):
+        self._element = element
+
+    def validate(self, value: Any) -> bool:
+        return isinstance(value, list) and all(self._element.validate(element) for element in value)
+
+    def data_type(self):
+        return self._element.data_type()
+
+    def options(self) -> list[str] | None:
+        return self._element.options()
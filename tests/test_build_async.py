@@ -0,0 +1,67 @@
+import asyncio
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from sgr_library.generic_interface import GenericSGrDeviceBuilder, build_many
+
+HOVAL_SPEC = 'xml_files/SGr_04_0017_xxxx_HOVAL_HeatPumpV0.2.1.xml'
+CLEMAP_SPEC = 'xml_files/SGr_04_mmmm_dddd_CLEMAPEnergyMonitorEIV0.2.1.xml'
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        yield
+
+
+def test_build_async_parses_off_the_loop(monkeypatch):
+    builder = GenericSGrDeviceBuilder().xml_file_path(HOVAL_SPEC)
+    threads = []
+    build_frame = builder.build_frame
+
+    def recording_build_frame():
+        threads.append(threading.current_thread())
+        return build_frame()
+
+    monkeypatch.setattr(builder, 'build_frame', recording_build_frame)
+
+    async def build():
+        return await builder.build_async(), threading.current_thread()
+
+    device, loop_thread = asyncio.run(build())
+    assert threads and threads[0] is not loop_thread
+    assert device.device_information().name == GenericSGrDeviceBuilder().xml_file_path(HOVAL_SPEC).build() \
+        .device_information().name
+
+
+def test_build_many_keeps_the_order_and_reports_errors(tmp_path):
+    broken = tmp_path / 'broken.xml'
+    broken.write_text('<not a spec')
+    builders = [GenericSGrDeviceBuilder().xml_file_path(path) for path in (HOVAL_SPEC, str(broken), CLEMAP_SPEC)]
+
+    async def build():
+        with ThreadPoolExecutor(2) as executor:
+            devices = await build_many(builders, executor, return_exceptions=True)
+        # the REST client session belongs to the loop
+        await devices[2].close()
+        return devices
+
+    hoval, error, clemap = asyncio.run(build())
+    assert type(hoval).__name__ == 'SgrModbusInterface'
+    assert isinstance(error, Exception)
+    assert type(clemap).__name__ == 'SgrRestInterface'
+
+
+def test_build_frame_in_a_process_pool():
+    builder = GenericSGrDeviceBuilder().xml_file_path(HOVAL_SPEC)
+
+    async def build():
+        with ProcessPoolExecutor(1) as executor:
+            return await builder.build_frame_async(executor)
+
+    frame, _ = asyncio.run(build())
+    assert frame == builder.build_frame()[0]
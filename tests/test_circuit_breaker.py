@@ -0,0 +1,109 @@
+import asyncio
+
+import pytest
+from pymodbus.exceptions import ConnectionException, ModbusException
+
+from sgr_library.circuit_breaker import CircuitBreaker, CircuitState, is_http_failure, is_modbus_failure
+from sgr_library.exceptions import DeviceUnavailableError
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def breaker(clock: Clock, is_failure=is_modbus_failure) -> CircuitBreaker:
+    return CircuitBreaker(is_failure, failure_threshold=3, initial_backoff=1.0, max_backoff=4.0, jitter=0.0,
+                          clock=clock)
+
+
+def call(circuit_breaker: CircuitBreaker, error: Exception | None = None):
+    async def request():
+        if error is not None:
+            raise error
+        return 'ok'
+
+    return asyncio.run(circuit_breaker.call(request))
+
+
+def fail(circuit_breaker: CircuitBreaker, error: Exception):
+    with pytest.raises(type(error)):
+        call(circuit_breaker, error)
+
+
+def test_consecutive_failures_open_the_circuit():
+    clock = Clock()
+    circuit_breaker = breaker(clock)
+    for _ in range(2):
+        fail(circuit_breaker, ConnectionException('down'))
+    assert circuit_breaker.state == CircuitState.CLOSED
+    fail(circuit_breaker, ConnectionException('down'))
+    assert circuit_breaker.state == CircuitState.OPEN
+    with pytest.raises(DeviceUnavailableError):
+        call(circuit_breaker)
+
+
+def test_a_success_resets_the_failures():
+    circuit_breaker = breaker(Clock())
+    fail(circuit_breaker, ConnectionException('down'))
+    fail(circuit_breaker, ConnectionException('down'))
+    assert call(circuit_breaker) == 'ok'
+    fail(circuit_breaker, ConnectionException('down'))
+    assert circuit_breaker.state == CircuitState.CLOSED
+
+
+def test_errors_reported_by_the_device_are_not_failures():
+    circuit_breaker = breaker(Clock())
+    for _ in range(5):
+        fail(circuit_breaker, ModbusException('illegal address'))
+    assert circuit_breaker.state == CircuitState.CLOSED
+
+
+def test_repeated_timeouts_open_the_circuit():
+    circuit_breaker = breaker(Clock())
+
+    async def timeout():
+        await asyncio.wait_for(asyncio.sleep(1), 0.001)
+
+    for _ in range(3):
+        with pytest.raises(asyncio.TimeoutError):
+            asyncio.run(circuit_breaker.call(timeout))
+    assert circuit_breaker.state == CircuitState.OPEN
+
+
+def test_asyncio_timeouts_are_failures():
+    assert is_modbus_failure(asyncio.TimeoutError())
+    assert is_http_failure(asyncio.TimeoutError())
+
+
+def test_half_open_probe_closes_or_reopens_with_backoff():
+    clock = Clock()
+    circuit_breaker = breaker(clock)
+    for _ in range(3):
+        fail(circuit_breaker, ConnectionException('down'))
+    assert circuit_breaker.retry_in() == pytest.approx(1.0)
+
+    clock.now = 1.0
+    assert circuit_breaker.state == CircuitState.HALF_OPEN
+    fail(circuit_breaker, ConnectionException('still down'))
+    assert circuit_breaker.state == CircuitState.OPEN
+    assert circuit_breaker.retry_in() == pytest.approx(2.0)
+
+    clock.now = 3.0
+    assert call(circuit_breaker) == 'ok'
+    assert circuit_breaker.state == CircuitState.CLOSED
+    assert circuit_breaker.failures == 0
+
+
+def test_backoff_is_capped():
+    clock = Clock()
+    circuit_breaker = breaker(clock)
+    for _ in range(3):
+        fail(circuit_breaker, ConnectionException('down'))
+    for _ in range(5):
+        clock.now += circuit_breaker.retry_in()
+        fail(circuit_breaker, ConnectionException('down'))
+    assert circuit_breaker.retry_in() == pytest.approx(4.0)
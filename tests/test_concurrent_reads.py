@@ -0,0 +1,131 @@
+import asyncio
+import warnings
+
+import pytest
+from pymodbus.exceptions import ConnectionException
+
+from sgr_library.api.read_result import read_concurrently
+from sgr_library.generic_interface import GenericSGrDeviceBuilder
+from sgr_library.modbus_blocks import ReadPlan
+
+MODBUS_SPEC = 'xml_files/SGr_02_4893879785_8288144069_SwiSBox_SubMeterElectricity_V1.0.0.xml'
+
+
+class Gauge:
+    """
+    Tracks the number of reads in flight.
+    """
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def measure(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+
+
+class FakeDataPoint:
+    def __init__(self, name: str, gauge: Gauge, error: Exception | None = None):
+        self._name = name
+        self._gauge = gauge
+        self._error = error
+
+    def name(self) -> tuple[str, str]:
+        return 'fp', self._name
+
+    async def read(self):
+        await self._gauge.measure()
+        if self._error is not None:
+            raise self._error
+        return self._name.upper()
+
+
+class FakeClient:
+    """
+    Stands in for SGrModbusClient, the registers of a failing address raise a ConnectionException.
+    """
+
+    def __init__(self, failing_address: int | None = None):
+        self.gauge = Gauge()
+        self.reads = []
+        self.failing_address = failing_address
+
+    async def read_registers(self, address: int, size: int, register_type: str, slave_id: int) -> list[int]:
+        self.reads.append((address, size, register_type))
+        await self.gauge.measure()
+        if address == self.failing_address:
+            raise ConnectionException('gateway down')
+        return [0] * size
+
+
+def test_read_concurrently_reports_errors_per_data_point():
+    gauge = Gauge()
+    error = ValueError('out of range')
+    data_points = [FakeDataPoint('a', gauge), FakeDataPoint('b', gauge, error), FakeDataPoint('c', gauge)]
+    result = asyncio.run(read_concurrently(data_points, None))
+    assert result.values == {('fp', 'a'): 'A', ('fp', 'c'): 'C'}
+    assert result.errors == {('fp', 'b'): error}
+    assert not result.is_complete()
+    assert gauge.max_in_flight == 3
+
+
+def test_read_concurrently_is_bounded_by_the_limiter():
+    gauge = Gauge()
+
+    async def read():
+        return await read_concurrently([FakeDataPoint(str(i), gauge) for i in range(10)], asyncio.Semaphore(2))
+
+    assert len(asyncio.run(read()).values) == 10
+    assert gauge.max_in_flight == 2
+
+
+@pytest.fixture
+def modbus_device():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return GenericSGrDeviceBuilder().xml_file_path(MODBUS_SPEC).build()
+
+
+def test_modbus_reads_its_blocks_concurrently(modbus_device):
+    modbus_device.client = FakeClient()
+    result = asyncio.run(modbus_device.read_data_concurrent())
+    # two blocks of input registers, limited to 125 registers each
+    assert modbus_device.client.reads == [(2300, 124, 'InputRegister'), (2424, 16, 'InputRegister')]
+    assert modbus_device.client.gauge.max_in_flight == 2
+    assert set(result.values) | set(result.errors) == {(record.fp_name, record.dp_name)
+                                                        for record in modbus_device._data_point_index}
+    assert result.values[('ActiveEnergyAC', 'ActiveEnergyACtot')] == 0.0
+
+
+def test_modbus_concurrent_reads_are_limited(modbus_device):
+    modbus_device.client = FakeClient()
+    modbus_device.set_max_concurrent_reads(1)
+    asyncio.run(modbus_device.read_data_concurrent())
+    assert modbus_device.client.gauge.max_in_flight == 1
+    with pytest.raises(ValueError):
+        modbus_device.set_max_concurrent_reads(0)
+
+
+def test_modbus_failed_block_fails_only_its_members(modbus_device):
+    modbus_device.client = FakeClient(failing_address=2424)
+    result = asyncio.run(modbus_device.read_data_concurrent())
+    failed = {key for key, error in result.errors.items() if isinstance(error, ConnectionException)}
+    block = next(block for block in modbus_device._read_plan.blocks if block.address == 2424)
+    assert failed == {member.key for member in block.members}
+    assert ('ActiveEnergyAC', 'ActiveEnergyACtot') in result.values
+
+
+def test_modbus_single_reads_report_the_original_error(modbus_device):
+    modbus_device.client = FakeClient(failing_address=2300)
+    member = modbus_device._read_plan.blocks[0].members[0]
+    result = asyncio.run(modbus_device.read_planned_concurrent(ReadPlan([member.key], [], [member])))
+    assert isinstance(result.errors[member.key], ConnectionException)
+
+    data_point = modbus_device.get_data_point(member.key)
+    result = asyncio.run(read_concurrently([data_point], None))
+    assert isinstance(result.errors[member.key], ConnectionException)
+    # getval keeps returning None
+    assert asyncio.run(modbus_device.getval(*member.key)) is None
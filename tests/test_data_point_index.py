@@ -0,0 +1,75 @@
+import warnings
+
+import jmespath
+import pytest
+from pymodbus.constants import Endian
+
+from sgr_library.data_point_index import DataPointIndex, build_modbus_index, build_rest_index, compile_query
+from sgr_library.exceptions import DataPointException, FunctionalProfileException
+from sgr_library.generated.product import ResponseQuery, ResponseQueryType
+from sgr_library.generic_interface import file_loader
+
+MODBUS_SPEC = 'xml_files/SGr_02_4893879785_8288144069_SwiSBox_SubMeterElectricity_V1.0.0.xml'
+REST_SPEC = 'xml_files/SGr_04_mmmm_dddd_CLEMAPEnergyMonitorEIV0.2.1.xml'
+
+
+def load(spec: str):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return file_loader(spec)
+
+
+@pytest.fixture(scope='module')
+def modbus_index() -> DataPointIndex:
+    return build_modbus_index(load(MODBUS_SPEC).interface_list.modbus_interface, Endian.BIG)
+
+
+def test_modbus_index_has_every_data_point(modbus_index):
+    interface = load(MODBUS_SPEC).interface_list.modbus_interface
+    expected = [(fp.functional_profile.functional_profile_name, dp.data_point.data_point_name)
+                for fp in interface.functional_profile_list.functional_profile_list_element
+                for dp in fp.data_point_list.data_point_list_element]
+    assert [(record.fp_name, record.dp_name) for record in modbus_index] == expected
+    assert len(modbus_index) == len(expected)
+    assert expected[0] in modbus_index
+
+
+def test_modbus_record(modbus_index):
+    record = modbus_index.find('ActiveEnergyAC', 'ActiveEnergyACtot')
+    assert (record.address, record.count, record.register_type, record.data_type) == \
+        (2300, 4, 'InputRegister', 'float64')
+    assert record.codec.decode([0x4059, 0, 0, 0]) == 100.0
+    # data points of the same type share their codec
+    assert modbus_index.find('ActiveEnergyAC', 'ActiveEnergyACL1').codec is record.codec
+
+
+def test_find_reports_what_is_missing(modbus_index):
+    with pytest.raises(DataPointException):
+        modbus_index.find('ActiveEnergyAC', 'Missing')
+    with pytest.raises(FunctionalProfileException):
+        modbus_index.find('Missing', 'ActiveEnergyACtot')
+
+
+def test_compile_query():
+    assert compile_query(None) is None
+    expression = compile_query(ResponseQuery(ResponseQueryType.JMESPATH_EXPRESSION, '[0].value'))
+    assert expression.search([{'value': 3}]) == 3
+    # the query type defaults to a JMESPath expression
+    assert compile_query(ResponseQuery(None, 'value')).search({'value': 4}) == 4
+
+
+def test_invalid_or_unsupported_queries_are_not_compiled():
+    assert compile_query(ResponseQuery(ResponseQueryType.JMESPATH_EXPRESSION, '[0.')) is None
+    assert compile_query(ResponseQuery(ResponseQueryType.XPATH_EXPRESSION, '/value')) is None
+    assert compile_query(ResponseQuery(ResponseQueryType.JMESPATH_EXPRESSION, None)) is None
+
+
+def test_rest_records_evaluate_like_their_queries():
+    phases = {f'{name}_l{phase}': float(phase) for name in ('p', 'q', 'avg_energy', 'v', 'i', 's', 'pf')
+              for phase in (1, 2, 3)}
+    response = [{'ten_sec': phases, 'one_min': phases}]
+    records = list(build_rest_index(load(REST_SPEC).interface_list.rest_api_interface, 'example.com'))
+    assert records
+    for record in records:
+        assert record.url.startswith('https://example.com/')
+        assert record.expression.search(response) == jmespath.search(record.query, response)
@@ -0,0 +1,24 @@
+import inspect
+import pickle
+import warnings
+from dataclasses import is_dataclass
+
+from sgr_library.generated import communicator, functional_profile, generic, product
+from sgr_library.generic_interface import file_loader
+
+HOVAL_SPEC = 'xml_files/SGr_04_0017_xxxx_HOVAL_HeatPumpV0.2.1.xml'
+
+
+def test_generated_dataclasses_are_slotted():
+    classes = [value for package in (communicator, functional_profile, generic, product)
+               for value in vars(package).values() if inspect.isclass(value) and is_dataclass(value)]
+    assert len(classes) > 50
+    assert [cls.__qualname__ for cls in classes if '__slots__' not in vars(cls) or hasattr(cls(), '__dict__')] == []
+
+
+def test_slotted_frame_is_parsed_and_pickled():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        frame = file_loader(HOVAL_SPEC)
+    assert not hasattr(frame, '__dict__')
+    assert pickle.loads(pickle.dumps(frame)) == frame
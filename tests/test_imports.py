@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+import pytest
+
+MODBUS_TCP_SPEC = 'xml_files/SGr_02_4893879785_8288144069_SwiSBox_SubMeterElectricity_V1.0.0.xml'
+
+
+def loaded_modules(statement: str, modules: tuple[str, ...]) -> list[str]:
+    probe = f'import sys\n{statement}\nprint(" ".join(name for name in {modules!r} if name in sys.modules))'
+    return subprocess.run([sys.executable, '-c', probe], capture_output=True, text=True, check=True).stdout.split()
+
+
+@pytest.mark.parametrize('statement', [
+    'from sgr_library.modbus_interface import SgrModbusInterface',
+    'from sgr_library.generic_interface import GenericSGrDeviceBuilder\n'
+    f'GenericSGrDeviceBuilder().xml_file_path({MODBUS_TCP_SPEC!r}).build()',
+])
+def test_modbus_tcp_does_not_load_the_rest_dependencies(statement):
+    assert loaded_modules(statement, ('aiohttp', 'jmespath')) == []
+
+
+def test_rest_loads_its_dependencies():
+    statement = 'from sgr_library.restapi_client_async import SgrRestInterface'
+    assert loaded_modules(statement, ('aiohttp', 'jmespath')) == ['aiohttp', 'jmespath']
+
+
+@pytest.mark.parametrize('statement', ['import sgr_library', 'from sgr_library import SGrDevice'])
+def test_package_does_not_load_a_transport(statement):
+    assert loaded_modules(statement, ('pymodbus', 'aiohttp', 'jmespath', 'serial')) == []
+
+
+def test_package_attributes_are_loaded_on_access():
+    import sgr_library
+    from sgr_library.sgr_device import SGrDevice
+
+    assert sgr_library.SGrDevice is SGrDevice
+    assert sgr_library.generated.product.DeviceFrame is not None
+    with pytest.raises(AttributeError):
+        sgr_library.missing
@@ -0,0 +1,62 @@
+import jmespath
+import pytest
+
+from sgr_library.data_point_index import compile_query
+from sgr_library.generated.product import JmespathMapping, JmespathMappingRecord, ResponseQuery, ResponseQueryType
+from sgr_library.jmespath_mapping import CompiledMapping, compile_mapping, compile_rule
+
+RESPONSE = [
+    {'name': 'day', 'tariffs': [{'start': '06:00', 'value': 0.3}, {'start': '22:00', 'value': 0.2}]},
+    {'name': 'weekend', 'tariffs': [{'start': '00:00', 'value': 0.1}]},
+]
+
+
+def mapping(*records: tuple[str, str]) -> JmespathMapping:
+    return JmespathMapping([JmespathMappingRecord(from_value, to, f'record {index}')
+                            for index, (from_value, to) in enumerate(records)])
+
+
+def test_projections_keep_their_indices():
+    compiled = compile_mapping(mapping(('[*].tariffs[*].value', '[*].tariffs[*].price')))
+    assert compiled.search(RESPONSE) == [{'tariffs': [{'price': 0.3}, {'price': 0.2}]}, {'tariffs': [{'price': 0.1}]}]
+
+
+def test_rules_fill_the_same_table():
+    compiled = compile_mapping(mapping(('[*].name', '[*].profile'),
+                                       ('[*].tariffs[*].start', '[*].prices[*].from'),
+                                       ('[*].tariffs[*].value', '[*].prices[*].price.chf')))
+    assert compiled.search(RESPONSE) == [
+        {'profile': 'day',
+         'prices': [{'from': '06:00', 'price': {'chf': 0.3}}, {'from': '22:00', 'price': {'chf': 0.2}}]},
+        {'profile': 'weekend', 'prices': [{'from': '00:00', 'price': {'chf': 0.1}}]},
+    ]
+
+
+def test_without_projections():
+    compiled = compile_mapping(mapping(('data.total', 'sum'), ('data', 'raw')))
+    assert compiled.search({'data': {'total': 5}}) == {'sum': 5, 'raw': {'total': 5}}
+
+
+def test_nothing_selected():
+    compiled = compile_mapping(mapping(('[*].tariffs[*].value', '[*].prices[*].price')))
+    # the response is no list, the projection selects nothing
+    assert compiled.search({'tariffs': []}) is None
+
+
+def test_invalid_mappings():
+    with pytest.raises(ValueError, match='number of projections'):
+        compile_rule('[*].tariffs[*].value', '[*].price')
+    with pytest.raises(ValueError, match='needs a from and a to path'):
+        compile_mapping(mapping(('[*].value', None)))
+    with pytest.raises(ValueError, match='needs a from and a to path'):
+        compile_mapping(mapping(('', 'value')))
+    with pytest.raises(jmespath.exceptions.JMESPathError):
+        compile_mapping(mapping(('[*].value[', '[*].value')))
+
+
+def test_compile_query_compiles_mappings():
+    query = ResponseQuery(ResponseQueryType.JMESPATH_MAPPING, None,
+                          mapping(('[*].tariffs[*].value', '[*].tariffs[*].price')))
+    compiled = compile_query(query)
+    assert isinstance(compiled, CompiledMapping)
+    assert compiled.search(RESPONSE)[1] == {'tariffs': [{'price': 0.1}]}
@@ -0,0 +1,56 @@
+import warnings
+
+import pytest
+
+from sgr_library.api.lazy_mapping import LazyMapping, build_mapping
+from sgr_library.generic_interface import GenericSGrDeviceBuilder
+
+HOVAL_SPEC = 'xml_files/SGr_04_0017_xxxx_HOVAL_HeatPumpV0.2.1.xml'
+
+
+def test_values_are_built_once_on_first_access():
+    built = []
+
+    def build(element):
+        built.append(element)
+        return element * 2
+
+    mapping = build_mapping([1, 2, 3], str, build, lazy=True)
+    assert isinstance(mapping, LazyMapping)
+    assert list(mapping) == ['1', '2', '3']
+    assert len(mapping) == 3 and '2' in mapping
+    assert built == []
+    assert mapping['2'] == 4
+    assert mapping['2'] == 4
+    assert built == [2]
+    assert mapping.is_loaded('2') and not mapping.is_loaded('1')
+    with pytest.raises(KeyError):
+        mapping['4']
+
+    mapping.preload()
+    assert built == [2, 1, 3]
+    assert dict(mapping) == {'1': 2, '2': 4, '3': 6}
+
+
+def test_eager_mapping():
+    assert build_mapping([1, 2], str, lambda element: element * 2) == {'1': 2, '2': 4}
+
+
+def build(lazy: bool):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return GenericSGrDeviceBuilder().xml_file_path(HOVAL_SPEC).lazy(lazy).build()
+
+
+def test_lazy_device_matches_the_eager_one():
+    eager, lazy = build(False), build(True)
+    assert not lazy.get_function_profiles().is_loaded('PowerCtrl')
+    assert lazy.describe() == eager.describe()
+    assert lazy.get_data_point(('PowerCtrl', 'PowerCtrlStpt')).name() == ('PowerCtrl', 'PowerCtrlStpt')
+
+
+def test_preload_builds_everything():
+    device = build(True)
+    device.preload()
+    profiles = device.get_function_profiles()
+    assert all(profiles.is_loaded(name) for name in profiles)
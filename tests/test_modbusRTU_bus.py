@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+import pytest
+
+from sgr_library.modbusRTU_bus import ModbusRTUBus, ModbusRTUBusRegistry, inter_frame_gap
+
+
+class FakeSerialClient:
+    """
+    Stands in for SGrModbusRTUClient, records the transfers on the line.
+    """
+
+    def __init__(self):
+        self.connects = 0
+        self.transfers = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def connect(self):
+        self.connects += 1
+
+    async def read_registers(self, addr: int, size: int, register_type: str, slave_id: int) -> list[int]:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        start = time.monotonic()
+        await asyncio.sleep(0.001)
+        self.in_flight -= 1
+        self.transfers.append((slave_id, addr, start, time.monotonic()))
+        if addr < 0:
+            raise ValueError('illegal address')
+        return [addr] * size
+
+
+def test_inter_frame_gap():
+    assert inter_frame_gap(9600) == pytest.approx(3.5 * 11 / 9600)
+    assert inter_frame_gap(19200) == pytest.approx(3.5 * 11 / 19200)
+    assert inter_frame_gap(115200) == 0.00175
+
+
+def test_requests_are_transferred_one_at_a_time_with_a_gap():
+    client = FakeSerialClient()
+    bus = ModbusRTUBus('/dev/ttyUSB0', 'E', 9600, client)
+
+    async def read_all():
+        await bus.connect()
+        await bus.connect()
+        return await asyncio.gather(*(bus.read_registers(addr, 1, 'HoldRegister', 1) for addr in range(5)))
+
+    assert asyncio.run(read_all()) == [[addr] for addr in range(5)]
+    assert client.connects == 1
+    assert client.max_in_flight == 1
+    for previous, current in zip(client.transfers, client.transfers[1:]):
+        assert current[2] - previous[3] >= bus.gap * 0.99
+
+
+def test_slaves_are_served_round_robin():
+    client = FakeSerialClient()
+    bus = ModbusRTUBus('/dev/ttyUSB0', 'E', 115200, client)
+
+    async def read_all():
+        busy = [bus.read_registers(addr, 1, 'HoldRegister', 1) for addr in range(4)]
+        other = [bus.read_registers(addr, 1, 'HoldRegister', 2) for addr in range(2)]
+        await asyncio.gather(*busy, *other)
+
+    asyncio.run(read_all())
+    assert [slave_id for slave_id, *_ in client.transfers] == [1, 2, 1, 2, 1, 1]
+
+
+def test_errors_are_returned_to_the_caller():
+    client = FakeSerialClient()
+    bus = ModbusRTUBus('/dev/ttyUSB0', 'E', 115200, client)
+
+    async def read_all():
+        return await asyncio.gather(bus.read_registers(-1, 1, 'HoldRegister', 1),
+                                    bus.read_registers(3, 1, 'HoldRegister', 1), return_exceptions=True)
+
+    error, value = asyncio.run(read_all())
+    assert isinstance(error, ValueError)
+    assert value == [3]
+
+
+def test_registry_has_one_bus_per_port():
+    # the buses create their serial clients
+    pytest.importorskip('serial')
+    registry = ModbusRTUBusRegistry()
+    bus = registry.bus('/dev/ttyUSB0', 'E', 19200)
+    assert registry.bus('/dev/ttyUSB0', 'E', 19200) is bus
+    assert registry.bus('/dev/ttyUSB1', 'N', 9600) is not bus
+    assert len(registry.buses()) == 2
+    with pytest.raises(ValueError):
+        registry.bus('/dev/ttyUSB0', 'N', 19200)
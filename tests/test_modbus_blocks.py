@@ -0,0 +1,149 @@
+import asyncio
+
+from pymodbus.constants import Endian
+
+from sgr_library.generated.product import RegisterType, TimeSyncBlockNotification
+from sgr_library.modbus_blocks import BlockCache, BlockMember, plan_reads, plan_writes
+from sgr_library.modbus_codec import compile_codec
+
+INT16 = compile_codec('int16', 1, Endian.BIG, Endian.BIG)
+
+
+def member(name: str, address: int | None, size: int | None = 1, register_type: str | None = 'HoldRegister',
+           codec=INT16) -> BlockMember:
+    return BlockMember(('fp', name), register_type, address, size, codec)
+
+
+def spans(plan) -> list[tuple[str, int, int, list[str]]]:
+    return [(block.register_type, block.address, block.size, [m.key[1] for m in block.members])
+            for block in plan.blocks]
+
+
+def test_adjacent_members_share_a_block():
+    plan = plan_reads([member('b', 11, 2), member('a', 10), member('c', 13)])
+    assert spans(plan) == [('HoldRegister', 10, 4, ['a', 'b', 'c'])]
+    assert plan.keys == [('fp', 'b'), ('fp', 'a'), ('fp', 'c')]
+    assert plan.singles == []
+
+
+def test_gap_limit():
+    # 8 unused registers are read in between, 9 start a new block
+    plan = plan_reads([member('a', 0), member('b', 9), member('c', 19)])
+    assert spans(plan) == [('HoldRegister', 0, 10, ['a', 'b']), ('HoldRegister', 19, 1, ['c'])]
+    assert spans(plan_reads([member('a', 0), member('b', 9)], max_gap=0)) == \
+        [('HoldRegister', 0, 1, ['a']), ('HoldRegister', 9, 1, ['b'])]
+
+
+def test_size_limit():
+    plan = plan_reads([member('a', 0, 100), member('b', 100, 25), member('c', 125, 2)])
+    assert spans(plan) == [('HoldRegister', 0, 125, ['a', 'b']), ('HoldRegister', 125, 2, ['c'])]
+    assert max(block.size for block in plan_reads([member(str(i), i) for i in range(300)]).blocks) == 125
+
+
+def test_overlapping_members():
+    plan = plan_reads([member('a', 0, 4), member('b', 2, 1)])
+    assert spans(plan) == [('HoldRegister', 0, 4, ['a', 'b'])]
+
+
+def test_register_types_are_not_mixed():
+    plan = plan_reads([member('a', 0), member('b', 1, register_type='InputRegister')])
+    assert spans(plan) == [('HoldRegister', 0, 1, ['a']), ('InputRegister', 1, 1, ['b'])]
+
+
+def test_members_not_readable_in_a_block_are_singles():
+    singles = [member('coil', 0, register_type='Coil'), member('no address', None),
+               member('too large', 0, 126), member('no codec', 0, codec=None)]
+    plan = plan_reads(singles + [member('a', 0)])
+    assert plan.singles == singles
+    assert spans(plan) == [('HoldRegister', 0, 1, ['a'])]
+
+
+class Device:
+    """
+    Counts the block reads, each register holds its address.
+    """
+
+    def __init__(self):
+        self.reads = []
+
+    async def read_block(self, address: int, size: int, register_type: str) -> list[int]:
+        self.reads.append((address, size, register_type))
+        await asyncio.sleep(0)
+        return list(range(address, address + size))
+
+
+def block_cache(device: Device) -> BlockCache:
+    notifications = [
+        TimeSyncBlockNotification('status', 100, 10, RegisterType.INPUT_REGISTER, 1000),
+        # incomplete notifications are ignored
+        TimeSyncBlockNotification('incomplete', 200, None, RegisterType.INPUT_REGISTER, 1000),
+        # blocks without a time to live are not cached
+        TimeSyncBlockNotification('no ttl', 300, 10, RegisterType.INPUT_REGISTER, None),
+        TimeSyncBlockNotification('zero ttl', 400, 10, RegisterType.INPUT_REGISTER, 0),
+    ]
+    return BlockCache(notifications, device.read_block)
+
+
+def test_block_cache_serves_the_members_of_a_block():
+    cache = block_cache(Device())
+    assert cache.serves('status', 'InputRegister', 100, 10)
+    assert cache.serves('status', 'InputRegister', 105, 2)
+    assert not cache.serves('status', 'InputRegister', 109, 2)
+    # the same addresses in another register space
+    assert not cache.serves('status', 'HoldRegister', 105, 2)
+    assert not cache.serves('incomplete', 'InputRegister', 200, 1)
+    assert not cache.serves('no ttl', 'InputRegister', 300, 1)
+    assert not cache.serves('zero ttl', 'InputRegister', 400, 1)
+    assert not cache.serves(None, 'InputRegister', 100, 1)
+
+
+def test_block_cache_reads_a_block_once_per_time_to_live(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr('sgr_library.modbus_blocks.time.monotonic', lambda: now[0])
+    device = Device()
+    cache = block_cache(device)
+
+    async def read(address, size):
+        return await cache.read('status', address, size)
+
+    assert asyncio.run(read(102, 2)) == [102, 103]
+    now[0] = 0.999
+    assert asyncio.run(read(108, 1)) == [108]
+    assert device.reads == [(100, 10, 'InputRegister')]
+    now[0] = 1.0
+    asyncio.run(read(100, 1))
+    assert len(device.reads) == 2
+    cache.invalidate('status')
+    asyncio.run(read(100, 1))
+    assert len(device.reads) == 3
+
+
+def test_block_cache_concurrent_readers_share_one_read():
+    device = Device()
+    cache = block_cache(device)
+
+    async def read_all():
+        return await asyncio.gather(*(cache.read('status', address, 1) for address in range(100, 110)))
+
+    assert asyncio.run(read_all()) == [[address] for address in range(100, 110)]
+    assert len(device.reads) == 1
+
+
+def test_adjacent_holding_register_writes_are_merged():
+    blocks = plan_writes([(('fp', 'c'), 'HoldRegister', 12, [3]), (('fp', 'a'), 'HoldRegister', 10, [1]),
+                          (('fp', 'b'), 'HoldRegister', 11, [2]), (('fp', 'd'), 'HoldRegister', 14, [4])])
+    assert [(block.address, block.registers, [key[1] for key in block.keys]) for block in blocks] == \
+        [(10, [1, 2, 3], ['a', 'b', 'c']), (14, [4], ['d'])]
+
+
+def test_writes_are_merged_up_to_the_size_limit():
+    blocks = plan_writes([(('fp', str(address)), 'HoldRegister', address, [0] * 10) for address in range(0, 200, 10)],
+                         max_size=123)
+    assert [len(block.registers) for block in blocks] == [120, 80]
+
+
+def test_other_register_types_are_written_on_their_own():
+    blocks = plan_writes([(('fp', 'coil'), 'Coil', 0, [1]), (('fp', 'a'), 'HoldRegister', 0, [1]),
+                          (('fp', 'coil 2'), 'Coil', 1, [1])])
+    assert [(block.register_type, block.address) for block in blocks] == \
+        [('HoldRegister', 0), ('Coil', 0), ('Coil', 1)]
@@ -0,0 +1,99 @@
+import math
+
+import pytest
+from pymodbus.constants import Endian
+
+from sgr_library.modbus_codec import compile_codec, registers_to_bytes
+from sgr_library.payload_decoder import PayloadBuilder, PayloadDecoder, RoundingScheme
+
+ORDERS = [(byteorder, wordorder) for byteorder in (Endian.BIG, Endian.LITTLE)
+          for wordorder in (Endian.BIG, Endian.LITTLE)]
+
+REGISTERS = {
+    1: [[0x0000], [0x7FFF], [0x8001], [0xFFFF], [0x12AB]],
+    2: [[0x0000, 0x0001], [0x8000, 0x0000], [0x4049, 0x0FDB], [0xFFFF, 0xFFFE], [0x1234, 0xABCD]],
+    4: [[0x0000, 0x0000, 0x0000, 0x0001], [0x4009, 0x21FB, 0x5444, 0x2D18], [0xFFFF, 0xFFFF, 0xFFFF, 0xFFFF],
+        [0x0123, 0x4567, 0x89AB, 0xCDEF]],
+}
+
+TYPES = {'int8': 1, 'int8_u': 1, 'int16': 1, 'int16_u': 1, 'int32': 2, 'int32_u': 2, 'float32': 2, 'int64': 4,
+         'int64_u': 4, 'float64': 4}
+
+INTEGER_VALUES = {
+    'int16': [0, 1, -1, 32767, -32768], 'int16_u': [0, 1, 65535, 4660],
+    'int32': [0, -1, 2 ** 31 - 1, -2 ** 31, 123456], 'int32_u': [0, 2 ** 32 - 1, 123456],
+    'int64': [0, -1, 2 ** 63 - 1, -2 ** 63], 'int64_u': [0, 2 ** 64 - 1, 81985529216486895],
+}
+
+
+def same(a, b) -> bool:
+    return a == b or (isinstance(a, float) and math.isnan(a) and math.isnan(b))
+
+
+@pytest.mark.parametrize('byteorder, wordorder', ORDERS)
+@pytest.mark.parametrize('data_type, count', TYPES.items())
+def test_decode_like_the_payload_decoder(data_type, count, byteorder, wordorder):
+    codec = compile_codec(data_type, count, byteorder, wordorder)
+    for registers in REGISTERS[count]:
+        expected = PayloadDecoder.fromRegisters(registers, byteorder=byteorder, wordorder=wordorder) \
+            .decode(data_type, count * 2)
+        assert same(codec.decode(registers), expected), registers
+
+
+@pytest.mark.parametrize('byteorder, wordorder', ORDERS)
+@pytest.mark.parametrize('data_type, values', INTEGER_VALUES.items())
+def test_encode_like_the_payload_builder(data_type, values, byteorder, wordorder):
+    codec = compile_codec(data_type, TYPES[data_type], byteorder, wordorder)
+    for value in values:
+        expected = PayloadBuilder(byteorder=byteorder, wordorder=wordorder) \
+            .sgr_encode(value, data_type, RoundingScheme.floor).to_registers()
+        assert codec.encode(value) == expected, value
+        assert codec.decode(expected) == value
+
+
+def test_decode_from_a_shared_buffer():
+    codec = compile_codec('int32', 2, Endian.BIG, Endian.LITTLE)
+    buffer = registers_to_bytes([0xFFFF, 0x0001, 0x0000, 0xFFFF, 0xFFFF])
+    assert codec.decode_from(buffer, 1) == 1
+    assert codec.decode_from(buffer, 3) == -1
+
+
+@pytest.mark.parametrize('data_type, count', [('float32', 2), ('float64', 4)])
+def test_floats_are_not_rounded(data_type, count):
+    codec = compile_codec(data_type, count, Endian.BIG, Endian.BIG)
+    registers = codec.encode(21.5)
+    assert codec.decode(registers) == 21.5
+    # the payload decoder reads the same value
+    assert PayloadDecoder.fromRegisters(registers, byteorder=Endian.BIG, wordorder=Endian.BIG) \
+        .decode(data_type, count * 2) == 21.5
+    # unlike the payload builder, which floored values written to float registers
+    floored = PayloadBuilder(byteorder=Endian.BIG, wordorder=Endian.BIG) \
+        .sgr_encode(21.5, data_type, RoundingScheme.floor).to_registers()
+    assert codec.decode(floored) == 21.0
+    assert codec.encode(21.5, RoundingScheme.floor) == registers
+
+
+def test_rounding_of_integer_registers():
+    codec = compile_codec('int16', 1, Endian.BIG, Endian.BIG)
+    assert codec.encode(2.5) == [2]
+    assert codec.encode(2.5, RoundingScheme.ceil) == [3]
+    assert codec.encode(-2.5, RoundingScheme.floor) == [0xFFFD]
+
+
+def test_string_boolean_and_unknown_types():
+    string = compile_codec('string', 3, Endian.BIG, Endian.BIG)
+    assert string.decode(string.encode('abc')) == 'abc'
+    assert string.encode('ab') == [0x6162, 0x0000, 0x0000]
+
+    boolean = compile_codec('boolean', 1, Endian.BIG, Endian.BIG, true_value=2, false_value=1)
+    assert boolean.decode([2]) is True
+    assert boolean.decode([1]) is False
+    assert boolean.encode(True) == [2]
+    assert boolean.encode(False) == [1]
+
+    with pytest.raises(ValueError):
+        compile_codec('date_time', 4, Endian.BIG, Endian.BIG).decode([0, 0, 0, 0])
+
+
+def test_codecs_are_shared():
+    assert compile_codec('int16', 1, Endian.BIG, Endian.BIG) is compile_codec('int16', 1, Endian.BIG, Endian.BIG)
@@ -0,0 +1,87 @@
+import asyncio
+import warnings
+
+import pytest
+
+from sgr_library.exceptions import RegisterError
+from sgr_library.generic_interface import GenericSGrDeviceBuilder
+
+HOVAL_SPEC = 'xml_files/SGr_04_0017_xxxx_HOVAL_HeatPumpV0.2.1.xml'
+
+
+class FakeClient:
+    """
+    Stands in for SGrModbusClient and records the reads and writes, reads of unmapped registers are refused.
+    """
+
+    def __init__(self, unmapped: tuple[int, ...] = ()):
+        self.unmapped = unmapped
+        self.reads = []
+        self.writes = []
+
+    async def read_registers(self, addr: int, size: int, register_type: str, slave_id: int) -> list[int]:
+        self.reads.append((addr, size))
+        if any(addr <= address < addr + size for address in self.unmapped):
+            raise RegisterError('Exception response, function code 3, exception code 2')
+        return list(range(addr, addr + size))
+
+    async def write_registers(self, addr: int, registers: list[int], slave_id: int):
+        self.writes.append((addr, registers))
+
+
+@pytest.fixture
+def hoval():
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        device = GenericSGrDeviceBuilder().xml_file_path(HOVAL_SPEC).build()
+    device.client = FakeClient()
+    return device
+
+
+def test_write_many_merges_adjacent_registers(hoval):
+    asyncio.run(hoval.write_many({
+        ('HeatCoolCtrl_2', 'SupplyWaterTempStpt'): 21,
+        ('DomHotWaterCtrl', 'DomHotWTempStptComf'): 50,
+        ('HeatCoolCtrl_1', 'SupplyWaterTempStpt'): 20,
+        ('HeatCoolCtrl_3', 'SupplyWaterTempStpt'): -1,
+    }))
+    assert hoval.client.writes == [(1487, [20, 21, 0xFFFF]), (1497, [50])]
+
+
+def test_write_many_encodes_all_values_first(hoval):
+    # the second value does not fit into its register, the first one is not written either
+    with pytest.raises(Exception):
+        asyncio.run(hoval.write_many({
+            ('HeatCoolCtrl_1', 'SupplyWaterTempStpt'): 20,
+            ('HeatCoolCtrl_2', 'SupplyWaterTempStpt'): 2 ** 20,
+        }))
+    assert hoval.client.writes == []
+
+
+def test_refused_block_is_split_once(hoval):
+    # the block at 18722 spans the unmapped registers 18723 and 18727 to 18730
+    hoval.client = FakeClient(unmapped=(18723, 18727))
+    first = asyncio.run(hoval.read_data_concurrent())
+    assert (18722, 13) in hoval.client.reads
+    assert {(18722, 1), (18724, 3), (18731, 4)} <= set(hoval.client.reads)
+    assert not any(isinstance(error, RegisterError) for error in first.errors.values())
+
+    hoval.client.reads = []
+    second = asyncio.run(hoval.read_data_concurrent())
+    # later polls read the split blocks right away
+    assert (18722, 13) not in hoval.client.reads
+    assert {(18722, 1), (18724, 3), (18731, 4)} <= set(hoval.client.reads)
+    assert second.values.keys() == first.values.keys()
+    assert second.values[('PowerCtrl', 'ActSpeed')] == first.values[('PowerCtrl', 'ActSpeed')]
+
+
+def test_refused_block_without_gaps_is_read_by_data_point(hoval):
+    hoval.client = FakeClient(unmapped=(19611,))
+    for _ in range(2):
+        hoval.client.reads = []
+        result = asyncio.run(hoval.read_data_concurrent())
+        assert isinstance(result.errors[('HeatCoolCtrl_2', 'ReturnSupplyWaterTemp')], RegisterError)
+        assert ('HeatCoolCtrl_1', 'ReturnSupplyWaterTemp') not in result.errors
+        assert ('HeatCoolCtrl_3', 'ReturnSupplyWaterTemp') not in result.errors
+    assert {(19610, 1), (19611, 1), (19612, 1)} <= set(hoval.client.reads)
+    assert (19610, 3) not in hoval.client.reads
@@ -0,0 +1,267 @@
+import asyncio
+import configparser
+import struct
+import warnings
+
+import pytest
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.exceptions import ConnectionException
+
+from sgr_library.exceptions import RegisterError
+from sgr_library.generic_interface import GenericSGrDeviceBuilder
+from sgr_library.modbus_client import SGrModbusClient
+from sgr_library.modbus_tcp_connection import DEFAULT_MAX_IN_FLIGHT, DEFAULT_TIMEOUT, ModbusTcpConnection, \
+    ModbusTcpConnectionRegistry, connection_options
+
+MBAP_HEADER = struct.Struct('>HHHB')
+
+MODBUS_SPEC = 'xml_files/SGr_02_4893879785_8288144069_SwiSBox_SubMeterElectricity_V1.0.0.xml'
+
+
+def frame(transaction_id: int, unit_id: int, pdu: bytes) -> bytes:
+    return MBAP_HEADER.pack(transaction_id, 0, len(pdu) + 1, unit_id) + pdu
+
+
+def registers(pdu: bytes) -> bytes:
+    """
+    The response to a read request, each register holds its address.
+    """
+    function_code, addr, size = struct.unpack('>BHH', pdu)
+    return struct.pack(f'>BB{size}H', function_code, 2 * size, *range(addr, addr + size))
+
+
+async def answer(server, writer, transaction_id, unit_id, pdu):
+    writer.write(frame(transaction_id, unit_id, registers(pdu)))
+
+
+class FakeServer:
+    """
+    A Modbus TCP server on localhost, handler is called with each request.
+    """
+
+    def __init__(self, handler=answer):
+        self.handler = handler
+        self.connections = 0
+        self.requests = []
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        try:
+            while True:
+                transaction_id, _, length, unit_id = MBAP_HEADER.unpack(await reader.readexactly(MBAP_HEADER.size))
+                pdu = await reader.readexactly(length - 1)
+                self.requests.append((transaction_id, unit_id, pdu))
+                if await self.handler(self, writer, transaction_id, unit_id, pdu) is False:
+                    break
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        writer.close()
+
+    def run(self, test, timeout: float = DEFAULT_TIMEOUT):
+        async def main():
+            server = await asyncio.start_server(self._serve, '127.0.0.1', 0)
+            connection = ModbusTcpConnection('127.0.0.1', server.sockets[0].getsockname()[1], timeout)
+            try:
+                return await test(connection)
+            finally:
+                await connection.close()
+                server.close()
+
+        return asyncio.run(main())
+
+
+def test_read_registers():
+    server = FakeServer()
+
+    async def test(connection):
+        return await connection.read_registers(100, 3, 'HoldRegister', 7)
+
+    assert server.run(test) == [100, 101, 102]
+    assert server.requests == [(1, 7, struct.pack('>BHH', 3, 100, 3))]
+
+
+def test_write_registers():
+    async def handler(server, writer, transaction_id, unit_id, pdu):
+        writer.write(frame(transaction_id, unit_id, pdu[:5]))
+
+    server = FakeServer(handler)
+
+    async def test(connection):
+        await connection.write_registers(10, [1, 2], 1)
+
+    server.run(test)
+    assert server.requests[0][2] == struct.pack('>BHHB2H', 0x10, 10, 2, 4, 1, 2)
+
+
+def test_exception_response():
+    async def handler(server, writer, transaction_id, unit_id, pdu):
+        # illegal data address
+        writer.write(frame(transaction_id, unit_id, bytes([pdu[0] | 0x80, 2])))
+
+    async def test(connection):
+        with pytest.raises(RegisterError, match='exception code 2'):
+            await connection.read_registers(0, 1, 'InputRegister', 1)
+
+    FakeServer(handler).run(test)
+
+
+def test_responses_are_matched_by_transaction_id():
+    async def handler(server, writer, transaction_id, unit_id, pdu):
+        # a stale response nobody waits for, then the responses of both requests in reverse order
+        if len(server.requests) == 2:
+            writer.write(frame(0x1234, unit_id, registers(pdu)))
+            for transaction_id, unit_id, pdu in reversed(server.requests):
+                writer.write(frame(transaction_id, unit_id, registers(pdu)))
+
+    async def test(connection):
+        return await asyncio.gather(connection.read_registers(1, 2, 'HoldRegister', 1),
+                                    connection.read_registers(50, 1, 'HoldRegister', 1))
+
+    assert FakeServer(handler).run(test) == [[1, 2], [50]]
+
+
+def test_partial_frames():
+    async def handler(server, writer, transaction_id, unit_id, pdu):
+        for byte in frame(transaction_id, unit_id, registers(pdu)):
+            writer.write(bytes([byte]))
+            await writer.drain()
+            await asyncio.sleep(0)
+
+    async def test(connection):
+        return await connection.read_registers(7, 4, 'HoldRegister', 1)
+
+    assert FakeServer(handler).run(test) == [7, 8, 9, 10]
+
+
+def test_reconnects_after_the_connection_was_lost():
+    async def handler(server, writer, transaction_id, unit_id, pdu):
+        if server.connections == 1:
+            return False
+        await answer(server, writer, transaction_id, unit_id, pdu)
+
+    server = FakeServer(handler)
+
+    async def test(connection):
+        with pytest.raises(ConnectionException):
+            await connection.read_registers(0, 1, 'HoldRegister', 1)
+        assert not connection.connected
+        return await connection.read_registers(0, 1, 'HoldRegister', 1)
+
+    assert server.run(test) == [0]
+    assert server.connections == 2
+
+
+def test_timeout_keeps_the_connection():
+    async def handler(server, writer, transaction_id, unit_id, pdu):
+        if len(server.requests) == 1:
+            return
+        await answer(server, writer, transaction_id, unit_id, pdu)
+
+    server = FakeServer(handler)
+
+    async def test(connection):
+        with pytest.raises(asyncio.TimeoutError):
+            await connection.read_registers(0, 1, 'HoldRegister', 1)
+        return await connection.read_registers(5, 1, 'HoldRegister', 1)
+
+    assert server.run(test, timeout=0.05) == [5]
+    assert server.connections == 1
+
+
+def test_invalid_mbap_length_drops_the_connection():
+    async def handler(server, writer, transaction_id, unit_id, pdu):
+        if server.connections == 1:
+            # a length without function code, followed by a valid response
+            writer.write(MBAP_HEADER.pack(transaction_id, 0, 1, unit_id))
+        await answer(server, writer, transaction_id, unit_id, pdu)
+
+    server = FakeServer(handler)
+
+    async def test(connection):
+        with pytest.raises(ConnectionException):
+            await connection.read_registers(0, 1, 'HoldRegister', 1)
+        return await connection.read_registers(3, 1, 'HoldRegister', 1)
+
+    assert server.run(test) == [3]
+    assert server.connections == 2
+
+
+@pytest.mark.parametrize('response', [bytes([0x83]), bytes([0x03, 4, 0]), bytes([0x03])])
+def test_truncated_responses(response):
+    async def handler(server, writer, transaction_id, unit_id, pdu):
+        if len(server.requests) == 1:
+            writer.write(frame(transaction_id, unit_id, response))
+        else:
+            await answer(server, writer, transaction_id, unit_id, pdu)
+
+    server = FakeServer(handler)
+
+    async def test(connection):
+        with pytest.raises(RegisterError):
+            await connection.read_registers(0, 2, 'HoldRegister', 1)
+        return await connection.read_registers(8, 1, 'HoldRegister', 1)
+
+    assert server.run(test) == [8]
+    assert server.connections == 1
+
+
+def test_closing_the_interface_releases_its_connection():
+    server = FakeServer()
+    registry = ModbusTcpConnectionRegistry()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        device = GenericSGrDeviceBuilder().xml_file_path(MODBUS_SPEC).build()
+
+    async def main():
+        listener = await asyncio.start_server(server._serve, '127.0.0.1', 0)
+        port = listener.sockets[0].getsockname()[1]
+        device.client = SGrModbusClient('127.0.0.1', port, registry)
+        async with device:
+            connection = device.client.connection
+            assert registry.users('127.0.0.1', port) == 1
+            assert await device.getval('ActiveEnergyAC', 'ActiveEnergyACtot') is not None
+        assert registry.users('127.0.0.1', port) == 0
+        assert not connection.connected
+        listener.close()
+
+    asyncio.run(main())
+
+
+def test_registry_shares_connections():
+    registry = ModbusTcpConnectionRegistry()
+    connection = registry.acquire('127.0.0.1', 502, timeout=1.0, max_in_flight=4)
+    assert registry.acquire('127.0.0.1', '502', timeout=3.0) is connection
+    assert registry.acquire('127.0.0.1', 503) is not connection
+    assert registry.users('127.0.0.1', 502) == 2
+    assert connection.timeout == 3.0
+
+    asyncio.run(registry.release(connection))
+    assert registry.acquire('127.0.0.1', 502) is connection
+    asyncio.run(registry.release(connection))
+    asyncio.run(registry.release(connection))
+    assert registry.users('127.0.0.1', 502) == 0
+    assert registry.acquire('127.0.0.1', 502) is not connection
+
+
+def test_connection_options():
+    config = configparser.ConfigParser()
+    assert connection_options(config) == {'timeout': DEFAULT_TIMEOUT, 'max_in_flight': DEFAULT_MAX_IN_FLIGHT}
+    config.read_dict({'MODBUS_TCP': {'timeout': '2.5', 'max_in_flight': '1'}})
+    assert connection_options(config) == {'timeout': 2.5, 'max_in_flight': 1}
+
+
+def test_client_timeout_and_deprecated_client():
+    registry = ModbusTcpConnectionRegistry()
+    client = SGrModbusClient('127.0.0.1', 1502, registry, timeout=4.0, max_in_flight=2)
+
+    async def legacy_client():
+        # the pymodbus client is created in a running loop
+        return client.client
+
+    with pytest.warns(DeprecationWarning):
+        legacy = asyncio.run(legacy_client())
+    assert isinstance(legacy, AsyncModbusTcpClient)
+    with pytest.warns(DeprecationWarning):
+        assert client.client is legacy
+    assert registry.acquire('127.0.0.1', 1502, client.timeout, client.max_in_flight).timeout == 4.0
@@ -0,0 +1,61 @@
+import asyncio
+import gc
+import types
+import warnings
+
+from sgr_library.generated.product import DeviceFrame, ModbusDataPoint
+from sgr_library.generic_interface import GenericSGrDeviceBuilder
+
+HOVAL_SPEC = 'xml_files/SGr_04_0017_xxxx_HOVAL_HeatPumpV0.2.1.xml'
+
+
+class FakeClient:
+    async def read_registers(self, address: int, size: int, register_type: str, slave_id: int) -> list[int]:
+        return [0] * size
+
+
+def build(compact: bool):
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return GenericSGrDeviceBuilder().xml_file_path(HOVAL_SPEC).lazy().compact(compact).build()
+
+
+def test_compact_device_releases_the_frame():
+    device = build(True)
+    assert device.is_frame_released()
+    assert device._frame is None
+    assert all(device.get_function_profiles().is_loaded(name) for name in device.get_function_profiles())
+
+
+def test_released_frame_is_loaded_again_on_access():
+    compact, full = build(True), build(False)
+    assert not full.is_frame_released()
+    assert compact.root == full.root
+    assert compact.root is not compact.root
+    assert compact.describe() == full.describe()
+
+
+def reachable(root) -> list:
+    """
+    The objects reachable from root, without following modules, classes and module globals.
+    """
+    seen, pending, found = {id(root)}, [root], []
+    while pending:
+        obj = pending.pop()
+        found.append(obj)
+        for referent in gc.get_referents(obj):
+            if isinstance(referent, (types.ModuleType, type)) or id(referent) in seen \
+                    or (isinstance(referent, dict) and '__builtins__' in referent):
+                continue
+            seen.add(id(referent))
+            pending.append(referent)
+    return found
+
+
+def test_the_frame_is_not_referenced_by_the_runtime_model():
+    device = build(True)
+    assert not any(isinstance(obj, (DeviceFrame, ModbusDataPoint)) for obj in reachable(device))
+
+    device.client = FakeClient()
+    values = asyncio.run(device.read_data_concurrent())
+    assert ('PowerCtrl', 'PowerCtrlStpt') in values.values
@@ -0,0 +1,142 @@
+import asyncio
+import configparser
+from types import SimpleNamespace
+
+import pytest
+
+from sgr_library.generated.generic import Units
+from sgr_library.response_cache import ResponseCache, build_response_cache, configured_max_age, max_age_attribute
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Service:
+    def __init__(self):
+        self.calls = 0
+        self.error: Exception | None = None
+
+    async def fetch(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.calls
+
+
+def config(options: dict) -> configparser.ConfigParser:
+    parser = configparser.ConfigParser()
+    parser.read_dict({'RESTAPI_CACHE': options})
+    return parser
+
+
+def test_fresh_responses_are_served_from_the_cache():
+    clock, service = Clock(), Service()
+    cache = ResponseCache(max_age=5.0, clock=clock)
+
+    async def run():
+        first = await cache.get('a', service.fetch)
+        clock.now = 4.9
+        second = await cache.get('a', service.fetch)
+        # a reader with a shorter max age refreshes the response
+        third = await cache.get('a', service.fetch, max_age=1.0)
+        clock.now = 10.0
+        fourth = await cache.get('a', service.fetch)
+        return first, second, third, fourth
+
+    assert asyncio.run(run()) == (1, 1, 2, 3)
+
+
+def test_stale_while_revalidate():
+    clock, service = Clock(), Service()
+    cache = ResponseCache(max_age=5.0, stale_while_revalidate=10.0, clock=clock)
+
+    async def run():
+        await cache.get('a', service.fetch)
+        clock.now = 6.0
+        # the stale response is returned at once and refreshed in the background, once
+        stale = [await cache.get('a', service.fetch) for _ in range(3)]
+        await asyncio.sleep(0)
+        return stale, await cache.get('a', service.fetch)
+
+    assert asyncio.run(run()) == ([1, 1, 1], 2)
+    assert service.calls == 2
+
+
+def test_expired_responses_are_fetched():
+    clock, service = Clock(), Service()
+    cache = ResponseCache(max_age=5.0, stale_while_revalidate=10.0, clock=clock)
+
+    async def run():
+        await cache.get('a', service.fetch)
+        clock.now = 15.0
+        return await cache.get('a', service.fetch)
+
+    assert asyncio.run(run()) == 2
+
+
+def test_failed_background_refresh_keeps_the_stale_response():
+    clock, service = Clock(), Service()
+    cache = ResponseCache(max_age=5.0, stale_while_revalidate=10.0, clock=clock)
+
+    async def run():
+        await cache.get('a', service.fetch)
+        service.error = ConnectionError('down')
+        clock.now = 6.0
+        stale = await cache.get('a', service.fetch)
+        await asyncio.sleep(0)
+        clock.now = 7.0
+        stale_again = await cache.get('a', service.fetch)
+        clock.now = 16.0
+        with pytest.raises(ConnectionError):
+            await cache.get('a', service.fetch)
+        return stale, stale_again
+
+    assert asyncio.run(run()) == (1, 1)
+
+
+def test_least_recently_used_responses_are_evicted():
+    clock, service = Clock(), Service()
+    cache = ResponseCache(max_entries=2, clock=clock)
+
+    async def run():
+        await cache.get('a', service.fetch)
+        await cache.get('b', service.fetch)
+        await cache.get('a', service.fetch)
+        await cache.get('c', service.fetch)
+        return await cache.get('a', service.fetch), await cache.get('b', service.fetch)
+
+    assert asyncio.run(run()) == (1, 4)
+    assert len(cache) == 2
+
+
+def test_cache_options_from_the_configuration():
+    cache = build_response_cache(config({'max_age': '10', 'stale_while_revalidate': '60', 'max_entries': '3'}))
+    assert (cache.max_age, cache.stale_while_revalidate, cache.max_entries) == (10.0, 60.0, 3)
+    default = build_response_cache(configparser.ConfigParser())
+    assert (default.max_age, default.stale_while_revalidate, default.max_entries) == (5.0, 0.0, 100)
+
+
+def test_configured_max_age():
+    options = config({'max_age.EnergyMonitor': '30', 'max_age.EnergyMonitor.ActivePowerAC': '2'})
+    assert configured_max_age(options, 'EnergyMonitor', 'ActivePowerAC') == 2.0
+    assert configured_max_age(options, 'EnergyMonitor', 'VoltageAC') == 30.0
+    assert configured_max_age(options, 'Other', 'VoltageAC') is None
+    assert configured_max_age(configparser.ConfigParser(), 'EnergyMonitor', 'VoltageAC') is None
+
+
+def test_max_age_attribute():
+    def attributes(*elements):
+        return SimpleNamespace(generic_attribute_list_element=list(elements))
+
+    def attribute(name, value, unit=None):
+        return SimpleNamespace(name=name, value=value, unit=unit)
+
+    assert max_age_attribute(None) is None
+    assert max_age_attribute(attributes(attribute('Other', '1'), attribute('MaxAge', '3'))) == 3.0
+    assert max_age_attribute(attributes(attribute('MaxAge', '2', Units.MINUTES))) == 120.0
+    assert max_age_attribute(attributes(attribute('MaxAge', 'soon'))) is None
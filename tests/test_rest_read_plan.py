@@ -0,0 +1,30 @@
+from sgr_library.data_point_index import RestDataPointRecord
+from sgr_library.generated.product import HttpMethod
+from sgr_library.rest_read_plan import plan_rest_reads
+
+
+def record(dp_name: str, url: str = 'https://host/a', method: HttpMethod | None = HttpMethod.GET,
+           body: str | None = None, headers: dict | None = None) -> RestDataPointRecord:
+    return RestDataPointRecord('fp', dp_name, method, url, None, None, headers or {'Accept': 'json'}, body)
+
+
+def groups(plan) -> list[tuple[str, list[str], float]]:
+    return [(group.url, [member.dp_name for member in group.records], group.max_age) for group in plan.groups]
+
+
+def test_data_points_of_one_service_call_share_a_request():
+    records = [record('a'), record('b', 'https://host/b'), record('c')]
+    plan = plan_rest_reads(records, {('fp', 'a'): 5.0, ('fp', 'b'): 5.0, ('fp', 'c'): 1.0})
+    assert plan.keys == [('fp', 'a'), ('fp', 'b'), ('fp', 'c')]
+    # the response has to be fresh for the member with the smallest max age
+    assert groups(plan) == [('https://host/a', ['a', 'c'], 1.0), ('https://host/b', ['b'], 5.0)]
+
+
+def test_method_body_and_headers_separate_requests():
+    records = [record('get'), record('post', method=HttpMethod.POST, body='x'),
+               record('other body', method=HttpMethod.POST, body='y'), record('other headers', headers={'Accept': 'xml'}),
+               record('same post', method=HttpMethod.POST, body='x')]
+    plan = plan_rest_reads(records, {key: 5.0 for key in (('fp', r.dp_name) for r in records)})
+    assert [[member.dp_name for member in group.records] for group in plan.groups] == \
+        [['get'], ['post', 'same post'], ['other body'], ['other headers']]
+    assert [(group.method, group.body) for group in plan.groups][:2] == [(HttpMethod.GET, None), (HttpMethod.POST, 'x')]
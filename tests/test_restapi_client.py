@@ -0,0 +1,139 @@
+import asyncio
+import configparser
+from pathlib import Path
+
+import pytest
+from aiohttp import ClientConnectionError
+
+from sgr_library.api.read_result import read_concurrently
+from sgr_library.generated.product import HttpMethod
+from sgr_library.generic_interface import file_loader
+from sgr_library.restapi_client_async import SgrRestInterface
+
+SPEC = Path(__file__).parent.parent / 'xml_files' / 'SGr_04_mmmm_dddd_CLEMAPEnergyMonitorEIV0.2.1.xml'
+
+PHASES = {f'{name}_l{phase}': float(phase) for name in ('p', 'q', 'avg_energy', 'v', 'i', 's', 'pf')
+          for phase in (1, 2, 3)}
+RESPONSE = [{'ten_sec': PHASES, 'one_min': PHASES}]
+
+
+def service_call(frame, fp_index: int, dp_index: int):
+    fp = frame.interface_list.rest_api_interface.functional_profile_list.functional_profile_list_element[fp_index]
+    dp = fp.data_point_list.data_point_list_element[dp_index]
+    return (fp.functional_profile.functional_profile_name, dp.data_point.data_point_name), \
+        dp.rest_api_data_point_configuration.rest_api_service_call
+
+
+def run(frame, test, config: dict | None = None):
+    """
+    Builds the interface within an event loop, the requests are recorded instead of being sent.
+    """
+
+    async def main():
+        parser = configparser.ConfigParser()
+        parser.read_dict(config or {})
+        interface = SgrRestInterface(frame, parser)
+        requests = []
+
+        async def send(method, url, headers, body):
+            requests.append((method, url, headers, body))
+            await asyncio.sleep(0)
+            return RESPONSE
+
+        interface._send = send
+        try:
+            return await test(interface, requests)
+        finally:
+            await interface.close()
+
+    return asyncio.run(main())
+
+
+def test_read_data_sends_one_request_per_service_call():
+    async def test(interface, requests):
+        values = await interface.read_data()
+        assert len(values) == 28
+        assert len(requests) == 2
+        assert all(method == 'GET' and body is None for method, _, _, body in requests)
+
+    run(file_loader(str(SPEC)), test)
+
+
+def test_method_and_body_of_the_service_call_are_sent():
+    frame = file_loader(str(SPEC))
+    key, call = service_call(frame, 0, 1)
+    call.request_method = HttpMethod.POST
+    call.request_body = '{"window": "ten_sec"}'
+
+    async def test(interface, requests):
+        assert await interface.getval(*key) == 1.0
+        assert requests[-1][0] == 'POST'
+        assert requests[-1][3] == '{"window": "ten_sec"}'
+        # the POST data point is read from its cached response, the GET data points of the same url are not
+        await interface.read_data()
+        assert len(interface._read_plan.groups) == 3
+        assert [(method, body) for method, _, _, body in requests[1:]] == [('GET', None), ('GET', None)]
+
+    run(frame, test)
+
+
+def test_data_points_with_different_bodies_are_not_grouped():
+    frame = file_loader(str(SPEC))
+    first, first_call = service_call(frame, 0, 1)
+    second, second_call = service_call(frame, 0, 2)
+    first_call.request_body = 'a'
+    second_call.request_body = 'b'
+
+    async def test(interface, requests):
+        await interface.read_many([first, second])
+        assert sorted(body for _, _, _, body in requests) == ['a', 'b']
+
+    run(frame, test)
+
+
+def test_responses_are_not_shared_between_tokens():
+    frame = file_loader(str(SPEC))
+    key, _ = service_call(frame, 0, 1)
+
+    async def test(interface, requests):
+        interface.token = 'first'
+        await interface.getval(*key)
+        await interface.getval(*key)
+        interface.token = 'second'
+        await interface.getval(*key)
+        assert [headers['Authorization'] for _, _, headers, _ in requests] == ['Bearer first', 'Bearer second']
+
+    run(frame, test)
+
+
+def test_failed_reads_report_the_original_error():
+    frame = file_loader(str(SPEC))
+    key, _ = service_call(frame, 0, 1)
+
+    async def test(interface, requests):
+        async def send(method, url, headers, body):
+            raise ClientConnectionError('gateway down')
+
+        interface._send = send
+        result = await interface.read_data_concurrent()
+        assert len(result.errors) == 28
+        assert all(isinstance(error, ClientConnectionError) for error in result.errors.values())
+        result = await read_concurrently([interface.get_data_point(key)], None)
+        assert isinstance(result.errors[key], ClientConnectionError)
+        assert await interface.getval(*key) is None
+
+    run(frame, test)
+
+
+def test_writes_are_rejected():
+    frame = file_loader(str(SPEC))
+    key, _ = service_call(frame, 0, 1)
+
+    async def test(interface, requests):
+        with pytest.raises(NotImplementedError):
+            await interface.write_many({key: 1.0})
+        with pytest.raises(NotImplementedError):
+            await interface.get_data_point(key).write(1.0)
+        assert requests == []
+
+    run(frame, test)
@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from sgr_library.single_flight import SingleFlight
+
+
+class Service:
+    def __init__(self, error: Exception | None = None):
+        self.calls = 0
+        self.error = error
+
+    async def request(self):
+        self.calls += 1
+        call = self.calls
+        await asyncio.sleep(0.001)
+        if self.error is not None:
+            raise self.error
+        return call
+
+
+def test_concurrent_requests_are_coalesced():
+    service = Service()
+    flight = SingleFlight()
+
+    async def run():
+        results = await asyncio.gather(*(flight.do('a', service.request) for _ in range(5)),
+                                       flight.do('b', service.request))
+        return results, flight.pending()
+
+    results, pending = asyncio.run(run())
+    assert results == [1, 1, 1, 1, 1, 2]
+    assert service.calls == 2
+    assert pending == 0
+
+
+def test_completed_requests_are_not_cached():
+    service = Service()
+    flight = SingleFlight()
+
+    async def run():
+        return await flight.do('a', service.request), await flight.do('a', service.request)
+
+    assert asyncio.run(run()) == (1, 2)
+
+
+def test_errors_are_raised_to_all_callers():
+    service = Service(ConnectionError('down'))
+    flight = SingleFlight()
+
+    async def run():
+        return await asyncio.gather(*(flight.do('a', service.request) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(result is service.error for result in results)
+    assert service.calls == 1
+
+
+def test_a_cancelled_caller_does_not_cancel_the_others():
+    service = Service()
+    flight = SingleFlight()
+
+    async def run():
+        first = asyncio.create_task(flight.do('a', service.request))
+        second = asyncio.create_task(flight.do('a', service.request))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(run()) == 1
+    assert service.calls == 1
@@ -0,0 +1,75 @@
+import configparser
+import pickle
+import warnings
+from pathlib import Path
+
+from sgr_library.generated.product import DeviceFrame
+from sgr_library.generic_interface import GenericSGrDeviceBuilder
+from sgr_library.spec_cache import SpecCache
+from sgr_library.spec_parser import create_parser
+from sgr_library.spec_template import mistyped_field
+
+SPEC = (Path(__file__).parent.parent / 'xml_files'
+        / 'SGr_02_4893879785_8288144069_SwiSBox_SubMeterElectricity_V1.0.0.xml').read_text() \
+    .replace('{{tcpAddress}}', '{{host}}')
+
+
+def config(values: dict) -> configparser.ConfigParser:
+    parser = configparser.ConfigParser()
+    parser.read_dict({'DEVICE': values})
+    return parser
+
+
+def parse(spec: str) -> DeviceFrame:
+    with warnings.catch_warnings():
+        # xsdata warns about the values it cannot convert
+        warnings.simplefilter('ignore')
+        return create_parser().from_string(spec, DeviceFrame)
+
+
+def test_key_depends_on_spec_and_config():
+    key = SpecCache.key(SPEC, config({'host': '10.0.0.1'}))
+    assert key == SpecCache.key(SPEC, config({'host': '10.0.0.1'}))
+    assert key != SpecCache.key(SPEC, config({'host': '10.0.0.2'}))
+    assert key != SpecCache.key(SPEC + ' ', config({'host': '10.0.0.1'}))
+
+
+def test_store_and_load(tmp_path):
+    cache = SpecCache(tmp_path)
+    frame = parse(SPEC)
+    assert cache.load('key') is None
+    cache.store('key', frame)
+    assert cache.load('key') == frame
+    cache.clear()
+    assert cache.load('key') is None
+
+
+def test_unreadable_entries_are_dropped(tmp_path):
+    cache = SpecCache(tmp_path)
+    (tmp_path / 'corrupt.frame.pickle').write_bytes(b'not a pickle')
+    (tmp_path / 'other.frame.pickle').write_bytes(pickle.dumps({'not': 'a frame'}))
+    assert cache.load('corrupt') is None
+    assert cache.load('other') is None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_frames_with_unconverted_values_are_not_stored(tmp_path):
+    cache = SpecCache(tmp_path)
+    frame = parse(SPEC.replace('<port>502</port>', '<port>{{port}}</port>'))
+    assert mistyped_field(frame).endswith('modbus_tcp.port')
+    cache.store('key', frame)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_builder_uses_the_cache(tmp_path):
+    cache = SpecCache(tmp_path)
+
+    def build(host):
+        return GenericSGrDeviceBuilder().xml_string(SPEC).config({'DEVICE': {'host': host}}) \
+            .spec_cache(cache).build_frame()[0]
+
+    first = build('10.0.0.1')
+    build('10.0.0.2')
+    assert len(list(tmp_path.glob('*.frame.pickle'))) == 2
+    cached = build('10.0.0.1')
+    assert cached == first and cached is not first
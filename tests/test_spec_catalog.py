@@ -0,0 +1,93 @@
+import glob
+import os
+import shutil
+import warnings
+
+import pytest
+
+from sgr_library import spec_catalog
+from sgr_library.generic_interface import file_loader, resolve_protocol
+from sgr_library.spec_catalog import INDEX_FILE_NAME, SpecCatalog, read_spec_header
+
+SPECS = ['xml_files/SGr_04_0017_xxxx_HOVAL_HeatPumpV0.2.1.xml',
+         'xml_files/SGr_04_mmmm_dddd_CLEMAPEnergyMonitorEIV0.2.1.xml']
+
+
+def parsable_specs():
+    for path in sorted(glob.glob('xml_files/*.xml')):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            try:
+                yield path, file_loader(path)
+            except Exception:
+                pass
+
+
+def test_header_matches_the_parsed_spec():
+    for path, frame in parsable_specs():
+        header = read_spec_header(path)
+        assert header['protocol'] == resolve_protocol(frame), path
+        assert header['device_name'] == frame.device_name, path
+        assert header['manufacturer_name'] == frame.manufacturer_name, path
+
+
+@pytest.fixture
+def directory(tmp_path):
+    for spec in SPECS:
+        shutil.copy(spec, tmp_path)
+    (tmp_path / 'broken.xml').write_text('<DeviceFrame><deviceName>')
+    return tmp_path
+
+
+@pytest.fixture
+def header_reads(monkeypatch):
+    reads = []
+
+    def read(path):
+        reads.append(os.path.basename(path))
+        return read_spec_header(path)
+
+    monkeypatch.setattr(spec_catalog, 'read_spec_header', read)
+    return reads
+
+
+def test_refresh_reads_only_changed_files(directory, header_reads):
+    entries = SpecCatalog(directory).refresh()
+    assert [entry.file_name for entry in entries] == \
+        ['SGr_04_0017_xxxx_HOVAL_HeatPumpV0.2.1.xml', 'SGr_04_mmmm_dddd_CLEMAPEnergyMonitorEIV0.2.1.xml',
+         'broken.xml']
+    assert (directory / INDEX_FILE_NAME).exists()
+    assert len(header_reads) == 3
+
+    # a new catalog starts from the index file
+    catalog = SpecCatalog(directory)
+    assert catalog.entries() == entries
+    assert catalog.refresh() == entries
+    assert len(header_reads) == 3
+
+    hoval = directory / os.path.basename(SPECS[0])
+    hoval.write_text(hoval.read_text() + '\n')
+    (directory / 'broken.xml').unlink()
+    entries = catalog.refresh()
+    assert header_reads[3:] == [hoval.name]
+    assert [entry.file_name for entry in entries] == [hoval.name, os.path.basename(SPECS[1])]
+
+
+def test_unreadable_specs_are_reported(directory):
+    broken = {entry.file_name: entry for entry in SpecCatalog(directory).refresh()}['broken.xml']
+    assert broken.error.startswith('ParseError')
+    assert broken.protocol is None
+
+
+def test_unreadable_index_is_ignored(directory):
+    (directory / INDEX_FILE_NAME).write_text('{not json')
+    catalog = SpecCatalog(directory)
+    assert catalog.entries() == []
+    assert len(catalog.refresh()) == 3
+
+
+def test_path_of_an_entry(directory):
+    catalog = SpecCatalog(directory)
+    entry = catalog.refresh()[0]
+    assert catalog.path(entry) == directory / entry.file_name
+    assert entry.device_name and entry.protocol is not None
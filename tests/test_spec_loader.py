@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from sgr_library.generic_interface import GenericSGrDeviceBuilder
+from sgr_library.spec_cache import SpecCache
+from sgr_library.spec_loader import load_spec_directory, spec_directory_builders, warm_spec_cache
+
+XML_FILES = Path(__file__).parent.parent / 'xml_files'
+
+
+@pytest.fixture
+def spec_directory(tmp_path):
+    directory = tmp_path / 'specs'
+    directory.mkdir()
+    for name in ('SGr_04_0017_xxxx_HOVAL_HeatPumpV0.2.1.xml',
+                 'SGr_04_mmmm_dddd_CLEMAPEnergyMonitorEIV0.2.1.xml'):
+        (directory / name).write_text((XML_FILES / name).read_text())
+    (directory / 'broken.xml').write_text('<DeviceFrame>')
+    return directory
+
+
+def test_load_spec_directory_warms_the_cache_in_worker_processes(spec_directory, tmp_path):
+    cache = SpecCache(tmp_path / 'cache')
+    results = load_spec_directory(spec_directory, cache, max_workers=1)
+    assert [Path(result.source).name for result in results] == [
+        'SGr_04_0017_xxxx_HOVAL_HeatPumpV0.2.1.xml', 'SGr_04_mmmm_dddd_CLEMAPEnergyMonitorEIV0.2.1.xml', 'broken.xml']
+    assert [result.ok for result in results] == [True, True, False]
+    assert len(list(cache.directory.glob('*.frame.pickle'))) == 2
+
+    builder = spec_directory_builders(spec_directory, cache)[0]
+    spec = builder.get_spec_content()
+    key = cache.key(spec, builder._load_config())
+    assert cache.load(key) is not None
+
+
+def test_builders_of_the_directory_build_from_the_warm_cache(spec_directory, tmp_path, monkeypatch):
+    cache = SpecCache(tmp_path / 'cache')
+    with ThreadPoolExecutor(2) as executor:
+        load_spec_directory(spec_directory, cache, config={'AUTH': {'sensor_id': 'a'}}, executor=executor)
+
+    def parse(*args):
+        raise AssertionError('the spec was parsed again')
+
+    monkeypatch.setattr('sgr_library.generic_interface.compile_frame_template', parse)
+    builders = spec_directory_builders(spec_directory, cache, config={'AUTH': {'sensor_id': 'a'}})
+    frame, _ = builders[0].build_frame()
+    assert frame.device_name
+
+
+def test_builders_need_a_spec_cache():
+    builder = GenericSGrDeviceBuilder().xml_file_path(str(XML_FILES / 'SGr_04_0017_xxxx_HOVAL_HeatPumpV0.2.1.xml'))
+    with pytest.raises(ValueError):
+        warm_spec_cache([builder])
@@ -0,0 +1,55 @@
+import warnings
+
+import pytest
+from xsdata.formats.dataclass.parsers.handlers import XmlEventHandler
+
+from sgr_library import spec_parser
+from sgr_library.generated.product import DeviceFrame
+from sgr_library.spec_parser import available_xml_handlers, create_parser, set_xml_handler, xml_context
+
+HOVAL_SPEC = 'xml_files/SGr_04_0017_xxxx_HOVAL_HeatPumpV0.2.1.xml'
+
+
+@pytest.fixture(autouse=True)
+def restore_handler(monkeypatch):
+    monkeypatch.setattr(spec_parser, '_handler', spec_parser._handler)
+
+
+def parse(handler_name: str) -> DeviceFrame:
+    set_xml_handler(handler_name)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return create_parser().parse(HOVAL_SPEC, DeviceFrame)
+
+
+def test_parsers_share_the_context():
+    assert create_parser().context is xml_context()
+    assert create_parser().context is create_parser().context
+
+
+def test_native_handler_is_the_default():
+    assert 'native' in available_xml_handlers()
+    assert create_parser().handler is XmlEventHandler
+
+
+@pytest.mark.parametrize('handler_name', [name for name in spec_parser.xml_handlers if name != 'native'])
+def test_handlers_parse_the_same_frame(handler_name):
+    if handler_name not in available_xml_handlers():
+        pytest.skip(f'{handler_name} is not installed')
+    assert parse(handler_name) == parse('native')
+
+
+def test_unknown_handler():
+    with pytest.raises(ValueError, match='unknown xml handler'):
+        set_xml_handler('sax')
+
+
+def test_unavailable_handler(monkeypatch):
+    def missing():
+        raise ImportError('No module named lxml')
+
+    monkeypatch.setitem(spec_parser.xml_handlers, 'lxml', missing)
+    assert 'lxml' not in available_xml_handlers()
+    with pytest.raises(ValueError, match='not available'):
+        set_xml_handler('lxml')
+    assert create_parser().handler is XmlEventHandler
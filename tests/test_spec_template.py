@@ -0,0 +1,78 @@
+import configparser
+from pathlib import Path
+
+from sgr_library.generic_interface import GenericSGrDeviceBuilder
+from sgr_library.spec_template import compile_frame_template, compile_template, config_values
+
+# configparser lowercases the parameter names, the placeholders of the spec have to be lowercase
+SPEC = (Path(__file__).parent.parent / 'xml_files'
+        / 'SGr_02_4893879785_8288144069_SwiSBox_SubMeterElectricity_V1.0.0.xml').read_text() \
+    .replace('{{tcpAddress}}', '{{host}}')
+
+
+def build_frame(spec: str, values: dict):
+    return GenericSGrDeviceBuilder().xml_string(spec).config({'DEVICE': values}).build_frame()[0]
+
+
+def test_render_keeps_placeholders_without_value():
+    template = compile_template('a {{x}} b {{y}}')
+    assert template.placeholders == {'x', 'y'}
+    assert template.render({'x': '1'}) == 'a 1 b {{y}}'
+
+
+def test_render_is_a_single_pass():
+    # a value containing a placeholder is not substituted again
+    assert compile_template('{{a}}-{{b}}-{{a}}').render({'a': '{{b}}', 'b': '2'}) == '{{b}}-2-{{b}}'
+
+
+def test_templates_are_shared():
+    assert compile_template(SPEC) is compile_template(SPEC)
+
+
+def test_first_section_defining_a_parameter_wins():
+    config = configparser.ConfigParser()
+    config.read_dict({'DEVICE': {'host': '10.0.0.1'}, 'OTHER': {'host': '10.0.0.2', 'port': '502'}})
+    assert config_values(config) == {'host': '10.0.0.1', 'port': '502'}
+
+
+def test_replace_variables():
+    spec, _ = GenericSGrDeviceBuilder().xml_string(SPEC).config({'DEVICE': {'host': '10.0.0.1'}}) \
+        .replace_variables()
+    assert spec == SPEC.replace('{{host}}', '10.0.0.1')
+
+
+def test_string_placeholder_is_bound_in_the_template():
+    template = compile_frame_template(SPEC)
+    assert template is not None
+    assert template.placeholders == {'host'}
+    tcp = build_frame(SPEC, {'host': '10.0.0.1'}).interface_list.modbus_interface.modbus_interface_description
+    assert tcp.modbus_tcp.address == '10.0.0.1'
+
+
+def test_numeric_placeholder_falls_back_to_the_rendered_spec():
+    spec = SPEC.replace('<port>502</port>', '<port>{{port}}</port>') \
+        .replace('<slaveId>1</slaveId>', '<slaveId>{{slave}}</slaveId>')
+    assert compile_frame_template(spec) is None
+    frame = build_frame(spec, {'host': '10.0.0.1', 'port': '1502', 'slave': '7'})
+    tcp = frame.interface_list.modbus_interface.modbus_interface_description.modbus_tcp
+    assert tcp.port == 1502
+    assert tcp.slave_id == 7
+
+
+def test_numeric_placeholder_of_a_data_point_address():
+    spec = SPEC.replace('<address>2300</address>', '<address>{{a}}</address>', 1)
+    assert compile_frame_template(spec) is None
+    frame = build_frame(spec, {'host': '10.0.0.1', 'a': '2300'})
+    fp = frame.interface_list.modbus_interface.functional_profile_list.functional_profile_list_element[0]
+    assert fp.data_point_list.data_point_list_element[0].modbus_data_point_configuration.address == 2300
+
+
+def test_bound_frames_share_the_elements_without_placeholders():
+    template = compile_frame_template(SPEC)
+    first = template.bind({'host': '10.0.0.1'})
+    second = template.bind({'host': '10.0.0.2'})
+    assert first.interface_list.modbus_interface.modbus_interface_description.modbus_tcp.address == '10.0.0.1'
+    assert second.interface_list.modbus_interface.modbus_interface_description.modbus_tcp.address == '10.0.0.2'
+    assert first.device_information is second.device_information
+    assert first.interface_list.modbus_interface.functional_profile_list is \
+        second.interface_list.modbus_interface.functional_profile_list